@@ -1,40 +1,2668 @@
 import tkinter as tk
-from tkinter import ttk
-import tkinter.messagebox as messagebox
 import random
 import json
 import time
 import os
+import argparse
+import sys
+import queue
+import threading
+import heapq
+import math
+import io
+import mmap
+import struct
+import tempfile
 from PIL import Image, ImageTk, ImageFont, ImageDraw
 
 
+class SpatialGrid:
+    """Uniform grid over the canvas used for broad-phase collision checks"""
+
+    def __init__(self, width=1000, height=600, cell_size=100):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of keys in that cell
+        self.entries = {}  # key -> (bbox, cells covered, layer)
+
+    def cells_for(self, bbox):
+        """Returns the grid cells covered by a bounding box"""
+        size = self.cell_size
+        # Clamp to the playfield so off-screen items share the edge cells
+        max_col = max(0, (self.width - 1) // size)
+        max_row = max(0, (self.height - 1) // size)
+        col_start = min(max(int(bbox[0] // size), 0), max_col)
+        col_end = min(max(int(bbox[2] // size), 0), max_col)
+        row_start = min(max(int(bbox[1] // size), 0), max_row)
+        row_end = min(max(int(bbox[3] // size), 0), max_row)
+        return tuple(
+            (col, row)
+            for col in range(col_start, col_end + 1)
+            for row in range(row_start, row_end + 1)
+        )
+
+    def update(self, key, bbox, layer="object"):
+        """Inserts a key or moves it, only touching cells that changed"""
+        cells = self.cells_for(bbox)
+        old_entry = self.entries.get(key)
+        if old_entry is not None and old_entry[1] == cells:
+            # Still in the same cells, only the bounding box changes
+            self.entries[key] = (tuple(bbox), cells, layer)
+            return
+
+        if old_entry is not None:
+            for cell in old_entry[1]:
+                if cell not in cells:
+                    self.discard_from_cell(cell, key)
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(key)
+        self.entries[key] = (tuple(bbox), cells, layer)
+
+    def discard_from_cell(self, cell, key):
+        """Removes a key from one cell, dropping the cell when it empties"""
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if not bucket:
+            del self.cells[cell]
+
+    def remove(self, key):
+        """Removes a key from the grid if it is present"""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for cell in entry[1]:
+            self.discard_from_cell(cell, key)
+
+    def bbox(self, key):
+        """Returns the last bounding box stored for a key"""
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    def query(self, bbox, layer=None):
+        """Returns keys whose bounding boxes overlap the given box"""
+        found = set()
+        for cell in self.cells_for(bbox):
+            for key in self.cells.get(cell, ()):
+                if key in found:
+                    continue
+                other_bbox, _, other_layer = self.entries[key]
+                if layer is not None and other_layer != layer:
+                    continue
+                if boxes_overlap(bbox, other_bbox):
+                    found.add(key)
+        return found
+
+    def clear(self):
+        """Empties the grid"""
+        self.cells.clear()
+        self.entries.clear()
+
+
+def boxes_overlap(first, second):
+    """Checks if two (x1, y1, x2, y2) bounding boxes overlap"""
+    return (
+        first[2] >= second[0] and
+        first[0] <= second[2] and
+        first[3] >= second[1] and
+        first[1] <= second[3]
+    )
+
+
+def merge_boxes(boxes):
+    """Joins overlapping boxes so every pixel is in at most one box"""
+    merged = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for box in merged:
+            for index, other in enumerate(result):
+                if boxes_overlap(box, other):
+                    result[index] = (
+                        min(box[0], other[0]),
+                        min(box[1], other[1]),
+                        max(box[2], other[2]),
+                        max(box[3], other[3]),
+                    )
+                    changed = True
+                    break
+            else:
+                result.append(box)
+        merged = result
+    return merged
+
+
+CANVAS_WIDTH = 1000  # Logical playfield size, scaled to the window
+CANVAS_HEIGHT = 600
+SCALE_STEP = 0.05  # Playfield scales are rounded to this step
+RESIZE_DELAY_MS = 150  # Wait for the window to settle before rescaling
+TICK_MS = 50  # One simulation step for every falling object
+CATCH_TOP = 525  # Top edge of an object must be in this band to be caught
+CATCH_BOTTOM = 570
+MAX_PLAYERS = 4
+# Movement keys used when a player leaves their key entries blank
+DEFAULT_PLAYER_KEYS = [
+    ("Left", "Right"),
+    ("a", "d"),
+    ("j", "l"),
+    ("KP_4", "KP_6"),
+]
+# Game action keys: key -> (Game method, description for the guide)
+HOTKEYS = {
+    "p": ("toggle_pause", "Pause/Resume game"),
+    "b": ("toggle_boss_key", "Boss key (quick hide)"),
+    "s": ("save_game", "Save current game progress"),
+    "w": ("load_game", "Load previously saved game"),
+}
+# Cheat codes typed during a game, checked in this order
+CHEAT_CODES = {
+    "mega": ("toggle_basket_size", "Toggle basket size"),
+    "god": ("toggle_cheat_invincibility", "Temporary invincibility"),
+    "life": ("add_extra_lives", "Add extra lives"),
+    "cat": ("cat_cheat_code", "Gain 9 lives"),
+}
+FONT_PATH = "PressStart2P-Regular.ttf"
+# Folder holding the images and font, wherever the game is started from
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+# Sprites decoded to RGBA and the font, packed by the "bundle" command
+BUNDLE_PATH = "assets.bundle"
+BUNDLE_MAGIC = b"APPLEBN1"
+# Window title for each screen
+SCREEN_TITLES = {
+    "menu": "Apple Catcher",
+    "game": "Apple Catcher",
+    "game_over": "Game Over",
+}
+# Readable names for key symbols shown in the game guide
+KEY_NAMES = {
+    "Left": "Left Arrow",
+    "Right": "Right Arrow",
+    "KP_4": "Keypad 4",
+    "KP_6": "Keypad 6",
+}
+# Playfield renderers selectable from the command line
+RENDERERS = ("canvas", "software")
+# Share of the playfield above which the whole frame is sent to Tk at once
+FULL_FRAME_SHARE = 0.5
+# How each object type moves, on top of its falling speed:
+#   drift: sideways speed in px per tick when spawned
+#   jitter: range the speed is scaled by on every tick
+#   wobble: chance per tick of a sideways nudge, and its largest size
+#   bounce: share of sideways speed kept after hitting a wall, 0 to
+#   let the object leave the playfield
+OBJECT_MOTION = {
+    "apple": {
+        "drift": 0, "jitter": (0.8, 1.2), "wobble": (0, 0), "bounce": 0,
+    },
+    # Golden apples drift right, and used to slide off the playfield
+    "golden": {
+        "drift": 0.75, "jitter": (0.8, 1.2), "wobble": (0, 0), "bounce": 1,
+    },
+    "rotten": {
+        "drift": 0, "jitter": (0.7, 1.3), "wobble": (0.3, 0.5), "bounce": 0,
+    },
+    "power_up": {
+        "drift": 0, "jitter": (0.9, 1.1), "wobble": (0, 0), "bounce": 0,
+    },
+}
+# Timed effects: how long each lasts in ms (None never expires) and
+# what applying it again while active does. "refresh" restarts the
+# timer unless more time is left, "extend" adds a full duration,
+# "toggle" ends the effect.
+EFFECTS = {
+    "invincible": {"duration": 5000, "stacking": "refresh"},  # Power-up
+    "god_mode": {"duration": 10000, "stacking": "toggle"},  # Cheat code
+    "large_basket": {"duration": None, "stacking": "toggle"},  # Cheat code
+}
+# Easing curves for tweens, mapping progress from 0 to 1
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+}
+# How often asyncio gets to run its ready callbacks inside Tk's loop,
+# and how rarely once it has no tasks left to run
+ASYNC_PUMP_MS = 5
+ASYNC_IDLE_MS = 250
+# Versus play over UDP: how many ticks a machine may run ahead of its
+# opponent's inputs, how often the host sends a state check, the most
+# a tick's packet may carry and how finely object positions are sent
+VERSUS_PORT = 47800
+MAX_ROLLBACK_FRAMES = 8  # 400 ms of predicted opponent input
+SNAPSHOT_EVERY = 5
+NET_PACKET_BUDGET = 256  # Bytes of UDP payload
+POSITION_SCALE = 4  # Quarter pixels
+# Spectator streams: TCP port, and the bytes a spectator may fall
+# behind by before frames are dropped for it (about 2 s of frames)
+BROADCAST_PORT = 47900
+BROADCAST_BUFFER = 8192
+# JSON Lines file that finished game sessions are appended to
+TELEMETRY_PATH = "telemetry/sessions.jsonl"
+# Shared leaderboard: scores still to be sent, scores the server refused,
+# the stand-in server's file, how many places are fetched and the waits
+# between requests
+LEADERBOARD_QUEUE_PATH = "leaderboard_queue.json"
+LEADERBOARD_REJECTED_PATH = "leaderboard_rejected.json"
+SERVER_LEADERBOARD_PATH = "server_leaderboard.json"
+LEADERBOARD_PORT = 8765
+LEADERBOARD_TOP_N = 100
+LEADERBOARD_REFRESH_SECONDS = 30
+LEADERBOARD_RETRY_SECONDS = (1, 60)  # First and longest retry wait
+# Image file and drawn size of each sprite
+SPRITE_FILES = {
+    "background": ("background.png", (1000, 600)),
+    "apple": ("apple.png", (35, 35)),
+    "golden": ("golden_apple.png", (40, 40)),
+    "rotten": ("rotten_apple.png", (40, 40)),
+    "basket": ("basket.png", (150, 100)),
+    "boss_screen": ("boss_screen.png", (1000, 600)),
+    "help_icon": ("question_mark.png", (70, 70)),
+    "start_background": ("start_background.png", (1000, 600)),
+    "game_over_background": ("game_over_background.png", (1000, 600)),
+}
+# Optional work the quality governor sheds, best quality first: most
+# score popups shown at once, fading text, one redraw per N ticks,
+# hard-edged sprites and flashing power-up indicators
+QUALITY_TIERS = (
+    {"name": "High", "popups": 8, "fades": True, "render_every": 1,
+     "simple_sprites": False, "flashing": True},
+    {"name": "Medium", "popups": 3, "fades": True, "render_every": 1,
+     "simple_sprites": True, "flashing": True},
+    {"name": "Low", "popups": 1, "fades": False, "render_every": 2,
+     "simple_sprites": True, "flashing": False},
+    {"name": "Minimal", "popups": 0, "fades": False, "render_every": 3,
+     "simple_sprites": True, "flashing": False},
+)
+FRAME_BUDGET_MS = 25  # Half of each tick, redraw included
+# Quality comes back after this many windows in a row below this share
+# of the budget
+RESTORE_WINDOWS = 3
+RESTORE_SHARE = 0.5
+# A tick starting this much after it was due is logged as late. Late
+# starts stay out of the governor's frame times.
+LATE_TICK_MS = 25
+# Sprites the main menu needs, loaded before it is shown
+MENU_SPRITES = ("start_background", "help_icon")
+# Everything else, loaded on a worker thread while the menu is up
+GAME_SPRITES = tuple(
+    name for name in [*SPRITE_FILES, "power_up"] if name not in MENU_SPRITES
+)
+# Font sizes used once a game starts, loaded with the game sprites
+GAME_FONT_SIZES = (10, 16, 24, 40)
+# Sprites composited onto the playfield, named after the object kinds
+PLAYFIELD_SPRITES = ("basket", "apple", "golden", "rotten", "power_up")
+# Width and height of each falling object type
+OBJECT_SIZES = {
+    "apple": (35, 35),
+    "golden": (40, 40),
+    "rotten": (40, 40),
+    "power_up": (20, 20),
+}
+
+
+def asset_path(filename):
+    """Returns the full path of a file shipped next to the game"""
+    return os.path.join(ASSET_DIR, filename)
+
+
+def sprite_size(name):
+    """Returns the width and height a sprite is drawn at"""
+    if name in SPRITE_FILES:
+        return SPRITE_FILES[name][1]
+    return OBJECT_SIZES[name]
+
+
+def decode_sprite(name):
+    """Decodes and resizes one game image from its file"""
+    if name == "power_up":
+        # Power-ups are a yellow triangle rather than an image file
+        power_up = Image.new("RGBA", OBJECT_SIZES["power_up"])
+        width, height = power_up.size
+        ImageDraw.Draw(power_up).polygon(
+            [(width / 2, 0), (width - 1, height - 1), (0, height - 1)],
+            fill="yellow", outline="gold", width=2,
+        )
+        return power_up
+    path, size = SPRITE_FILES[name]
+    return Image.open(asset_path(path)).resize(size, Image.LANCZOS)
+
+
+def load_sprite(name):
+    """Returns one game image, from the bundle when there is one"""
+    bundle = open_bundle()
+    if bundle is not None:
+        image = bundle.image(name, sprite_size(name))
+        if image is not None:
+            return image
+    return decode_sprite(name)
+
+
+def load_sprites():
+    """Loads every game image"""
+    return {name: load_sprite(name) for name in [*SPRITE_FILES, "power_up"]}
+
+
+def simplify_sprite(image):
+    """Returns a copy with hard edges, every pixel opaque or clear"""
+    image = image.convert("RGBA")
+    image.putalpha(
+        image.getchannel("A").point(lambda a: 255 if a >= 128 else 0)
+    )
+    return image
+
+
+def open_asset_file(filename):
+    """Opens a packed copy of an asset file, or returns its path"""
+    bundle = open_bundle()
+    if bundle is not None:
+        stream = bundle.file(filename)
+        if stream is not None:
+            return stream
+    return asset_path(filename)
+
+
+class AssetBundle:
+    """Memory-maps a packed asset file and serves images from it"""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            # The mapping stays valid after the file is closed
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic_length = len(BUNDLE_MAGIC)
+        if self.buffer[:magic_length] != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+
+        # Magic, index length, JSON index, then the packed data
+        (index_length,) = struct.unpack_from("<I", self.buffer, magic_length)
+        index_start = magic_length + 4
+        self.index = json.loads(
+            self.buffer[index_start:index_start + index_length]
+        )
+        self.data_start = index_start + index_length
+        self.view = memoryview(self.buffer)
+
+    def data(self, entry):
+        """Returns a view of one packed entry, without copying it"""
+        start = self.data_start + entry["offset"]
+        return self.view[start:start + entry["length"]]
+
+    def image(self, name, size):
+        """Returns a sprite backed by the mapping, or None if missing"""
+        entry = self.index["images"].get(name)
+        if entry is None or tuple(entry["size"]) != tuple(size):
+            return None  # Not packed, or packed at another size
+        # Read-only, so Pillow copies it the first time it is drawn on
+        return Image.frombuffer(
+            "RGBA", tuple(size), self.data(entry), "raw", "RGBA", 0, 1
+        )
+
+    def file(self, filename):
+        """Returns a packed file as a stream, or None if missing"""
+        entry = self.index["files"].get(filename)
+        if entry is None:
+            return None
+        return io.BytesIO(self.data(entry))
+
+
+BUNDLES = {}  # Path -> AssetBundle, or None when it can't be used
+BUNDLE_LOCK = threading.Lock()  # The menu and AssetLoader both load
+
+
+def open_bundle(path=BUNDLE_PATH):
+    """Returns the mapped asset bundle, or None to use loose files"""
+    with BUNDLE_LOCK:
+        if path not in BUNDLES:
+            try:
+                BUNDLES[path] = AssetBundle(asset_path(path))
+            except (OSError, ValueError):
+                BUNDLES[path] = None
+        return BUNDLES[path]
+
+
+def build_asset_bundle(path=BUNDLE_PATH):
+    """Packs every sprite, decoded at its drawn size, and the font"""
+    index = {"images": {}, "files": {}}
+    chunks = []
+    offset = 0
+    for name in [*SPRITE_FILES, "power_up"]:
+        image = decode_sprite(name).convert("RGBA")
+        chunks.append(image.tobytes())
+        index["images"][name] = {
+            "size": list(image.size), "offset": offset,
+            "length": len(chunks[-1]),
+        }
+        offset += len(chunks[-1])
+    with open(asset_path(FONT_PATH), "rb") as file:
+        chunks.append(file.read())
+    index["files"][FONT_PATH] = {"offset": offset, "length": len(chunks[-1])}
+
+    # Written beside the old bundle, then swapped in whole
+    index_bytes = json.dumps(index).encode("utf-8")
+    temporary_path = asset_path(path) + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(BUNDLE_MAGIC)
+        file.write(struct.pack("<I", len(index_bytes)))
+        file.write(index_bytes)
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(temporary_path, asset_path(path))
+    return index
+
+
+class AssetLoader:
+    """Loads sprites, fonts and slow modules on a worker thread"""
+
+    def __init__(self, names, text_renderer=None, font_sizes=()):
+        self.images = {}  # Sprite name -> PIL image
+        self.timings = {}  # Step -> seconds it took
+        self.error = None  # Raised again by wait() if loading failed
+        self.thread = threading.Thread(
+            target=self.work,
+            args=(names, text_renderer, font_sizes),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def work(self, names, text_renderer, font_sizes):
+        """Loads each sprite, then warms what the first game tick needs"""
+        try:
+            for name in names:
+                started = time.perf_counter()
+                self.images[name] = load_sprite(name)
+                self.timings[name] = time.perf_counter() - started
+
+            # NumPy is the slowest import and only the simulation uses it
+            started = time.perf_counter()
+            import numpy  # noqa: F401
+            self.timings["import numpy"] = time.perf_counter() - started
+
+            if text_renderer is not None and font_sizes:
+                started = time.perf_counter()
+                for size in font_sizes:
+                    text_renderer.font(size)
+                self.timings["fonts"] = time.perf_counter() - started
+        except Exception as error:
+            self.error = error
+
+    def done(self):
+        """Returns True once the worker thread has finished"""
+        return not self.thread.is_alive()
+
+    def wait(self):
+        """Waits for loading to finish and returns the sprites"""
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.images
+
+
+def player_label_texts(player, players):
+    """Returns the score and lives label text for a player"""
+    # Names are only needed when several players share the screen
+    prefix = f"{player.name} " if len(players) > 1 else ""
+    return f"{prefix}Score: {player.score}", f"{prefix}Lives: {player.lives}"
+
+
+class Player:
+    """Stores the basket, keys, score and lives of one player"""
+
+    def __init__(self, name, left_key="Left", right_key="Right", index=0):
+        self.name = name
+        self.left_key = left_key
+        self.right_key = right_key
+        self.index = index  # Position in the game's player list
+        self.score = 0
+        self.lives = 5
+        self.x = (CANVAS_WIDTH - 100) // 2  # Top left corner of the basket
+        self.y = CANVAS_HEIGHT - 100
+        # State flags
+        self.large_basket = False
+        self.invincibility = False
+        self.eliminated = False
+        # Bot policy driving the basket, None for keyboard control
+        self.policy = None
+        # Canvas items and HUD labels, created by Game
+        self.basket_item = None
+        self.power_up_indicator = None
+        self.score_label = None
+        self.lives_label = None
+
+    def basket_size(self):
+        """Returns the width and height of the player's basket"""
+        return (200, 120) if self.large_basket else (150, 100)
+
+    def bbox(self):
+        """Returns the bounding box of the player's basket"""
+        width, height = self.basket_size()
+        return (self.x, self.y, self.x + width, self.y + height)
+
+
+class FallingObject:
+    """An apple or power-up falling down the playfield"""
+
+    def __init__(self, object_id, kind, kinematics, row):
+        self.object_id = object_id
+        self.kind = kind  # "apple", "golden", "rotten" or "power_up"
+        self.width, self.height = OBJECT_SIZES[kind]
+        # Position and speed live in a row of the world's kinematics
+        self.kinematics = kinematics
+        self.row = row
+
+    @property
+    def x(self):
+        """Left edge of the object"""
+        return float(self.kinematics.position[self.row, 0])
+
+    @x.setter
+    def x(self, value):
+        self.kinematics.position[self.row, 0] = value
+
+    @property
+    def y(self):
+        """Top edge of the object"""
+        return float(self.kinematics.position[self.row, 1])
+
+    @y.setter
+    def y(self, value):
+        self.kinematics.position[self.row, 1] = value
+
+    @property
+    def vy(self):
+        """Falling speed in px per tick, before jitter"""
+        return float(self.kinematics.velocity[self.row, 1])
+
+    def bbox(self):
+        """Returns the bounding box of the object"""
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+
+class Kinematics:
+    """Positions and motion of every falling object, stepped with NumPy"""
+
+    # Per-row arrays and their number of columns
+    ARRAYS = {
+        "position": 2,
+        "velocity": 2,  # px per tick
+        "size": 2,
+        "jitter": 2,
+        "wobble": 2,
+        "bounce": 1,
+        "object_id": 1,
+        "alive": 1,
+    }
+    # Up to this many rows a plain Python loop beats NumPy's call overhead
+    SCALAR_ROWS = 16
+
+    def __init__(self, seed=None, capacity=64):
+        import numpy as np
+
+        self.random = np.random.default_rng(seed)
+        self.rows = 0  # Rows handed out so far, live or free
+        self.free_rows = []  # Rows of removed objects, reused first
+        for name, columns in self.ARRAYS.items():
+            shape = (capacity, columns) if columns > 1 else capacity
+            dtype = {"object_id": np.int64, "alive": bool}.get(name, float)
+            setattr(self, name, np.zeros(shape, dtype=dtype))
+
+    def grow(self):
+        """Doubles the number of rows available"""
+        import numpy as np
+
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+
+    def add(self, object_id, x, y, size, vx, vy, motion):
+        """Stores a new object and returns its row"""
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.rows == len(self.alive):
+                self.grow()
+            row = self.rows
+            self.rows += 1
+        self.position[row] = (x, y)
+        self.velocity[row] = (vx, vy)
+        self.size[row] = size
+        self.jitter[row] = motion["jitter"]
+        self.wobble[row] = motion["wobble"]
+        self.bounce[row] = motion["bounce"]
+        self.object_id[row] = object_id
+        self.alive[row] = True
+        return row
+
+    def remove(self, row):
+        """Frees an object's row for reuse"""
+        self.alive[row] = False
+        self.free_rows.append(row)
+
+    def set_fall_speed(self, rows, speed):
+        """Sets the falling speed of the objects in the given rows"""
+        self.velocity[rows, 1] = speed
+
+    def snapshot(self):
+        """Returns a copy of every row in use and the random state"""
+        return {
+            "arrays": {
+                name: getattr(self, name)[:self.rows].copy()
+                for name in self.ARRAYS
+            },
+            "rows": self.rows,
+            "free_rows": list(self.free_rows),
+            "random": self.random.bit_generator.state,
+        }
+
+    def restore(self, snapshot):
+        """Puts the rows and random state back as a snapshot saw them"""
+        rows = snapshot["rows"]
+        while len(self.alive) < rows:
+            self.grow()
+        for name, array in snapshot["arrays"].items():
+            getattr(self, name)[:rows] = array
+        self.alive[rows:] = False  # Rows handed out after the snapshot
+        self.rows = rows
+        self.free_rows = list(snapshot["free_rows"])
+        self.random.bit_generator.state = snapshot["random"]
+
+    def step(self):
+        """Moves every object one tick, bouncing off walls if it can"""
+        if self.rows <= self.SCALAR_ROWS:
+            self.step_rows()
+        else:
+            self.step_arrays()
+
+    def step_rows(self):
+        """Steps a few rows one at a time, matching step_arrays exactly"""
+        count = self.rows
+        if not count:
+            return
+        draws = self.random.random(3 * count).tolist()
+        velocity = self.velocity[:count].tolist()
+        position = self.position[:count].tolist()
+        jitter = self.jitter[:count].tolist()
+        wobble = self.wobble[:count].tolist()
+        bounce = self.bounce[:count].tolist()
+        width = self.size[:count, 0].tolist()
+        for row, alive in enumerate(self.alive[:count].tolist()):
+            if not alive:
+                continue
+            vx, vy = velocity[row]
+            low, high = jitter[row]
+            factor = low + (high - low) * draws[row]
+            dx = vx * factor
+            chance, sway = wobble[row]
+            if draws[count + row] < chance:
+                dx += (draws[2 * count + row] * 2 - 1) * sway
+            x = position[row][0] + dx
+            position[row] = (x, position[row][1] + vy * factor)
+            if bounce[row] > 0:
+                right = CANVAS_WIDTH - width[row]
+                if x < 0:
+                    position[row] = (-x, position[row][1])
+                    velocity[row][0] = vx * -bounce[row]
+                elif x > right:
+                    position[row] = (2 * right - x, position[row][1])
+                    velocity[row][0] = vx * -bounce[row]
+        self.velocity[:count] = velocity
+        self.position[:count] = position
+
+    def step_arrays(self):
+        """Steps every row at once, which pays off for many rows"""
+        count = self.rows
+        alive = self.alive[:count]
+        velocity = self.velocity[:count]
+
+        # Every object gets its own speed variation and wobble. One draw
+        # holds all three, in the order separate uniform() calls used.
+        draws = self.random.random((3, count))
+        jitter = self.jitter[:count]
+        factor = jitter[:, 0] + (jitter[:, 1] - jitter[:, 0]) * draws[0]
+        factor *= alive  # Removed rows stay put
+        moved = velocity * factor[:, None]
+        wobble = self.wobble[:count]
+        wobbling = alive & (draws[1] < wobble[:, 0])
+        moved[:, 0] += (draws[2] * 2 - 1) * wobble[:, 1] * wobbling
+        position = self.position[:count]
+        position += moved
+
+        # Reflect bouncing objects back inside the side walls
+        x = position[:, 0]
+        right = CANVAS_WIDTH - self.size[:count, 0]
+        hit = (x < 0) | (x > right)
+        hit &= alive & (self.bounce[:count] > 0)
+        if not hit.any():
+            return  # Most ticks nothing reaches a wall
+        hit_left = hit & (x < 0)
+        hit_right = hit & ~hit_left
+        x[hit_left] = -x[hit_left]
+        x[hit_right] = 2 * right[hit_right] - x[hit_right]
+        velocity[hit, 0] *= -self.bounce[:count][hit]
+
+    def rows_below(self, y):
+        """Returns rows of live objects whose top edge is at or below y"""
+        import numpy as np
+
+        count = self.rows
+        return np.flatnonzero(
+            self.alive[:count] & (self.position[:count, 1] >= y)
+        )
+
+
+class EventBus:
+    """Queues game events during a tick and dispatches them in one batch"""
+
+    def __init__(self):
+        self.queue = []  # (name, player, detail) published since dispatch
+        self.subscribers = {}  # Event name, or "*" for all -> callbacks
+        self.counts = {}  # Event name -> events dispatched
+        self.batches = 0  # Dispatches that had at least one event
+        self.largest_batch = 0
+
+    def subscribe(self, name, callback):
+        """Calls callback(name, player, detail) for each event of a name"""
+        self.subscribers.setdefault(name, []).append(callback)
+
+    def unsubscribe(self, name, callback):
+        """Stops sending events of a name to a callback"""
+        callbacks = self.subscribers.get(name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, name, player=None, detail=None):
+        """Queues an event until the next dispatch"""
+        self.queue.append((name, player, detail))
+
+    def dispatch(self):
+        """Sends every queued event to its subscribers, oldest first"""
+        batch_size = 0
+        # Events published by subscribers join the same batch
+        while self.queue:
+            batch, self.queue = self.queue, []
+            batch_size += len(batch)
+            for name, player, detail in batch:
+                self.counts[name] = self.counts.get(name, 0) + 1
+                for callback in self.subscribers.get(name, ()):
+                    callback(name, player, detail)
+                for callback in self.subscribers.get("*", ()):
+                    callback(name, player, detail)
+        if batch_size:
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, batch_size)
+        return batch_size
+
+
+class StatusEffects:
+    """Active timed effects, expiring in order of their end time"""
+
+    def __init__(self):
+        # (effect name, player index or None for everyone) -> end time
+        self.end_times = {}
+        self.heap = []  # (end time, order, name, target), may be stale
+        self.order = 0  # Keeps heap entries with equal end times in order
+
+    def apply(self, name, target, now, duration=None):
+        """Starts or stacks an effect and returns whether it is active"""
+        rules = EFFECTS[name]
+        key = (name, target)
+        if duration is None:
+            duration = rules["duration"]
+        end_time = None if duration is None else now + duration
+        if key in self.end_times:
+            current = self.end_times[key]
+            if rules["stacking"] == "toggle":
+                del self.end_times[key]
+                return False
+            if current is None or end_time is None:
+                end_time = None  # One that never expires wins
+            elif rules["stacking"] == "extend":
+                end_time = current + duration
+            else:
+                end_time = max(end_time, current)  # Never cut time short
+        self.end_times[key] = end_time
+        if end_time is not None:
+            # Older entries for the key are skipped when they surface
+            self.order += 1
+            heapq.heappush(self.heap, (end_time, self.order, name, target))
+        return True
+
+    def remove(self, name, target):
+        """Ends an effect early, returning whether it was active"""
+        return self.end_times.pop((name, target), False) is not False
+
+    def active(self, name, target):
+        """Returns whether an effect is active"""
+        return (name, target) in self.end_times
+
+    def remaining(self, name, target, now):
+        """Returns the ms left on an effect, None if it never expires"""
+        end_time = self.end_times[(name, target)]
+        return None if end_time is None else max(0, end_time - now)
+
+    def expire(self, now):
+        """Removes and returns effects that ended by now"""
+        ended = []
+        while self.heap and self.heap[0][0] <= now:
+            end_time, _, name, target = heapq.heappop(self.heap)
+            if self.end_times.get((name, target), False) == end_time:
+                del self.end_times[(name, target)]
+                ended.append((name, target))
+        return ended
+
+    def snapshot(self):
+        """Returns a copy of the effects for rolling back to later"""
+        return dict(self.end_times), list(self.heap), self.order
+
+    def restore(self, snapshot):
+        """Replaces the effects with a snapshot's"""
+        end_times, heap, self.order = snapshot
+        self.end_times = dict(end_times)
+        self.heap = list(heap)
+
+    def to_list(self, now):
+        """Returns the active effects in a form that can be saved"""
+        return [
+            {
+                "name": name,
+                "player": target,
+                "remaining": self.remaining(name, target, now),
+            }
+            for name, target in self.end_times
+        ]
+
+
+class World:
+    """Canvas-free game rules shared by every player's basket"""
+
+    def __init__(self, players, seed=None):
+        self.players = players
+        self.random = random.Random(seed)
+        # Grid index of the baskets for collision checks
+        self.spatial_index = SpatialGrid(
+            CANVAS_WIDTH, CANVAS_HEIGHT, cell_size=100
+        )
+        self.objects = {}  # Object id -> FallingObject
+        # Motion of every falling object, stepped all at once
+        self.kinematics = Kinematics(seed)
+        self.fall_speeds = {}  # Kind -> falling speed last applied
+        self.bus = EventBus()  # Events raised during a tick
+        self.next_object_id = 1
+        self.g_apple_counter = 0
+        self.r_apple_counter = 0
+        self.power_up_counter = 0
+        self.tie_breaks = 0  # Exact ties between baskets, for taking turns
+        self.game_over_flag = False
+        self.level = 1  # Sets initial game level
+        self.clock = 0  # Game time in ms, stopped while paused
+        self.effects = StatusEffects()
+        self.place_baskets()
+
+    def place_baskets(self):
+        """Spreads the baskets evenly along the bottom of the playfield"""
+        for player in self.players:
+            if len(self.players) > 1:
+                # Centre each basket in its own share of the width
+                share = CANVAS_WIDTH / len(self.players)
+                player.x = (
+                    int(share * (player.index + 0.5)) -
+                    player.basket_size()[0] // 2
+                )
+            self.index_player(player)
+
+    def index_player(self, player):
+        """Stores the player's basket in the grid index"""
+        if player.eliminated:
+            self.spatial_index.remove(player)
+        else:
+            self.spatial_index.update(player, player.bbox(), layer="basket")
+
+    def active_players(self):
+        """Returns players that still have lives left"""
+        return [p for p in self.players if not p.eliminated]
+
+    def lead_score(self):
+        """Returns the best score, which sets the shared difficulty"""
+        return max((p.score for p in self.players), default=0)
+
+    def move_player(self, player, direction):
+        """Moves a basket 40px left (-1) or right (1) inside the canvas"""
+        if player.eliminated:
+            return
+        if direction < 0:
+            # Ensure the basket doesn't move beyond the left edge
+            if player.x > 0:
+                player.x -= 40
+        elif player.x < CANVAS_WIDTH - player.basket_size()[0]:
+            player.x += 40
+        self.index_player(player)
+        self.bus.publish("move", player, direction)
+
+    def set_basket_size(self, player, large_basket):
+        """Switches a player between the normal and large basket"""
+        player.large_basket = large_basket
+        self.index_player(player)
+
+    def apply_effect(self, name, player=None, duration=None):
+        """Starts or stacks an effect, on one player or on everyone"""
+        target = None if player is None else player.index
+        active = self.effects.apply(name, target, self.clock, duration)
+        self.sync_effect_flags()
+        self.bus.publish(
+            "effect" if active else "effect_ended", player, name
+        )
+        return active
+
+    def end_effect(self, name, player=None):
+        """Ends an effect before it expires"""
+        target = None if player is None else player.index
+        if self.effects.remove(name, target):
+            self.sync_effect_flags()
+            self.bus.publish("effect_ended", player, name)
+
+    def has_effect(self, name, player=None):
+        """Returns whether an effect is active"""
+        target = None if player is None else player.index
+        return self.effects.active(name, target)
+
+    def effect_remaining(self, name, player=None):
+        """Returns the ms left on an active effect"""
+        target = None if player is None else player.index
+        return self.effects.remaining(name, target, self.clock)
+
+    def update_effects(self):
+        """Ends effects whose time ran out on the game clock"""
+        ended = self.effects.expire(self.clock)
+        for name, target in ended:
+            player = None if target is None else self.players[target]
+            self.bus.publish("effect_ended", player, name)
+        if ended:
+            self.sync_effect_flags()
+
+    def sync_effect_flags(self):
+        """Updates the player flags that the game rules read"""
+        god_mode = self.effects.active("god_mode", None)
+        large_basket = self.effects.active("large_basket", None)
+        for player in self.players:
+            player.invincibility = god_mode or self.effects.active(
+                "invincible", player.index
+            )
+            if player.large_basket != large_basket:
+                self.set_basket_size(player, large_basket)
+
+    def load_effects(self, saved_effects):
+        """Replaces the active effects with ones from a saved game"""
+        for name, target in list(self.effects.end_times):
+            self.end_effect(
+                name, None if target is None else self.players[target]
+            )
+        for saved in saved_effects:
+            index = saved["player"]
+            if index is not None and index >= len(self.players):
+                continue  # The save had more players than this game
+            self.apply_effect(
+                saved["name"],
+                None if index is None else self.players[index],
+                saved["remaining"],
+            )
+
+    def spawn_wave(self):
+        """Spawns falling objects and returns the delay to the next wave"""
+        # Calculate base delay depending on the level
+        delay = max(2000 - (self.level * 200), 500)
+
+        # Updating counters
+        self.g_apple_counter += 1
+        self.r_apple_counter += 1
+        self.power_up_counter += 1
+
+        normal_apple_prob = min(0.7 + (self.level * 0.05), 0.95)
+
+        # Spawn objects
+        if self.random.random() < normal_apple_prob:
+            self.spawn("apple")
+
+        # Spawn golden apples, only on every fourth wave
+        if (
+            self.g_apple_counter % max(8 - (self.level // 2), 3) == 0 and
+            self.g_apple_counter % 4 == 0
+        ):
+            self.spawn("golden")
+
+        # Spawn rotten apples
+        if self.r_apple_counter % max(12 - (self.level // 2), 4) == 0:
+            if self.random.random() < 0.3 + (self.level * 0.05):
+                self.spawn("rotten")
+
+        # Spawn power-ups
+        if self.power_up_counter % max(15 - (self.level // 2), 6) == 0:
+            if self.random.random() < 0.2 + (self.level * 0.03):
+                self.spawn("power_up")
+
+        return delay
+
+    def spawn(self, kind):
+        """Creates a falling object at a random position along the top"""
+        if kind == "power_up":
+            # Centre of the triangle
+            x = self.random.randint(20, CANVAS_WIDTH - 50) - 10
+        else:
+            x = self.random.randint(0, CANVAS_WIDTH - 30)
+        falling_object = self.place_object(self.next_object_id, kind, x, 0)
+        self.next_object_id += 1
+        self.bus.publish("spawn", None, kind)
+        return falling_object
+
+    def place_object(self, object_id, kind, x, y):
+        """Adds a falling object at a given position"""
+        motion = OBJECT_MOTION[kind]
+        row = self.kinematics.add(
+            object_id, x, y, OBJECT_SIZES[kind],
+            motion["drift"], self.current_fall_speeds()[kind], motion,
+        )
+        falling_object = FallingObject(object_id, kind, self.kinematics, row)
+        self.objects[object_id] = falling_object
+        return falling_object
+
+    def snapshot(self):
+        """Returns the world's state for rolling back to later"""
+        return {
+            "players": [
+                (p.score, p.lives, p.x, p.y, p.large_basket,
+                 p.invincibility, p.eliminated)
+                for p in self.players
+            ],
+            "objects": [
+                (o.object_id, o.kind, o.row) for o in self.objects.values()
+            ],
+            "kinematics": self.kinematics.snapshot(),
+            "effects": self.effects.snapshot(),
+            "fall_speeds": dict(self.fall_speeds),
+            "random": self.random.getstate(),
+            "counters": (
+                self.next_object_id, self.g_apple_counter,
+                self.r_apple_counter, self.power_up_counter,
+                self.tie_breaks,
+            ),
+            "game_over": self.game_over_flag,
+            "level": self.level,
+            "clock": self.clock,
+        }
+
+    def restore(self, snapshot):
+        """Puts the world back to a snapshot, without raising events"""
+        for player, saved in zip(self.players, snapshot["players"]):
+            (player.score, player.lives, player.x, player.y,
+             player.large_basket, player.invincibility,
+             player.eliminated) = saved
+            self.index_player(player)
+        self.kinematics.restore(snapshot["kinematics"])
+        self.objects = {
+            object_id: FallingObject(object_id, kind, self.kinematics, row)
+            for object_id, kind, row in snapshot["objects"]
+        }
+        self.effects.restore(snapshot["effects"])
+        self.fall_speeds = dict(snapshot["fall_speeds"])
+        self.random.setstate(snapshot["random"])
+        (self.next_object_id, self.g_apple_counter, self.r_apple_counter,
+         self.power_up_counter, self.tie_breaks) = snapshot["counters"]
+        self.game_over_flag = snapshot["game_over"]
+        self.level = snapshot["level"]
+        self.clock = snapshot["clock"]
+
+    def net_state(self):
+        """Returns the state net_state() would give for a snapshot now"""
+        return {
+            "level": self.level,
+            "next_object_id": self.next_object_id,
+            "players": [
+                (p.score, p.lives, int(round(p.x)), p.eliminated)
+                for p in self.players
+            ],
+            "objects": {
+                o.object_id: quantize_object(o.kind, o.x, o.y)
+                for o in self.objects.values()
+            },
+        }
+
+    def apply_net_state(self, state):
+        """Moves baskets and objects to match a versus peer's state"""
+        for player, saved in zip(self.players, state["players"]):
+            player.score, player.lives, player.x, eliminated = saved
+            player.eliminated = player.eliminated or eliminated
+            self.index_player(player)
+        for falling_object in list(self.objects.values()):
+            if falling_object.object_id not in state["objects"]:
+                self.remove_object(falling_object)
+        for object_id, (kind, x, y) in state["objects"].items():
+            x, y = x / POSITION_SCALE, y / POSITION_SCALE
+            falling_object = self.objects.get(object_id)
+            if falling_object is None:
+                self.place_object(object_id, VectorEnv.KINDS[kind], x, y)
+            else:
+                falling_object.x, falling_object.y = x, y
+        self.level = state["level"]
+        self.next_object_id = state["next_object_id"]
+
+    def current_fall_speeds(self):
+        """Returns the falling speed of each object type, in px per tick"""
+        lead_score = self.lead_score()
+        return {
+            "apple": 3 + (self.level * 0.5),
+            # Golden apples used to move every 100 ms, so half per tick
+            "golden": 7 / 2,
+            "rotten": 8 + min(2, lead_score // 20),
+            "power_up": 8 + min(4, lead_score // 15),
+        }
+
+    def update_fall_speeds(self):
+        """Applies level and score changes to objects already falling"""
+        speeds = self.current_fall_speeds()
+        if speeds == self.fall_speeds:
+            return
+        for kind, speed in speeds.items():
+            if self.fall_speeds.get(kind) != speed:
+                rows = [
+                    o.row for o in self.objects.values() if o.kind == kind
+                ]
+                self.kinematics.set_fall_speed(rows, speed)
+        self.fall_speeds = speeds
+
+    def step(self):
+        """Moves every object one tick and resolves catches and misses"""
+        self.clock += TICK_MS
+        self.update_effects()
+        self.update_fall_speeds()
+        self.kinematics.step()
+
+        # Only objects that reached the catch band can be caught or missed
+        rows = self.kinematics.rows_below(CATCH_TOP)
+        landing = sorted(zip(
+            self.kinematics.object_id[rows].tolist(),
+            self.kinematics.position[rows, 1].tolist(),
+        ))
+        for object_id, y in landing:
+            if self.game_over_flag:
+                break
+            falling_object = self.objects[object_id]
+
+            # Power-ups leave the screen once their centre does
+            bottom = y
+            if falling_object.kind == "power_up":
+                bottom += falling_object.height / 2
+            if bottom >= CANVAS_HEIGHT:
+                self.miss_object(falling_object)
+                continue
+
+            # Check for collision with the baskets
+            if CATCH_TOP <= y <= CATCH_BOTTOM:
+                player = self.find_catching_player(falling_object)
+                if player is not None:
+                    self.catch_object(falling_object, player)
+
+    def find_catching_player(self, falling_object):
+        """Returns the player whose basket catches the object, if any"""
+        candidates = self.spatial_index.query(
+            falling_object.bbox(), layer="basket"
+        )
+        center_x = falling_object.x + falling_object.width / 2
+        if falling_object.kind == "power_up":
+            # Power-ups only count when their centre is over the basket
+            candidates = [
+                p for p in candidates if p.x <= center_x <= p.x + 100
+            ]
+        return self.closest_basket(candidates, center_x)
+
+    def nearest_player(self, falling_object):
+        """Returns the active player whose basket is closest to the object"""
+        center_x = falling_object.x + falling_object.width / 2
+        return self.closest_basket(self.active_players(), center_x)
+
+    def closest_basket(self, players, center_x):
+        """Returns the player whose basket centre is nearest to x, if any"""
+        distances = {
+            p: abs(p.x + p.basket_size()[0] / 2 - center_x) for p in players
+        }
+        if not distances:
+            return None
+        closest = min(distances.values())
+        tied = sorted(
+            (p for p, distance in distances.items() if distance == closest),
+            key=lambda p: p.index,
+        )
+        if len(tied) == 1:
+            return tied[0]
+        # Baskets in exactly the same place take turns
+        self.tie_breaks += 1
+        return tied[self.tie_breaks % len(tied)]
+
+    def remove_object(self, falling_object):
+        """Removes an object from the playfield"""
+        if self.objects.pop(falling_object.object_id, None) is not None:
+            self.kinematics.remove(falling_object.row)
+
+    def catch_object(self, falling_object, player):
+        """Applies the effect of a player catching an object"""
+        self.remove_object(falling_object)
+        self.bus.publish("catch", player, falling_object.kind)
+        if falling_object.kind == "golden":
+            self.update_score(player, golden_apple=True)
+        elif falling_object.kind == "rotten":
+            # Update score and lives when rotten apple is caught
+            if not player.invincibility:
+                self.update_score(player, rotten_apple=True)
+                self.update_lives(player, rotten_apple=True)
+        elif falling_object.kind == "power_up":
+            self.bus.publish("power_up", player)
+            self.apply_effect("invincible", player)
+        else:
+            self.update_score(player)
+
+    def miss_object(self, falling_object):
+        """Removes an object that fell off the bottom of the screen"""
+        caught_by = self.find_catching_player(falling_object)
+        self.remove_object(falling_object)
+        if caught_by is not None:
+            return
+        # A missed apple costs a life to the nearest basket
+        player = self.nearest_player(falling_object)
+        self.bus.publish("miss", player, falling_object.kind)
+        if falling_object.kind == "apple" and player is not None:
+            self.update_lives(player)
+
+    def update_score(self, player, golden_apple=False, rotten_apple=False):
+        """Updates a player's score based on apple type"""
+        if golden_apple:
+            player.score += 10
+            self.bus.publish("score", player, "golden_catch")
+            self.update_lives(player, golden_apple=True)
+        elif rotten_apple and not player.invincibility:
+            player.score -= 1
+            self.bus.publish("score", player, "rotten_catch")
+        else:
+            player.score += 1
+            self.bus.publish("score", player, "apple_catch")
+
+        # Check for level progression
+        self.implement_levels()
+
+    def update_lives(self, player, golden_apple=False, rotten_apple=False):
+        """Updates a player's lives based on apple type"""
+        if player.invincibility:  # Don't update lives
+            return
+
+        # Adjust lives based on apple type
+        if rotten_apple:
+            player.lives -= 1  # -1 life for rotten apple
+        elif golden_apple:
+            player.lives += 1  # +1 life for golden apple
+        elif player.lives > 0:  # -1 life for missing regular apple
+            player.lives -= 1
+
+        # Ensures lives don't become negative (below 0)
+        player.lives = max(0, player.lives)
+        self.bus.publish("lives", player)
+
+        if player.lives <= 0 and not player.eliminated:
+            self.eliminate(player)
+
+    def eliminate(self, player):
+        """Takes a player out, ending the game once nobody is left"""
+        player.eliminated = True
+        self.index_player(player)
+        self.bus.publish("eliminated", player)
+        if not self.active_players() and not self.game_over_flag:
+            self.game_over_flag = True
+            self.bus.publish("game_over")
+
+    def implement_levels(self):
+        """Handle level progression and difficulty adjustments"""
+        old_level = self.level
+
+        # More flexible level progression
+        self.level = 1 + self.lead_score() // 15  # Level up slightly faster
+
+        # When level increases:
+        if self.level != old_level:
+            self.bus.publish("level", None, self.level)
+            self.update_difficulty()
+
+    def update_difficulty(self):
+        """Update game parameters based on current level"""
+        # Slower speed reduction as level increases
+        self.base_speed = max(7 - (self.level * 0.3), 3)
+
+        # Apple spawn rate becomes more dynamic
+        self.spawn_rate = max(10 - (self.level // 2), 4)
+
+        # Add more difficulty modifiers
+        # Decreases allowed misses
+        self.max_missed_apples = max(5 - (self.level // 3), 2)
+
+
+class TextRenderer:
+    """Loads each font size once and caches text rendered with PIL"""
+
+    def __init__(self, font_path=FONT_PATH):
+        self.font_path = font_path
+        self.fonts = {}  # Size -> ImageFont
+        # (text, size, fill) -> transparent image and its offset
+        self.text_images = {}
+        self.atlases = {}  # (size, fill, background) -> GlyphAtlas
+
+    def font(self, size):
+        """Returns the font at a size, loading the TTF file only once"""
+        if size not in self.fonts:
+            self.fonts[size] = ImageFont.truetype(
+                open_asset_file(self.font_path), size
+            )
+        return self.fonts[size]
+
+    def render_text(self, text, size, fill):
+        """Returns a transparent image of the text, rendered only once"""
+        key = (text, size, fill)
+        if key not in self.text_images:
+            font = self.font(size)
+            measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+            left, top, right, bottom = measure.multiline_textbbox(
+                (0, 0), text, font=font
+            )
+            # Glyphs can reach above or left of the drawing position
+            image = Image.new(
+                "RGBA", (right - left, bottom - top), (0, 0, 0, 0)
+            )
+            ImageDraw.Draw(image).multiline_text(
+                (-left, -top), text, font=font, fill=fill
+            )
+            self.text_images[key] = (image, (left, top))
+        return self.text_images[key]
+
+    def draw_text(self, background, text, position, size, fill):
+        """Pastes cached text onto a background image"""
+        text_image, (left, top) = self.render_text(text, size, fill)
+        destination = (position[0] + left, position[1] + top)
+        if background.mode == "RGBA":
+            # Keeps the background opaque under anti-aliased edges
+            background.alpha_composite(text_image, destination)
+        else:
+            background.paste(text_image, destination, text_image)
+
+    def atlas(self, size, fill, background=None):
+        """Returns the glyph atlas for a font size and colour"""
+        key = (size, fill, background)
+        if key not in self.atlases:
+            self.atlases[key] = GlyphAtlas(self.font(size), fill, background)
+        return self.atlases[key]
+
+
+class GlyphAtlas:
+    """Character images for one font and colour, each rendered once"""
+
+    def __init__(self, font, fill, background=None):
+        self.font = font
+        self.fill = fill
+        self.background = background  # None for a transparent background
+        ascent, descent = font.getmetrics()
+        self.height = ascent + descent
+        self.advance = int(font.getlength("0"))  # The font is monospaced
+        self.glyphs = {}  # Character -> PhotoImage
+        # HUD characters are ready before the first frame needs them
+        for char in "0123456789 :-":
+            self.glyph(char)
+
+    def glyph(self, char):
+        """Returns the image for a character, rendering it on first use"""
+        if char not in self.glyphs:
+            image = Image.new(
+                "RGBA",
+                (self.advance, self.height),
+                self.background or (0, 0, 0, 0),
+            )
+            ImageDraw.Draw(image).text(
+                (0, 0), char, font=self.font, fill=self.fill
+            )
+            self.glyphs[char] = ImageTk.PhotoImage(image)
+        return self.glyphs[char]
+
+
+class GlyphText:
+    """Text on a canvas made of atlas glyphs, one image item per character"""
+
+    def __init__(self, canvas, x, y, atlas, anchor="nw", tags=()):
+        self.canvas = canvas
+        self.x = x
+        self.y = y
+        self.atlas = atlas
+        self.anchor = anchor  # "nw" or "center"
+        self.tags = tags
+        self.items = []
+        self.text = ""
+        self.left = None
+
+    def move_to(self, x, y):
+        """Moves the text to a new anchor point"""
+        self.x, self.y = x, y
+        text, self.text, self.left = self.text, "", None
+        self.set_text(text)
+
+    def set_text(self, text):
+        """Changes the text, only touching characters that changed"""
+        if text == self.text:
+            return
+        advance = self.atlas.advance
+        left, top = self.x, self.y
+        if self.anchor == "center":
+            left -= len(text) * advance / 2
+            top -= self.atlas.height / 2
+        moved = left != self.left
+
+        for index, char in enumerate(text):
+            x = left + index * advance
+            if index >= len(self.items):
+                self.items.append(self.canvas.create_image(
+                    x, top, anchor="nw", image=self.atlas.glyph(char),
+                    tags=self.tags,
+                ))
+                continue
+            if index >= len(self.text) or self.text[index] != char:
+                self.canvas.itemconfig(
+                    self.items[index], image=self.atlas.glyph(char)
+                )
+            if moved:
+                self.canvas.coords(self.items[index], x, top)
+
+        # Remove items left over from longer text
+        for item in self.items[len(text):]:
+            self.canvas.delete(item)
+        del self.items[len(text):]
+        self.text = text
+        self.left = left
+
+
+class GlyphLabel(tk.Canvas):
+    """HUD box that draws its text from a glyph atlas"""
+
+    def __init__(self, master, atlas, padx=10, pady=5):
+        tk.Canvas.__init__(
+            self,
+            master,
+            width=padx * 2,
+            height=atlas.height + pady * 2,
+            bg="black",
+            relief="solid",
+            bd=2,
+            highlightthickness=0,
+        )
+        self.padx = padx
+        self.glyph_text = GlyphText(self, padx, pady, atlas)
+
+    def set_text(self, text):
+        """Shows new text, resizing the box when its length changes"""
+        if len(text) != len(self.glyph_text.text):
+            width = len(text) * self.glyph_text.atlas.advance
+            self.config(width=width + self.padx * 2)
+        self.glyph_text.set_text(text)
+
+
+class Viewport:
+    """Maps logical playfield coordinates to pixels on the canvas"""
+
+    def __init__(self):
+        self.scale = 1.0
+        self.offset = (0, 0)  # Top left corner of the playfield
+
+    def fit(self, width, height):
+        """Scales the playfield to fit a canvas, returning True if changed"""
+        scale = min(width / CANVAS_WIDTH, height / CANVAS_HEIGHT)
+        # Nearby sizes share a scale so their sprites are reused
+        scale = max(SCALE_STEP, round(scale / SCALE_STEP) * SCALE_STEP)
+        scale = round(scale, 2)
+        # Centred, with bars on the sides the playfield doesn't fill
+        offset = (
+            (width - round(CANVAS_WIDTH * scale)) // 2,
+            (height - round(CANVAS_HEIGHT * scale)) // 2,
+        )
+        if (scale, offset) == (self.scale, self.offset):
+            return False
+        self.scale, self.offset = scale, offset
+        return True
+
+    def point(self, x, y):
+        """Returns the canvas position of a logical point"""
+        return (
+            self.offset[0] + x * self.scale,
+            self.offset[1] + y * self.scale,
+        )
+
+    def coords(self, coords):
+        """Returns canvas coords for a flat list of logical x, y pairs"""
+        points = []
+        for index in range(0, len(coords), 2):
+            points.extend(self.point(coords[index], coords[index + 1]))
+        return points
+
+    def font_size(self, size):
+        """Returns a font size scaled with the playfield"""
+        return max(1, round(size * self.scale))
+
+
+class SpriteScaler:
+    """Resizes each sprite once per scale and keeps recent scales"""
+
+    def __init__(self, sprites, keep=2):
+        self.sprites = sprites  # Name -> image at its logical size
+        self.keep = keep  # Scales kept, so resizing back is free
+        self.scales = {}  # Scale -> {name: resized image}, oldest first
+
+    def image(self, name, scale, simple=False):
+        """Returns a sprite drawn at a scale, resizing it only once"""
+        variants = self.scales.get(scale)
+        if variants is None:
+            variants = self.scales[scale] = {}
+            while len(self.scales) > self.keep:
+                del self.scales[next(iter(self.scales))]
+        key = (name, simple)
+        if key not in variants:
+            if simple:
+                # Edges are hardened after resizing, which softens them
+                image = simplify_sprite(self.image(name, scale))
+            else:
+                image = self.sprites[name]
+                if scale != 1:
+                    width, height = image.size
+                    image = image.resize(
+                        (max(1, round(width * scale)),
+                         max(1, round(height * scale))),
+                        Image.LANCZOS,
+                    )
+            variants[key] = image
+        return variants[key]
+
+
+class FrameCompositor:
+    """Draws the playfield into one image, redrawing only dirty boxes"""
+
+    def __init__(self, background, sprites, scale=1):
+        self.scale = scale  # Frame pixels per logical unit
+        self.background = background.convert("RGBA")
+        self.sprites = {
+            kind: image.convert("RGBA") for kind, image in sprites.items()
+        }
+        self.frame = self.background.copy()
+        self.drawn = {}  # Key -> (sprite kind, x, y) in the current frame
+        self.stale = []  # Boxes to redraw after a sprite changed
+
+    def reset(self):
+        """Clears the frame back to the background"""
+        self.frame = self.background.copy()
+        self.drawn = {}
+        self.stale = []
+
+    def set_sprite(self, kind, image):
+        """Replaces a sprite, redrawing everything that used it"""
+        for key, state in list(self.drawn.items()):
+            if state[0] == kind:
+                self.stale.append(self.sprite_box(state))
+                del self.drawn[key]
+        self.sprites[kind] = image.convert("RGBA")
+
+    def rescale(self, scale, background, sprites):
+        """Switches to a background and sprites drawn at another scale"""
+        self.scale = scale
+        self.background = background.convert("RGBA")
+        self.sprites = {
+            kind: image.convert("RGBA") for kind, image in sprites.items()
+        }
+        FrameCompositor.reset(self)
+
+    def sprite_box(self, state):
+        """Returns the box a sprite covers, clipped to the playfield"""
+        kind, x, y = state
+        width, height = self.sprites[kind].size
+        frame_width, frame_height = self.background.size
+        return (
+            max(x, 0),
+            max(y, 0),
+            min(x + width, frame_width),
+            min(y + height, frame_height),
+        )
+
+    def scene(self, world):
+        """Returns what should be drawn, in drawing order"""
+        # Baskets are drawn first so falling objects pass in front
+        scale = self.scale
+        shown = {}
+        for player in world.players:
+            if not player.eliminated:
+                shown[("basket", player.index)] = (
+                    "basket", round(player.x * scale), round(player.y * scale)
+                )
+        for object_id, falling_object in world.objects.items():
+            shown[object_id] = (
+                falling_object.kind,
+                round(falling_object.x * scale),
+                round(falling_object.y * scale),
+            )
+        return shown
+
+    def compose(self, world):
+        """Updates the frame for the world and returns the dirty boxes"""
+        shown = self.scene(world)
+        dirty = self.stale
+        self.stale = []
+        for key, state in self.drawn.items():
+            if shown.get(key) != state:
+                dirty.append(self.sprite_box(state))
+        for key, state in shown.items():
+            if self.drawn.get(key) != state:
+                dirty.append(self.sprite_box(state))
+        self.drawn = shown
+
+        boxes = [
+            box for box in merge_boxes(dirty)
+            if box[0] < box[2] and box[1] < box[3]
+        ]
+        for box in boxes:
+            self.redraw_box(box, shown.values())
+        return boxes
+
+    def redraw_box(self, box, states):
+        """Repaints one box from the background and the sprites over it"""
+        patch = self.background.crop(box)
+        for state in states:
+            sprite_box = self.sprite_box(state)
+            if not (
+                sprite_box[0] < box[2] and sprite_box[2] > box[0] and
+                sprite_box[1] < box[3] and sprite_box[3] > box[1]
+            ):
+                continue
+            kind, x, y = state
+            # Only the part of the sprite inside the box is composited
+            left, top = max(x, box[0]), max(y, box[1])
+            patch.alpha_composite(
+                self.sprites[kind],
+                dest=(left - box[0], top - box[1]),
+                source=(left - x, top - y),
+            )
+        self.frame.paste(patch, box[:2])
+
+
+class SoftwareRenderer(FrameCompositor):
+    """Shows composited frames on the canvas through one PhotoImage"""
+
+    def __init__(self, canvas, background, sprites, scale=1, offset=(0, 0)):
+        FrameCompositor.__init__(self, background, sprites, scale)
+        self.canvas = canvas
+        self.offset = offset  # Where the frame sits on the canvas
+        self.photo = ImageTk.PhotoImage(self.frame)
+        self.attach()
+
+    def attach(self):
+        """Adds the frame image to the canvas"""
+        self.item = self.canvas.create_image(
+            *self.offset, anchor="nw", image=self.photo
+        )
+
+    def rescale(self, scale, background, sprites, offset=(0, 0)):
+        """Shows frames drawn at another scale and position"""
+        FrameCompositor.rescale(self, scale, background, sprites)
+        self.offset = offset
+        self.photo = ImageTk.PhotoImage(self.frame)
+        self.canvas.itemconfig(self.item, image=self.photo)
+        self.canvas.coords(self.item, *offset)
+
+    def reset(self):
+        """Clears the frame and adds it to a freshly cleared canvas"""
+        FrameCompositor.reset(self)
+        self.photo.paste(self.frame)
+        self.attach()
+
+    def draw(self, world):
+        """Redraws changed parts of the frame and sends them to Tk"""
+        boxes = self.compose(world)
+        if not boxes:
+            return
+        area = sum((b[2] - b[0]) * (b[3] - b[1]) for b in boxes)
+        width, height = self.frame.size
+        if area > width * height * FULL_FRAME_SHARE:
+            self.photo.paste(self.frame)
+            return
+        # Copy each dirty box into the displayed image in place
+        for box in boxes:
+            patch = ImageTk.PhotoImage(self.frame.crop(box))
+            self.canvas.tk.call(
+                str(self.photo), "copy", str(patch),
+                "-to", box[0], box[1], "-compositingrule", "set",
+            )
+
+
+class OffscreenRenderer(FrameCompositor):
+    """Draws game frames to PIL images without a display"""
+
+    def __init__(self, sprites, text_renderer=None):
+        FrameCompositor.__init__(
+            self,
+            sprites["background"],
+            {kind: sprites[kind] for kind in PLAYFIELD_SPRITES},
+        )
+        self.text_renderer = text_renderer or TextRenderer()
+
+    def render(self, world):
+        """Returns an RGB image of the playfield and the HUD"""
+        self.compose(world)
+        image = self.frame.copy()
+        self.draw_hud(image, world.players)
+        return image.convert("RGB")
+
+    def draw_hud(self, image, players):
+        """Draws the score and lives boxes laid out like the status frame"""
+        # Same sizes as create_player_labels and GlyphLabel
+        single_player = len(players) == 1
+        size = 16 if single_player else 10
+        grid_pady = 15 if single_player else 2
+        font = self.text_renderer.font(size)
+        advance = int(font.getlength("0"))
+        ascent, descent = font.getmetrics()
+        box_height = ascent + descent + 5 * 2 + 2 * 2  # Padding and border
+
+        texts = [player_label_texts(p, players) for p in players]
+        columns = [
+            max(len(row[column]) for row in texts) * advance + 10 * 2 + 2 * 2
+            for column in (0, 1)
+        ]
+        row_height = box_height + grid_pady * 2
+        draw = ImageDraw.Draw(image)
+        draw.rectangle(
+            (0, 0, sum(columns) + 20 * 4 - 1, row_height * len(players) - 1),
+            fill="black",
+        )
+        for row, (score_text, lives_text) in enumerate(texts):
+            y = row * row_height + grid_pady + 2 + 5
+            # Score boxes sit on the left, lives boxes on the right
+            for x, text in (
+                (20 + 2 + 10, score_text),
+                (
+                    20 + columns[0] + 20 * 2 + columns[1] -
+                    len(lives_text) * advance - 10 - 2,
+                    lives_text,
+                ),
+            ):
+                # One cached image per character keeps the cache small
+                for index, char in enumerate(text):
+                    self.text_renderer.draw_text(
+                        image, char, (x + index * advance, y), size,
+                        "#add8e6",
+                    )
+
+
+class FrameWriter:
+    """Saves frames on a worker thread, fed through a bounded queue"""
+
+    # Encoders hold every frame of a GIF or WebP while saving it, about
+    # 2.4 MB each, so longer recordings need a folder of PNGs
+    MAX_ANIMATION_FRAMES = 300
+
+    def __init__(self, path, fps=20, queue_size=32):
+        self.path = path
+        self.fps = fps
+        # GIF and WebP files are put together from PNG frames once the
+        # recording ends, other paths are folders keeping the PNGs
+        self.animated = os.path.splitext(path)[1].lower() in (".gif", ".webp")
+        if self.animated:
+            self.temp_dir = tempfile.TemporaryDirectory()
+            self.folder = self.temp_dir.name
+        else:
+            self.folder = path
+            os.makedirs(path, exist_ok=True)
+        self.frames_queued = 0
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.frames_written = 0
+        self.stalls = 0  # Frames that had to wait for a full queue
+        self.error = None
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        self.thread.start()
+
+    def put(self, image):
+        """Queues a frame, only waiting when the queue is full"""
+        if self.animated and self.frames_queued >= self.MAX_ANIMATION_FRAMES:
+            # Stops the recording before the animation is saved
+            self.error = ValueError(
+                f"{self.path} can hold at most {self.MAX_ANIMATION_FRAMES} "
+                "frames, save longer recordings as a folder of PNGs"
+            )
+            raise self.error
+        self.frames_queued += 1
+        try:
+            self.queue.put_nowait(image)
+        except queue.Full:
+            self.stalls += 1
+            self.queue.put(image)
+
+    def work(self):
+        """Encodes queued frames until close() sends None"""
+        while True:
+            image = self.queue.get()
+            if image is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so put() never blocks forever
+            try:
+                self.write(image)
+            except Exception as error:
+                self.error = error
+        if self.animated:
+            if self.error is None and self.frames_written:
+                try:
+                    self.save_animation()
+                except Exception as error:
+                    self.error = error
+            self.temp_dir.cleanup()
+
+    def frame_path(self, index):
+        """Returns the path of a frame's PNG"""
+        return os.path.join(self.folder, f"frame_{index:06d}.png")
+
+    def write(self, image):
+        """Saves one frame as a PNG"""
+        # Fast compression, frame dumps are rarely kept for long
+        image.save(self.frame_path(self.frames_written), compress_level=1)
+        self.frames_written += 1
+
+    def load_frame(self, index):
+        """Reads a frame back for the animation"""
+        with Image.open(self.frame_path(index)) as frame:
+            if self.path.lower().endswith(".gif"):
+                return frame.quantize()  # Also keeps memory use down
+            return frame.copy()
+
+    def save_animation(self):
+        """Puts the PNG frames together into the GIF or WebP file"""
+        frames = [self.load_frame(i) for i in range(self.frames_written)]
+        frames[0].save(
+            self.path,
+            save_all=True,
+            append_images=frames[1:],
+            duration=1000 // self.fps,
+            loop=0,
+        )
+
+    def close(self):
+        """Waits for queued frames to be written"""
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+class SessionStats:
+    """Collects statistics of one game from the world's events"""
+
+    def __init__(self, world):
+        self.world = world
+        self.started = time.time()
+        self.catches = [{} for _ in world.players]  # Kind -> count
+        self.misses = [{} for _ in world.players]
+        # Game time of the oldest spawn each player hasn't reacted to
+        self.waiting_since = [None for _ in world.players]
+        self.reactions = {"count": 0, "total_ms": 0, "max_ms": 0}
+        self.power_up_since = [None for _ in world.players]
+        self.power_up_ms = [0 for _ in world.players]
+        self.levels = []  # [level, game time in ms reached]
+        self.pauses = 0
+        self.boss_keys = 0
+        self.late_ticks = {"count": 0, "max_ms": 0}
+        self.handlers = {
+            "catch": self.on_catch,
+            "miss": self.on_miss,
+            "spawn": self.on_spawn,
+            "move": self.on_move,
+            "level": self.on_level,
+            "effect": self.on_effect,
+            "effect_ended": self.on_effect_ended,
+            "pause": self.on_pause,
+            "boss_key": self.on_boss_key,
+            "late_tick": self.on_late_tick,
+        }
+        world.bus.subscribe("*", self.on_event)
+
+    def on_event(self, name, player, detail):
+        """Passes an event to its handler, counting it in memory only"""
+        handler = self.handlers.get(name)
+        if handler is not None:
+            handler(player, detail)
+
+    def on_catch(self, player, kind):
+        """Counts a catch by object type"""
+        catches = self.catches[player.index]
+        catches[kind] = catches.get(kind, 0) + 1
+
+    def on_miss(self, player, kind):
+        """Counts a miss against the nearest player"""
+        if player is not None:
+            misses = self.misses[player.index]
+            misses[kind] = misses.get(kind, 0) + 1
+
+    def on_spawn(self, player, kind):
+        """Starts the reaction timer of idle players"""
+        for index, waiting in enumerate(self.waiting_since):
+            if waiting is None:
+                self.waiting_since[index] = self.world.clock
+
+    def on_move(self, player, direction):
+        """Records how long a player took to react"""
+        waiting = self.waiting_since[player.index]
+        if waiting is None:
+            return
+        reaction = self.world.clock - waiting
+        self.reactions["count"] += 1
+        self.reactions["total_ms"] += reaction
+        self.reactions["max_ms"] = max(self.reactions["max_ms"], reaction)
+        self.waiting_since[player.index] = None
+
+    def on_level(self, player, level):
+        """Records when a level was first reached"""
+        # Rotten apples can drop the score back to an earlier level
+        if level > max((reached for reached, _ in self.levels), default=1):
+            self.levels.append([level, self.world.clock])
+
+    def on_effect(self, player, name):
+        """Starts timing a power-up"""
+        if name == "invincible" and self.power_up_since[player.index] is None:
+            self.power_up_since[player.index] = self.world.clock
+
+    def on_effect_ended(self, player, name):
+        """Adds a finished power-up to the uptime"""
+        if name == "invincible":
+            since = self.power_up_since[player.index]
+            if since is not None:
+                self.power_up_ms[player.index] += self.world.clock - since
+                self.power_up_since[player.index] = None
+
+    def on_pause(self, player, paused):
+        """Counts pauses"""
+        if paused:
+            self.pauses += 1
+
+    def on_boss_key(self, player, active):
+        """Counts boss key uses"""
+        if active:
+            self.boss_keys += 1
+
+    def on_late_tick(self, player, late_ms):
+        """Counts ticks that started late and the latest of them"""
+        self.late_ticks["count"] += 1
+        self.late_ticks["max_ms"] = max(self.late_ticks["max_ms"], late_ms)
+
+    def finish(self):
+        """Returns the session as one record ready to be logged"""
+        self.world.bus.unsubscribe("*", self.on_event)
+        # Power-ups still running count up to the end of the game
+        for index, since in enumerate(self.power_up_since):
+            if since is not None:
+                self.power_up_ms[index] += self.world.clock - since
+                self.power_up_since[index] = None
+        return {
+            "started": round(self.started),
+            "duration_ms": self.world.clock,
+            "level": self.world.level,
+            "levels": self.levels,
+            "reactions": self.reactions,
+            "pauses": self.pauses,
+            "boss_keys": self.boss_keys,
+            "late_ticks": self.late_ticks,
+            "players": [
+                {
+                    "name": player.name,
+                    "score": player.score,
+                    "lives": player.lives,
+                    "catches": self.catches[player.index],
+                    "misses": self.misses[player.index],
+                    "power_up_ms": self.power_up_ms[player.index],
+                }
+                for player in self.world.players
+            ],
+        }
+
+
+class TelemetryLog:
+    """Appends session records to a JSON Lines file on a worker thread"""
+
+    def __init__(self, path=TELEMETRY_PATH):
+        self.path = path
+        self.queue = queue.Queue()
+        self.thread = None  # Started when the first record arrives
+        self.queued = 0  # Records given to write()
+        self.done = 0  # Records written or given up on by the worker
+        self.error = None  # First failed write, for the game to report
+
+    def write(self, record):
+        """Queues a record, the file is written off the main thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+        self.queued += 1
+        self.queue.put(record)
+
+    def busy(self):
+        """Returns whether records are still waiting to be written"""
+        return self.done < self.queued
+
+    def work(self):
+        """Writes queued records until close() sends None"""
+        running = True
+        while running:
+            records = [self.queue.get()]
+            # Write everything waiting in one append
+            while not self.queue.empty():
+                records.append(self.queue.get())
+            if None in records:
+                running = False
+                records = [r for r in records if r is not None]
+            if not records:
+                continue
+            try:
+                folder = os.path.dirname(self.path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(
+                        json.dumps(r, separators=(",", ":")) + "\n"
+                        for r in records
+                    )
+            except OSError as error:
+                # Telemetry is never worth interrupting the game for, the
+                # game tells the players once from Tk's thread
+                if self.error is None:
+                    self.error = error
+            self.done += len(records)
+
+    def close(self):
+        """Waits for queued records to be written"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+
+def write_json_file(path, data):
+    """Writes JSON to a file, replacing the old file only once complete"""
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temporary_path, path)
+
+
+class AsyncioPump:
+    """Runs an asyncio event loop inside Tk's mainloop"""
+
+    def __init__(self, master, interval_ms=ASYNC_PUMP_MS):
+        import asyncio
+
+        self.master = master
+        self.interval_ms = interval_ms
+        self.loop = asyncio.new_event_loop()
+        self.tasks = set()  # Running tasks, cancelled by close()
+        self.after_id = None
+        self.paused = False  # Suspended games wake nothing
+
+    def start(self):
+        """Starts pumping the event loop from Tk"""
+        import asyncio
+
+        asyncio.set_event_loop(self.loop)
+        self.pump()
+
+    def pump(self):
+        """Runs every callback that is ready, then hands back to Tk"""
+        # Stopping straight away makes the loop poll for I/O, not wait
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        # With no tasks left only stray callbacks remain, so check rarely
+        interval = self.interval_ms if self.tasks else ASYNC_IDLE_MS
+        self.after_id = self.master.after(interval, self.pump)
+
+    def pause(self):
+        """Stops pumping, e.g. while the game is paused or hidden"""
+        self.paused = True
+        if self.after_id is not None:
+            self.master.after_cancel(self.after_id)
+            self.after_id = None
+
+    def resume(self):
+        """Starts pumping again after pause()"""
+        self.paused = False
+        if self.after_id is None:
+            self.pump()
+
+    def spawn(self, coroutine):
+        """Starts a coroutine as a task on the pumped loop"""
+        was_idle = not self.tasks
+        task = self.loop.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        if was_idle and self.after_id is not None:
+            # Wake from the idle interval so the task starts promptly
+            self.master.after_cancel(self.after_id)
+            self.after_id = self.master.after(self.interval_ms, self.pump)
+        return task
+
+    def close(self):
+        """Cancels running tasks and closes the event loop"""
+        import asyncio
+
+        if self.after_id is not None:
+            self.master.after_cancel(self.after_id)
+            self.after_id = None
+        for task in self.tasks:
+            task.cancel()
+        if self.tasks:
+            self.loop.run_until_complete(
+                asyncio.gather(*self.tasks, return_exceptions=True)
+            )
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+
+
+def rank_scores(scores):
+    """Turns a name -> best score mapping into ranked leaderboard entries"""
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [
+        {"Rank": index + 1, "Name": name, "Score": score}
+        for index, (name, score) in enumerate(ranked)
+    ]
+
+
+def merge_scores(entries, scores):
+    """Adds scores to leaderboard entries, keeping each name's best"""
+    best = {entry["Name"]: entry["Score"] for entry in entries}
+    for score in scores:
+        if score["Score"] > best.get(score["Name"], -math.inf):
+            best[score["Name"]] = score["Score"]
+    return rank_scores(best)
+
+
+class LeaderboardServer:
+    """Small HTTP/JSON leaderboard that every kiosk submits scores to"""
+
+    def __init__(
+        self, path=SERVER_LEADERBOARD_PATH, host="127.0.0.1",
+        port=LEADERBOARD_PORT,
+    ):
+        from http.server import ThreadingHTTPServer
+
+        self.path = path
+        self.lock = threading.Lock()  # Requests run on their own threads
+        self.scores = {}  # Name -> best score
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for entry in json.load(f):
+                    self.scores[entry["Name"]] = entry["Score"]
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass  # Start with an empty leaderboard
+        self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self):
+        """Returns the host and port the server is listening on"""
+        return self.httpd.server_address[:2]
+
+    def top(self, limit):
+        """Returns the best entries, up to limit of them"""
+        with self.lock:
+            return rank_scores(self.scores)[:limit]
+
+    def submit(self, scores):
+        """Records a batch of scores, saving the file once per batch"""
+        # The whole batch is checked first, so a bad score changes nothing
+        for score in scores:
+            name, value = score["Name"], score["Score"]
+            if (not isinstance(name, str) or not isinstance(value, int) or
+                    isinstance(value, bool)):
+                raise ValueError(f"Bad score: {score!r}")
+        with self.lock:
+            for score in scores:
+                name, value = score["Name"], score["Score"]
+                if value > self.scores.get(name, -math.inf):
+                    self.scores[name] = value
+            write_json_file(self.path, rank_scores(self.scores))
+        return len(scores)
+
+    def handler_class(self):
+        """Returns a request handler class bound to this leaderboard"""
+        from http.server import BaseHTTPRequestHandler
+        from urllib.parse import parse_qs, urlsplit
+
+        board = self
+
+        class LeaderboardHandler(BaseHTTPRequestHandler):
+            """Answers GET /top?limit=N and POST /scores"""
+
+            protocol_version = "HTTP/1.1"  # Lets clients reuse connections
+
+            def do_GET(self):
+                """Sends the best entries"""
+                url = urlsplit(self.path)
+                if url.path != "/top":
+                    return self.send_json(404, {"error": "Not found"})
+                try:
+                    limit = int(parse_qs(url.query).get(
+                        "limit", [LEADERBOARD_TOP_N]
+                    )[0])
+                except ValueError:
+                    return self.send_json(400, {"error": "Bad limit"})
+                self.send_json(200, {"entries": board.top(limit)})
+
+            def do_POST(self):
+                """Records a batch of scores"""
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # The body can't be skipped without a length
+                    self.close_connection = True
+                    return self.send_json(
+                        400, {"error": "Bad Content-Length"}
+                    )
+                body = self.rfile.read(length)
+                if self.path != "/scores":
+                    return self.send_json(404, {"error": "Not found"})
+                try:
+                    accepted = board.submit(json.loads(body)["scores"])
+                except (ValueError, KeyError, TypeError) as error:
+                    return self.send_json(400, {"error": str(error)})
+                self.send_json(200, {"accepted": accepted})
+
+            def send_json(self, status, data):
+                """Sends a JSON response that keeps the connection open"""
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                """Keeps the console quiet for every request"""
+
+        return LeaderboardHandler
+
+    def serve_forever(self):
+        """Answers requests until shutdown() is called"""
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        """Stops serving and closes the listening socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class LeaderboardClient:
+    """Shares scores with a leaderboard server from the asyncio pump"""
+
+    def __init__(
+        self, pump, url, queue_path=LEADERBOARD_QUEUE_PATH,
+        rejected_path=LEADERBOARD_REJECTED_PATH, top_n=LEADERBOARD_TOP_N,
+        timeout=5,
+    ):
+        import asyncio
+        from urllib.parse import urlsplit
+
+        address = urlsplit(url)
+        self.host = address.hostname
+        self.port = address.port or 80
+        self.pump = pump
+        self.queue_path = queue_path
+        self.rejected_path = rejected_path  # Kept for someone to look at
+        self.top_n = top_n
+        self.timeout = timeout  # Seconds, requests run off Tk's thread
+        self.connection = None  # Kept open and reused between requests
+        self.lock = asyncio.Lock()  # One request on the connection at once
+        self.wake = asyncio.Event()  # Set when there are scores to send
+        self.top = None  # Cached best entries, None until first fetched
+        self.online = False  # Whether the last request succeeded
+        self.on_rejected = None  # Called with scores the server refused
+        # Scores the server has not accepted yet, kept across restarts
+        try:
+            with open(queue_path, "r", encoding="utf-8") as f:
+                self.pending = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.pending = []
+
+    def start(self):
+        """Starts sending queued scores and refreshing the cached ranking"""
+        self.pump.spawn(self.send_scores())
+        self.pump.spawn(self.refresh_top())
+        if self.pending:
+            self.wake.set()  # Left over from a session spent offline
+
+    def submit(self, name, score):
+        """Queues a score to send, returning at once"""
+        self.pending.append({"Name": name, "Score": score})
+        self.wake.set()
+
+    def ranking(self):
+        """Returns the cached ranking with queued scores, or None"""
+        if self.top is None:
+            return None
+        return merge_scores(self.top, self.pending)[:self.top_n]
+
+    def request(self, method, path, data=None):
+        """Sends one request on the kept-open connection, off Tk's thread"""
+        import http.client
+
+        body = None if data is None else json.dumps(data).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        # A kept-open connection the server has since closed fails on
+        # first use, so a fresh connection gets one more try
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+            try:
+                self.connection.request(method, path, body, headers)
+                response = self.connection.getresponse()
+                reply = response.read()
+            except (http.client.HTTPException, OSError) as error:
+                self.connection.close()
+                self.connection = None
+                if attempt or isinstance(error, TimeoutError):
+                    raise OSError(f"Leaderboard unreachable: {error}")
+                continue
+            if 400 <= response.status < 500:
+                # The server is up but refuses the request, so sending it
+                # again would only be refused again
+                raise ValueError(
+                    f"Leaderboard rejected the request ({response.status})"
+                )
+            if response.status != 200:
+                raise OSError(f"Leaderboard answered {response.status}")
+            try:
+                return json.loads(reply)
+            except ValueError as error:
+                raise OSError(f"Bad leaderboard reply: {error}")
+
+    async def call(self, method, path, data=None):
+        """Runs a request on a worker thread without blocking the game"""
+        import asyncio
+
+        async with self.lock:
+            return await asyncio.to_thread(self.request, method, path, data)
+
+    async def send_scores(self):
+        """Sends queued scores in batches, retrying while offline"""
+        import asyncio
+
+        delay = LEADERBOARD_RETRY_SECONDS[0]
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            # Everything queued so far goes in one request
+            batch = list(self.pending)
+            await asyncio.to_thread(write_json_file, self.queue_path, batch)
+            try:
+                rejected = await self.post_scores(batch)
+            except OSError:
+                self.online = False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LEADERBOARD_RETRY_SECONDS[1])
+                self.wake.set()
+                continue
+            self.online = True
+            delay = LEADERBOARD_RETRY_SECONDS[0]
+            # Scores added during the request wait for the next batch
+            del self.pending[:len(batch)]
+            accepted = [score for score in batch if score not in rejected]
+            if self.top is not None:
+                self.top = merge_scores(self.top, accepted)[:self.top_n]
+            await asyncio.to_thread(
+                write_json_file, self.queue_path, list(self.pending)
+            )
+            if rejected:
+                await asyncio.to_thread(self.quarantine, rejected)
+                if self.on_rejected is not None:
+                    self.on_rejected(rejected)
+
+    async def post_scores(self, scores):
+        """Sends scores, returning those the server rejected"""
+        try:
+            await self.call("POST", "/scores", {"scores": scores})
+            return []
+        except ValueError:
+            if len(scores) == 1:
+                return scores
+        # One bad score gets its whole batch refused, so the scores go
+        # again one at a time to find which
+        rejected = []
+        for score in scores:
+            rejected += await self.post_scores([score])
+        return rejected
+
+    def quarantine(self, scores):
+        """Adds rejected scores to the file of scores never to resend"""
+        try:
+            with open(self.rejected_path, "r", encoding="utf-8") as f:
+                kept = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            kept = []
+        write_json_file(self.rejected_path, kept + scores)
+
+    async def refresh_top(self):
+        """Fetches the best entries now and then for the leaderboard"""
+        import asyncio
+
+        while True:
+            try:
+                reply = await self.call("GET", f"/top?limit={self.top_n}")
+                self.top = reply["entries"]
+                self.online = True
+            except OSError:
+                self.online = False  # Keep showing the last ranking
+            except ValueError:
+                self.online = True  # Reachable, though it refused
+            await asyncio.sleep(LEADERBOARD_REFRESH_SECONDS)
+
+    def close(self):
+        """Saves unsent scores for next time and closes the connection"""
+        write_json_file(self.queue_path, self.pending)
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class Tween:
+    """One value animated from start to end over a duration"""
+
+    def __init__(self, setter, start, end, duration, easing, on_done):
+        self.setter = setter  # Called with each new whole-number value
+        self.start = start
+        self.end = end
+        self.duration = duration  # ms
+        self.easing = EASINGS[easing]
+        self.on_done = on_done
+        self.elapsed = 0
+        self.value = None  # Last value passed to the setter
+        self.done = False
+
+    def apply(self, progress):
+        """Sets the value for a progress from 0 to 1, if it changed"""
+        value = round(
+            self.start + (self.end - self.start) * self.easing(progress)
+        )
+        if value != self.value:
+            self.value = value
+            self.setter(value)
+
+
+class TweenEngine:
+    """Runs every animation from one update per frame"""
+
+    def __init__(self):
+        self.tweens = []
+        self.cancelled = False  # Whether cancelled tweens need removing
+
+    def add(self, setter, start, end, duration, easing="linear",
+            on_done=None):
+        """Starts animating a value and returns its tween"""
+        tween = Tween(setter, start, end, duration, easing, on_done)
+        tween.apply(0)
+        self.tweens.append(tween)
+        return tween
+
+    def update(self, elapsed):
+        """Advances every tween by elapsed ms"""
+        finished = []
+        for tween in self.tweens:
+            if tween.done:
+                continue
+            tween.elapsed += elapsed
+            progress = min(1, tween.elapsed / tween.duration)
+            tween.apply(progress)
+            if progress >= 1:
+                tween.done = True
+                finished.append(tween)
+        if finished or self.cancelled:
+            self.tweens = [t for t in self.tweens if not t.done]
+            self.cancelled = False
+        # Callbacks run last, so they can safely start new tweens
+        for tween in finished:
+            if tween.on_done is not None:
+                tween.on_done()
+
+    def cancel(self, tween):
+        """Stops a tween where it is, without calling on_done"""
+        tween.done = True
+        self.cancelled = True
+
+    def finish_all(self):
+        """Jumps every tween to its end, as if its time had passed"""
+        tweens, self.tweens = self.tweens, []
+        for tween in tweens:
+            if not tween.done:
+                tween.done = True
+                tween.apply(1)
+                if tween.on_done is not None:
+                    tween.on_done()
+
+    def cancel_all(self):
+        """Drops every tween, for when their canvas items are gone"""
+        self.tweens = []
+
+
+class QualityGovernor:
+    """Sheds optional drawing while frames run over the time budget"""
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, window=20):
+        self.budget_ms = budget_ms
+        self.window = window  # Frames measured before each decision
+        self.level = 0  # Index into QUALITY_TIERS, 0 is the best
+        self.samples = []
+        self.calm_windows = 0  # Windows in a row with headroom
+
+    @property
+    def tier(self):
+        """Returns the settings of the current quality tier"""
+        return QUALITY_TIERS[self.level]
+
+    def record(self, frame_ms):
+        """Adds a frame time, returning True if the tier changed"""
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.window:
+            return False
+        # Judged on the slow frames, so a few stutters still count
+        samples = sorted(self.samples)
+        self.samples = []
+        slow_ms = samples[len(samples) * 9 // 10]
+        if slow_ms > self.budget_ms:
+            self.calm_windows = 0
+            if self.level < len(QUALITY_TIERS) - 1:
+                self.level += 1
+                return True
+            return False
+        if slow_ms < self.budget_ms * RESTORE_SHARE and self.level > 0:
+            self.calm_windows += 1
+            if self.calm_windows >= RESTORE_WINDOWS:
+                self.calm_windows = 0
+                self.level -= 1
+                return True
+            return False
+        self.calm_windows = 0
+        return False
+
+    def skip(self):
+        """Forgets partial measurements, e.g. across a pause"""
+        self.samples = []
+
+
+def gray(level):
+    """Returns a Tk colour for a gray level from 0 to 255"""
+    return "#{0:02x}{0:02x}{0:02x}".format(level)
+
+
 class Game(tk.Frame):
     """Defines class Game and initialises variables and flags"""
 
     def __init__(
-        self, master=None, player_name="Player"
+        self, master=None, autopilot=None, renderer="canvas",
+        frame_budget_ms=FRAME_BUDGET_MS, async_pump=None, autosave_seconds=0,
+        leaderboard_client=None, broadcaster=None,
     ):  # Automatically called when an instance of Game class is created
         tk.Frame.__init__(self, master)
         self.grid(
             sticky="nsew"
         )  # Makes grid expand in all directions to fit the window
-        self.player_name = player_name
-        self.score_value = 0
-        self.lives_value = 5
-        self.g_apple_counter = 0
-        self.r_apple_counter = 0
-        self.power_up_counter = 0
+        self.players = []  # Filled in from the start menu entries
+        self.world = None  # Shared simulation for every player's basket
+        self.object_items = {}  # Falling object id -> canvas item
+        self.tick_after_id = None
+        self.periodic_after_id = None
+        # Ids of one-off after calls still waiting to run
+        self.pending_after_ids = set()
+        # Menu, game and game over screens stacked in the main window
+        self.screens = {"game": self}
+        self.text_renderer = TextRenderer()  # Shared font and text caches
+        self.tweens = TweenEngine()  # Fades and other animations
+        self.help_window = None  # Game guide, built on first use
+        self.autopilot = autopilot  # Policy that plays for every player
+        self.telemetry = TelemetryLog()  # Statistics of finished games
+        self.telemetry_error_shown = False
+        self.session_stats = None
+        self.renderer = renderer  # "canvas" items or "software" frames
+        self.frame_renderer = None  # SoftwareRenderer when it is used
         # State flags
         self.game_over_flag = False
         self.boss_key_active = False
-        self.invincibility = False
         self.is_paused = False
         self.game_started = False
-        self.large_basket = False
-        self.cheat_invincibility = False
-        self.level = 1  # Sets initial game level
-        self.createWidgets()
+        self.flash_visible = True  # Phase of the flashing power-up text
+        self.canvas = None  # Game canvas, built once the sprites load
+        self.viewport = Viewport()  # Logical playfield -> canvas pixels
+        self.photos = {}  # Sprite name -> Tk image at the current scale
+        self.resize_after_id = None
+        # Drops optional drawing on slow machines, shown in the HUD
+        self.governor = QualityGovernor(frame_budget_ms)
+        self.frame_count = 0  # Ticks since the game started
+        self.last_tick_at = None  # When the previous tick started
+        # Asyncio loop run inside Tk for background tasks, if any
+        self.async_pump = async_pump
+        self.autosave_seconds = autosave_seconds  # 0 turns autosave off
+        self.autosave_task = None
+        # Shared leaderboard server, if any, reached through the pump
+        self.leaderboard_client = leaderboard_client
+        if leaderboard_client is not None:
+            leaderboard_client.on_rejected = self.report_rejected_scores
+        self.versus = None  # VersusSession when playing another machine
+        self.broadcaster = broadcaster  # Streams the game to spectators
+        # Game sprites load on a worker thread while the menu is shown
+        self.assets = AssetLoader(
+            GAME_SPRITES, self.text_renderer, GAME_FONT_SIZES
+        )
+        self.load_menu_images()
         self.start_game()
+        self.poll_assets()
         self.master.bind(
             "<KeyPress>", self.key_pressed
         )  # Binds key press events to the method 'key_pressed'
@@ -46,58 +2674,109 @@ class Game(tk.Frame):
 
     def show_message(self, text):
         """Function to display message"""
-        message = self.canvas.create_text(
-            500, 300, text=text, font=("Arial", 24, "bold"), fill="white"
+        if self.game_over_flag and "game_over" in self.screens:
+            # The game over screen covers the canvas
+            label = self.game_over_notice_label
+            label.config(text=text)
+            self.schedule(2000, lambda: label.config(text=""))
+            return
+        message = self.create_text(
+            CANVAS_WIDTH / 2, CANVAS_HEIGHT / 2, 24, text=text, fill="white"
         )
         # Displays temporary message for 2s
-        self.master.after(2000, lambda: self.canvas.delete(message))
+        self.schedule(2000, lambda: self.canvas.delete(message))
+
+    def save_path(self, kind="save"):
+        """Returns the save file path for the current players"""
+        names = "_".join(player.name for player in self.players)
+        return f"saves/{names}_{kind}.json"
+
+    def game_state(self):
+        """Returns the game state that save files store"""
+        return {
+            "players": [
+                {
+                    "player_name": player.name,
+                    "score": player.score,
+                    "lives": player.lives,
+                    "basket_position": [player.x, player.y],
+                }
+                for player in self.players
+            ],
+            "effects": self.world.effects.to_list(self.world.clock),
+            "timestamp": time.time(),
+        }  # To load recent save
 
     def save_game(self):
         """Allows user to save their game state in a JSON file"""
-        game_state = {
-            "player_name": self.player_name,
-            "score": self.score_value,
-            "lives": self.lives_value,
-            "basket_position": self.canvas.coords(
-                self.basket_image_id
-            ),  # Saves basket coords
-            "invincibility": self.invincibility,
-            "large_basket": self.large_basket,
-            "timestamp": time.time(),
-        }  # To load recent save
-        save_path = f"saves/{self.player_name}_save.json"
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(game_state, f)  # Saves game
+        if self.world is None:
+            return
+        write_json_file(self.save_path(), self.game_state())  # Saves game
 
         # Prints message to confirm saved game
         self.show_message("Game Saved!")
 
+    def start_autosave(self):
+        """Starts saving the game in the background, if turned on"""
+        if self.async_pump is not None and self.autosave_seconds > 0:
+            self.autosave_task = self.async_pump.spawn(self.autosave())
+
+    def stop_autosave(self):
+        """Stops background saving when the game ends"""
+        if self.autosave_task is not None:
+            self.autosave_task.cancel()
+            self.autosave_task = None
+
+    async def autosave(self):
+        """Saves the running game every few seconds, writing off-thread"""
+        import asyncio
+
+        while True:
+            await asyncio.sleep(self.autosave_seconds)
+            if self.world is None or self.is_paused or self.boss_key_active:
+                continue
+            # The state is read here, on Tk's thread, then written
+            await asyncio.to_thread(
+                write_json_file, self.save_path("autosave"),
+                self.game_state(),
+            )
+
     def load_game(self):
         """Allows user to load their saved game state"""
+        if self.world is None:
+            return
         try:
-            with open(
-                f"saves/{self.player_name}_save.json", "r", encoding="utf-8"
-            ) as f:
+            with open(self.save_path(), "r", encoding="utf-8") as f:
                 saved_state = json.load(f)  # Load the saved game state
 
-            # Restore previous game state
-            self.score_value = saved_state["score"]
-            self.lives_value = saved_state["lives"]
-            self.score_label.config(text=f"Score: {self.score_value}")
-            self.lives_label.config(text=f"Lives: {self.lives_value}")
+            # Saves from single player games store one player at top level
+            saved_players = saved_state.get("players", [saved_state])
 
-            # Restore previous basket position
-            self.canvas.coords(
-                self.basket_image_id,
-                saved_state["basket_position"][0],
-                saved_state["basket_position"][1],
-            )
-
-            # Restore power-ups
-            if saved_state["invincibility"]:
-                self.activate_invincibility()
-            if saved_state["large_basket"]:
-                self.toggle_basket_size()
+            # Restore previous game state
+            for player, saved in zip(self.players, saved_players):
+                player.score = saved["score"]
+                player.lives = saved["lives"]
+                self.update_player_labels(player)
+
+                # Restore previous basket position. Older saves may hold
+                # float positions, but baskets move in whole pixels.
+                x, y = saved["basket_position"][:2]
+                player.x, player.y = int(round(x)), int(round(y))
+                self.world.index_player(player)
+                self.draw_basket(player)
+
+            # Restore power-ups and cheats with the time they had left
+            if "effects" in saved_state:
+                self.world.load_effects(saved_state["effects"])
+            else:
+                # Older saves only kept flags, so effects start afresh
+                for player, saved in zip(self.players, saved_players):
+                    if saved["invincibility"]:
+                        self.world.apply_effect("invincible", player)
+                if any(saved["large_basket"] for saved in saved_players):
+                    if not self.world.has_effect("large_basket"):
+                        self.world.apply_effect("large_basket")
+            self.handle_world_events()
 
             self.show_message(
                 "Game Loaded!"
@@ -110,14 +2789,33 @@ class Game(tk.Frame):
 
     def show_game_help(self):
         """Displays game guide & instructions"""
-        if not self.is_paused:
-            self.toggle_pause()  # Pauses game when help button clicked
+        # Pauses a running game when help button clicked
+        if self.world is not None and not self.game_over_flag:
+            if not self.is_paused:
+                self.toggle_pause()
 
-        help_window = tk.Toplevel(self.master)
-        help_window.title("Game Guide")
-        help_window.geometry("600x800")
+        # The guide is built once, then hidden and shown again
+        if self.help_window is None or not self.help_window.winfo_exists():
+            self.build_help_window()
+        else:
+            self.help_window.deiconify()
+        # Players and their keys change between games
+        self.help_controls_label.config(
+            text=self.format_help_lines(self.control_help_lines())
+        )
+        self.help_window.lift()
+
+    def build_help_window(self):
+        """Creates the game guide window from the help sections"""
+        self.help_window = tk.Toplevel(self.master)
+        self.help_window.title("Game Guide")
+        self.help_window.geometry("600x800")
+        # Closing the window only hides it for next time
+        self.help_window.protocol(
+            "WM_DELETE_WINDOW", self.help_window.withdraw
+        )
 
-        help_frame = tk.Frame(help_window)  # Uses frame to organise widgets
+        help_frame = tk.Frame(self.help_window)  # Organises widgets
         help_frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
 
         title_label = tk.Label(
@@ -127,8 +2825,51 @@ class Game(tk.Frame):
         )
         title_label.pack(pady=(0, 20))
 
-        # Content for the game guide & instructions
-        help_sections = [
+        for section in self.help_sections():  # Create sections in guide
+            section_frame = tk.Frame(help_frame)
+            section_frame.pack(fill=tk.X, pady=10, anchor="w")
+            title_label = tk.Label(
+                section_frame, text=section["title"], font=(
+                    "Arial", 12, "bold"))
+            title_label.pack(anchor="w")
+
+            # One label per section keeps the widget count low
+            content_label = tk.Label(
+                section_frame,
+                text=self.format_help_lines(section["content"]),
+                font=("Arial", 12),
+                anchor="w",
+                justify=tk.LEFT,
+            )
+            content_label.pack(anchor="w")
+            if section["title"] == "🕹️ Controls":
+                self.help_controls_label = content_label
+
+        close_button = tk.Button(
+            help_frame, text="Got it!", command=self.help_window.withdraw
+        )
+        close_button.pack(pady=20)
+
+    def format_help_lines(self, lines):
+        """Joins guide lines into one bulleted block of text"""
+        return "\n".join(f"• {line}" for line in lines)
+
+    def control_help_lines(self):
+        """Lists movement keys for each player and the game action keys"""
+        players = self.players or [Player("Player", *DEFAULT_PLAYER_KEYS[0])]
+        lines = []
+        for player in players:
+            left = KEY_NAMES.get(player.left_key, player.left_key)
+            right = KEY_NAMES.get(player.right_key, player.right_key)
+            prefix = f"{player.name}: " if len(players) > 1 else ""
+            lines.append(f"{prefix}{left}/{right} Keys: Move basket")
+        for key, (_, description) in HOTKEYS.items():
+            lines.append(f"{key.upper()} Key: {description}")
+        return lines
+
+    def help_sections(self):
+        """Content for the game guide & instructions"""
+        return [
             {
                 "title": "🎯 Objective",
                 "content": [
@@ -140,13 +2881,7 @@ class Game(tk.Frame):
             },
             {
                 "title": "🕹️ Controls",
-                "content": [
-                    "Left/Right Arrow Keys: Move basket",
-                    "P Key: Pause/Resume game",
-                    "B Key: Boss key (quick hide)",
-                    "S Key: Save current game progress",
-                    "W Key: Load previously saved game",
-                ],
+                "content": self.control_help_lines(),
             },
             {
                 "title": "🍏 Apple Types",
@@ -165,156 +2900,110 @@ class Game(tk.Frame):
             {
                 "title": "⭐ Cheat Codes",
                 "content": [
-                    "'mega': Toggle basket size",
-                    "'god': Temporary invincibility",
-                    "'life': Add extra lives",
-                    "'cat': Gain 9 lives",
+                    f"'{code}': {description}"
+                    for code, (_, description) in CHEAT_CODES.items()
                 ],
             },
         ]
 
-        for section in help_sections:  # Create sections in game guide
-            section_frame = tk.Frame(help_frame)
-            section_frame.pack(fill=tk.X, pady=10, anchor="w")
-            title_label = tk.Label(
-                section_frame, text=section["title"], font=(
-                    "Arial", 12, "bold"))
-            title_label.pack(anchor="w")
-
-            for i in section["content"]:
-                content_label = tk.Label(
-                    section_frame,
-                    text=f"• {i}",
-                    font=("Arial", 12),
-                    anchor="w",
-                    justify=tk.LEFT,
-                )
-                content_label.pack(anchor="w")
-
-        close_button = tk.Button(
-            help_frame, text="Got it!", command=help_window.destroy
-        )
-        close_button.pack(pady=20)
-
     def key_pressed(self, event):
         """Used to handle key press events"""
-        if event.keysym == self.left_key:
-            self.move_left()
-        elif event.keysym == self.right_key:
-            self.move_right()
-        elif event.keysym == "p":  # 'P' key to pause/resume
-            self.toggle_pause()
-        elif event.keysym == "b":  # 'B' key for boss key
-            self.toggle_boss_key()
-        elif event.keysym == "s":  # 'S' key for save game
-            self.save_game()
-        elif event.keysym == "w":  # 'W' key for load game
-            self.load_game()
+        if self.world is None or self.game_over_flag:
+            return  # Ignore keys unless a game is running
+        if self.versus is not None:
+            # Moves go through the session, one per tick. Pausing, saves
+            # and cheats would split the shared game, so they are off.
+            local = self.versus.local
+            if event.keysym == local.left_key:
+                self.versus.press(-1)
+            elif event.keysym == local.right_key:
+                self.versus.press(1)
+            return
+        for player in self.players:
+            if event.keysym == player.left_key:
+                self.move_left(player)
+                break
+            if event.keysym == player.right_key:
+                self.move_right(player)
+                break
+        else:
+            # Pause, boss key, save and load
+            action = HOTKEYS.get(event.keysym)
+            if action is not None:
+                getattr(self, action[0])()
         self.cheat_code_buffer += event.char  # Add key to buffer
         self.cheat_code_buffer = self.cheat_code_buffer[
             -10:
         ]  # Ensures buffer contains recent input
         # Check for cheat codes in buffer
-        if "mega" in self.cheat_code_buffer.lower():
-            self.toggle_basket_size()
-            self.cheat_code_buffer = ""  # Clears buffer after cheat code used
-        elif "god" in self.cheat_code_buffer.lower():
-            self.toggle_cheat_invincibility()
-            self.cheat_code_buffer = ""
-        elif "life" in self.cheat_code_buffer.lower():
-            self.add_extra_lives()
-            self.cheat_code_buffer = ""
-        elif "cat" in self.cheat_code_buffer.lower():
-            self.cat_cheat_code()
-            self.cheat_code_buffer = ""
+        for code, (method_name, _) in CHEAT_CODES.items():
+            if code in self.cheat_code_buffer.lower():
+                getattr(self, method_name)()
+                self.cheat_code_buffer = ""  # Clears buffer after cheat used
+                break
 
     def toggle_basket_size(self):
         """Allows user to toggle between normal and large basket size"""
-        self.large_basket = not self.large_basket
-        if self.large_basket:
-            # Resizes basket to larger size
-            self.basket_image = self.basket_image.resize(
-                (200, 120), Image.LANCZOS)
-            self.basket_image_tk = ImageTk.PhotoImage(self.basket_image)
-        else:
-            # Resizes basket to original size
-            self.basket_image = self.basket_image.resize(
-                (150, 100), Image.LANCZOS)
-            self.basket_image_tk = ImageTk.PhotoImage(self.basket_image)
-
-        # Update basket size on canvas
-        current_coords = self.canvas.coords(self.basket_image_id)
-        self.canvas.delete(self.basket_image_id)
-        self.basket_image_id = self.canvas.create_image(
-            current_coords[0],
-            current_coords[1],
-            anchor="nw",
-            image=self.basket_image_tk,
-        )
+        self.world.apply_effect("large_basket")
+        self.handle_world_events()
 
         # Prints message to confirm toggled basket size
         self.show_cheat_message("Basket size toggled!")
 
+    def update_basket_images(self):
+        """Shows the large or normal basket for every player"""
+        if self.world.has_effect("large_basket"):
+            name = "large_basket"
+        else:
+            name = "basket"
+        if self.frame_renderer is not None:
+            self.frame_renderer.set_sprite("basket", self.scaled_sprite(name))
+            self.frame_renderer.draw(self.world)
+            return
+        for player in self.world.active_players():
+            self.canvas.itemconfig(
+                player.basket_item, image=self.sprite_photo(name)
+            )
+
     def cat_cheat_code(self):
         """Allows user to add +9 lives when 'cat' cheat code is used"""
-        self.lives_value += 9
-        self.lives_label.config(text=f"Lives: {self.lives_value}")
+        for player in self.world.active_players():
+            player.lives += 9
+            self.update_player_labels(player)
         self.show_cheat_message(
             "🐱 Meow! You now have +9 lives like a cat!"
         )  # Prints message to confirm activation of 'cat' cheat code
 
     def toggle_cheat_invincibility(self):
         """Allows user to add a god (invincibility) mode"""
-        if not self.cheat_invincibility:
-            self.cheat_invincibility = True
-            self.invincibility = True
-
-            # Prints message to confirm god mode active
-            self.cheat_invincibility_indicator = self.canvas.create_text(
-                500,
-                50,
-                text="🛡️ GOD MODE ACTIVE 🛡️",
-                font=("Press Start 2P", 24, "bold"),
-                fill="purple",
-                tags="cheat_god_mode",
-            )
-
-            # Countdown timer for god mode for 10 seconds
-            self.god_mode_timer = 10
-            self.god_mode_countdown = self.canvas.create_text(
-                500,
-                80,
-                text=f"Time Remaining: {self.god_mode_timer} s",
-                font=("Press Start 2P", 16),
-                fill="purple",
-                tags="cheat_god_mode",
-            )
-
-            self.show_cheat_message("God Mode: 10 seconds!")
-
-            self.update_god_cheat_countdown()  # Begin 10s countdown
-        else:
-            self.end_cheat_invincibility()
+        self.world.apply_effect("god_mode")
+        self.handle_world_events()
+
+    def show_god_mode(self):
+        """Shows the god mode banner and its countdown"""
+        # Prints message to confirm god mode active
+        self.cheat_invincibility_indicator = GlyphText(
+            self.canvas,
+            *self.viewport.point(CANVAS_WIDTH / 2, 50),
+            self.text_renderer.atlas(24, "purple"),
+            anchor="center",
+            tags="cheat_god_mode",
+        )
+        self.cheat_invincibility_indicator.set_text("GOD MODE ACTIVE")
 
-    def update_god_cheat_countdown(self):
-        """Updates countdown timer by -1s"""
-        if self.god_mode_timer > 0:
-            self.god_mode_timer -= 1
-            self.canvas.itemconfig(
-                self.god_mode_countdown,
-                text=f"Time Remaining: {self.god_mode_timer}",
-            )  # Update display countdown timer
-            self.master.after(
-                1000, self.update_god_cheat_countdown
-            )  # Call the method again in 1s
-        else:
-            self.end_cheat_invincibility()  # End it when countdown timer ends
+        # Countdown timer, updated every frame from the effect's time left
+        self.god_mode_countdown = GlyphText(
+            self.canvas,
+            *self.viewport.point(CANVAS_WIDTH / 2, 80),
+            self.text_renderer.atlas(16, "purple"),
+            anchor="center",
+            tags="cheat_god_mode",
+        )
+        self.update_effect_indicators()
+        self.show_cheat_message("God Mode: 10 seconds!")
 
     def end_cheat_invincibility(self):
-        """Ends 'god' cheat code, ending invincibility"""
-        self.cheat_invincibility = False
-        self.invincibility = False
-
+        """Removes the god mode banner once the cheat ends"""
         # Remove message indicating god mode and countdown
         self.canvas.delete("cheat_god_mode")
 
@@ -324,23 +3013,24 @@ class Game(tk.Frame):
 
     def add_extra_lives(self):
         """Allows user to add +3 lives when 'life' cheat code is used"""
-        self.lives_value += 3
-        self.lives_label.config(text=f"Lives: {self.lives_value}")
+        for player in self.world.active_players():
+            player.lives += 3
+            self.update_player_labels(player)
         self.show_cheat_message(
             "+3 lives added!"
         )  # Prints message to confirm activation of 'life' cheat code
 
     def show_cheat_message(self, message):
         """Displays a temporary message to indicate cheat activation"""
-        cheat_text = self.canvas.create_text(
-            500,
+        cheat_text = self.create_text(
+            CANVAS_WIDTH / 2,
             100,
+            20,
             text=message,
-            font=("Arial", 20, "bold"),
             fill="green",
             tags="cheat_message",
         )
-        self.master.after(
+        self.schedule(
             2000, lambda: self.canvas.delete(cheat_text)
         )  # Remove message after 2 seconds
 
@@ -352,7 +3042,7 @@ class Game(tk.Frame):
     def show_help_button(self):
         """Shows the help button if it exists"""
         if hasattr(self, "help_button") and self.help_button.winfo_exists():
-            self.help_button.place(x=900, y=10)
+            self.help_button.place(relx=1, x=-100, y=10)
 
     def hide_exit_button(self):
         """Hides the exit button if it exists"""
@@ -370,13 +3060,15 @@ class Game(tk.Frame):
             self.exit_button and
             self.exit_button.winfo_exists()
         ):
-            self.exit_button.place(x=750, y=20)
+            self.exit_button.place(relx=1, x=-250, y=20)
 
     def toggle_boss_key(self):
         """Handles boss key functionality with proper game state management"""
+        self.world.bus.publish("boss_key", None, not self.boss_key_active)
+        self.handle_world_events()
         if self.boss_key_active:
             # Deactivate boss screen
-            self.canvas.delete("boss_screen")
+            self.canvas.itemconfig(self.boss_layer, state="hidden")
             self.boss_key_active = False
             self.status_frame.grid(row=0, column=0, columnspan=2, sticky="nw")
 
@@ -389,11 +3081,13 @@ class Game(tk.Frame):
 
             # If game wasn't paused before boss key, resume game with delay
             if not self.is_paused:
+                self.resume_game_loop()
                 # Clear any existing scheduled falls
-                if hasattr(self, "periodic_after_id"):
-                    self.master.after_cancel(self.periodic_after_id)
+                self.cancel_periodic_falls()
                 # Resume with delay to prevent apple buildup
-                self.master.after(1000, self.periodic_falls)
+                self.periodic_after_id = self.schedule(
+                    1000, self.periodic_falls
+                )
         else:
             # Activate boss screen
             self.boss_key_active = True
@@ -402,22 +3096,19 @@ class Game(tk.Frame):
             self.previous_pause_state = self.is_paused
             self.is_paused = True
 
-            # Cancel any scheduled falls
-            if hasattr(self, "periodic_after_id"):
-                self.master.after_cancel(self.periodic_after_id)
+            # Nothing runs behind the boss screen until it is closed
+            self.suspend_game_loop()
+            self.cancel_periodic_falls()
 
-            # Clear any pause text that might be showing
-            if hasattr(self, "pause_text"):
-                self.canvas.delete(self.pause_text)
+            # Nothing should still be fading when the boss screen goes
+            self.tweens.finish_all()
 
             # Hide game elements
             self.status_frame.grid_remove()
 
-            # Display boss screen
-            self.canvas.create_image(
-                0, 0, anchor="nw", image=self.boss_image_tk, tags="boss_screen"
-            )
-            self.canvas.tag_raise("boss_screen")
+            # Display boss screen above everything, pause text included
+            self.canvas.tag_raise(self.boss_layer)
+            self.canvas.itemconfig(self.boss_layer, state="normal")
 
             # Hide buttons
             self.hide_help_button()
@@ -429,18 +3120,23 @@ class Game(tk.Frame):
             return  # Ignore pause toggle if boss key is active
 
         self.is_paused = not self.is_paused
+        self.world.bus.publish("pause", None, self.is_paused)
+        self.handle_world_events()
 
         if self.is_paused:
-            # Cancel any scheduled falls
-            if hasattr(self, "periodic_after_id"):
-                self.master.after_cancel(self.periodic_after_id)
+            # Stop the game loop and scheduled falls until resumed
+            self.suspend_game_loop()
+            self.cancel_periodic_falls()
+
+            # Finish fades so they don't hang over the pause text
+            self.tweens.finish_all()
 
             # Display pause text
-            self.pause_text = self.canvas.create_text(
-                500,
-                300,
+            self.pause_text = self.create_text(
+                CANVAS_WIDTH / 2,
+                CANVAS_HEIGHT / 2,
+                24,
                 text="GAME PAUSED\nPress 'P' to continue",
-                font=("Arial", 24, "bold"),
                 fill="red",
                 justify="center",
                 tags="pause_text",
@@ -448,63 +3144,189 @@ class Game(tk.Frame):
         else:
             # Remove pause text
             self.canvas.delete("pause_text")
+            self.resume_game_loop()
 
             # Clear any existing scheduled falls
-            if hasattr(self, "periodic_after_id"):
-                self.master.after_cancel(self.periodic_after_id)
+            self.cancel_periodic_falls()
 
             # Resume game with delay to prevent apple buildup
-            self.master.after(1000, self.periodic_falls)
+            self.periodic_after_id = self.schedule(1000, self.periodic_falls)
+
+    def suspend_game_loop(self):
+        """Stops game ticks, leaving nothing scheduled while suspended"""
+        if self.tick_after_id:
+            self.master.after_cancel(self.tick_after_id)
+            self.tick_after_id = None
+        # Time spent paused isn't a slow frame
+        self.last_tick_at = None
+        self.governor.skip()
+        # Background tasks wait too, so nothing wakes Tk while suspended
+        if self.async_pump is not None:
+            self.async_pump.pause()
+
+    def resume_game_loop(self):
+        """Restarts game ticks straight away"""
+        if self.async_pump is not None:
+            self.async_pump.resume()
+        if self.tick_after_id is None:
+            self.game_tick()
+
+    def create_boss_layer(self):
+        """Adds the hidden boss screen on top of the canvas"""
+        self.boss_layer = self.canvas.create_image(
+            *self.viewport.offset, anchor="nw",
+            image=self.sprite_photo("boss_screen"), state="hidden",
+            tags="boss_screen",
+        )
+
+    def create_background(self):
+        """Adds the playfield background at the bottom of the canvas"""
+        self.canvas.create_image(
+            *self.viewport.offset, anchor="nw",
+            image=self.sprite_photo("background"), tags="background",
+        )
+
+    def create_text(self, x, y, size, bold=True, **options):
+        """Adds text at a logical position, sized for the current scale"""
+        weight = "bold" if bold else "normal"
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        # The logical size is kept in a tag for when the window resizes
+        return self.canvas.create_text(
+            *self.viewport.point(x, y),
+            font=("Arial", self.viewport.font_size(size), weight),
+            tags=(*tags, "scaled_text", f"font_{size}_{weight}"),
+            **options,
+        )
+
+    def refresh_sprites(self):
+        """Shows every sprite at the current scale and quality"""
+        self.photos = {}
+        for tag in ("background", "boss_screen", "apple", "golden", "rotten"):
+            self.canvas.itemconfig(tag, image=self.sprite_photo(tag))
+        if self.frame_renderer is not None:
+            self.frame_renderer.rescale(
+                self.viewport.scale,
+                self.scaled_sprite("background"),
+                {kind: self.scaled_sprite(kind) for kind in PLAYFIELD_SPRITES},
+                self.viewport.offset,
+            )
+        if self.world is not None:
+            self.update_basket_images()
+
+    def scaled_sprite(self, name):
+        """Returns a sprite resized for the current scale, made once"""
+        simple = self.governor.tier["simple_sprites"] and (
+            name in PLAYFIELD_SPRITES or name == "large_basket"
+        )
+        return self.sprite_scaler.image(name, self.viewport.scale, simple)
+
+    def sprite_photo(self, name):
+        """Returns the Tk image of a sprite at the current scale"""
+        if name not in self.photos:
+            self.photos[name] = ImageTk.PhotoImage(self.scaled_sprite(name))
+        return self.photos[name]
+
+    def on_canvas_resize(self, event):
+        """Rescales the playfield once the window stops changing size"""
+        if self.resize_after_id is not None:
+            self.master.after_cancel(self.resize_after_id)
+        self.resize_after_id = self.master.after(
+            RESIZE_DELAY_MS, self.rescale_playfield, event.width, event.height
+        )
+
+    def rescale_playfield(self, width, height):
+        """Fits the playfield to a new canvas size"""
+        self.resize_after_id = None
+        viewport = self.viewport
+        old_scale, old_offset = viewport.scale, viewport.offset
+        if not viewport.fit(width, height):
+            return
+
+        # Existing items keep their place in the logical playfield
+        factor = viewport.scale / old_scale
+        self.canvas.scale("all", *old_offset, factor, factor)
+        self.canvas.move(
+            "all",
+            viewport.offset[0] - old_offset[0],
+            viewport.offset[1] - old_offset[1],
+        )
+        for item in self.canvas.find_withtag("scaled_text"):
+            for tag in self.canvas.gettags(item):
+                if tag.startswith("font_"):
+                    _, size, weight = tag.split("_")
+                    self.canvas.itemconfig(item, font=(
+                        "Arial", viewport.font_size(int(size)), weight
+                    ))
+
+        # Sprites are resized here, once per scale, never per frame
+        self.refresh_sprites()
+        if self.world is not None:
+            if self.world.has_effect("god_mode"):
+                self.cheat_invincibility_indicator.move_to(
+                    *viewport.point(CANVAS_WIDTH / 2, 50)
+                )
+                self.god_mode_countdown.move_to(
+                    *viewport.point(CANVAS_WIDTH / 2, 80)
+                )
 
     def cleanup_game_state(self):
         """
         Helper method to clean up game state when pausing or using boss key
         """
         # Cancel any scheduled falls
-        if hasattr(self, "periodic_after_id"):
-            self.master.after_cancel(self.periodic_after_id)
-            self.periodic_after_id = None
+        self.cancel_periodic_falls()
 
         self.canvas.delete("pause_text")
 
-    def load_images(self):
-        """Load and resize all game images using LANCZOS and PIL"""
-        self.bg_image = Image.open("background.png")
-        self.bg_image = self.bg_image.resize((1000, 600), Image.LANCZOS)
-        self.bg_image_tk = ImageTk.PhotoImage(self.bg_image)
-
-        self.apple_image = Image.open("apple.png")
-        self.apple_image = self.apple_image.resize((35, 35), Image.LANCZOS)
-        self.apple_image_tk = ImageTk.PhotoImage(self.apple_image)
-
-        self.g_apple_image = Image.open("golden_apple.png")
-        self.g_apple_image = self.g_apple_image.resize((40, 40), Image.LANCZOS)
-        self.g_apple_image_tk = ImageTk.PhotoImage(self.g_apple_image)
-
-        self.r_apple_image = Image.open("rotten_apple.png")
-        self.r_apple_image = self.r_apple_image.resize((40, 40), Image.LANCZOS)
-        self.r_apple_image_tk = ImageTk.PhotoImage(self.r_apple_image)
+    def load_menu_images(self):
+        """Loads the images the main menu needs straight away"""
+        self.help_icon = load_sprite("help_icon")
+        self.help_icon_tk = ImageTk.PhotoImage(self.help_icon)
 
-        self.basket_image = Image.open("basket.png")
-        self.basket_image = self.basket_image.resize((150, 100), Image.LANCZOS)
-        self.basket_image_tk = ImageTk.PhotoImage(self.basket_image)
+    def poll_assets(self):
+        """Builds the playfield as soon as the worker has loaded it"""
+        if self.assets.done():
+            self.ensure_playfield()
+        else:
+            self.master.after(50, self.poll_assets)
 
-        self.boss_image = Image.open("boss_screen.png")
-        self.boss_image = self.boss_image.resize((1000, 600), Image.LANCZOS)
-        self.boss_image_tk = ImageTk.PhotoImage(self.boss_image)
+    def ensure_playfield(self):
+        """Builds the game canvas the first time it is needed"""
+        if self.canvas is None:
+            self.createWidgets()
 
-        self.help_icon = Image.open("question_mark.png")
-        self.help_icon = self.help_icon.resize((70, 70), Image.LANCZOS)
-        self.help_icon_tk = ImageTk.PhotoImage(self.help_icon)
+    def load_images(self):
+        """Prepares the sprites loaded by the worker for every scale"""
+        self.sprites = self.assets.wait()
+        # The large basket cheat draws a bigger copy of the basket
+        self.sprites["large_basket"] = self.sprites["basket"].resize(
+            (200, 120), Image.LANCZOS)
+        self.sprite_scaler = SpriteScaler(self.sprites)
 
     def createWidgets(self):
         """To create widgets and set up game screen"""
         self.load_images()
         self.canvas = tk.Canvas(
-            self, width=1000, height=600
-        )  # Creates game canvas with specified dimensions
-        self.canvas.grid(row=0, column=0)
-        self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image_tk)
+            self, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="black",
+            highlightthickness=0,
+        )  # Creates game canvas, filling the window as it is resized
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        self.create_background()
+        self.create_boss_layer()
+        if self.renderer == "software":
+            # Baskets and falling objects are drawn into one frame image
+            self.frame_renderer = SoftwareRenderer(
+                self.canvas,
+                self.scaled_sprite("background"),
+                {kind: self.scaled_sprite(kind) for kind in PLAYFIELD_SPRITES},
+                self.viewport.scale,
+                self.viewport.offset,
+            )
 
         self.status_frame = tk.Frame(self, bg="black")
         self.status_frame.grid(row=0, column=0, sticky="nw")
@@ -519,33 +3341,59 @@ class Game(tk.Frame):
             4, weight=2
         )  # Right column for help button
 
-        # Adds Score label
-        self.score_label = tk.Label(
-            self.status_frame,
-            text=f"Score: {self.score_value}",
-            font=("Arial", 18),
-            fg="#add8e6",
-            bg="black",
-            relief="solid",
-            bd=2,
-            padx=10,
-            pady=5,
+        # Help and exit buttons, placed when a game starts
+        self.help_button = tk.Button(
+            self,
+            image=self.help_icon_tk,
+            command=self.show_game_help,
+            borderwidth=0,
+            highlightthickness=0,
         )
-        self.score_label.grid(row=0, column=0, sticky="w", padx=20, pady=15)
+        self.exit_button = tk.Button(
+            self, text="Exit Game", command=self.master.quit
+        )
+
+    def create_player_labels(self):
+        """Adds a score and lives label for each player"""
+        # Smaller labels so four players still fit above the playfield
+        single_player = len(self.players) == 1
+        atlas = self.text_renderer.atlas(
+            16 if single_player else 10, "#add8e6", "black"
+        )
+        pady = 15 if single_player else 2
+
+        for player in self.players:
+            # Adds Score label
+            player.score_label = GlyphLabel(self.status_frame, atlas)
+            player.score_label.grid(
+                row=player.index, column=0, sticky="w", padx=20, pady=pady
+            )
+
+            # Adds Lives Label
+            player.lives_label = GlyphLabel(self.status_frame, atlas)
+            player.lives_label.grid(
+                row=player.index, column=2, sticky="e", padx=20, pady=pady
+            )
+            self.update_player_labels(player)
 
-        # Adds Lives Label
-        self.lives_label = tk.Label(
+        # Quality tier picked by the governor, under the player labels
+        self.quality_label = GlyphLabel(
             self.status_frame,
-            text=f"Lives: {self.lives_value}",
-            font=("Arial", 18),
-            fg="#add8e6",
-            bg="black",
-            relief="solid",
-            bd=2,
-            padx=10,
-            pady=5,
+            self.text_renderer.atlas(10, "#add8e6", "black"),
+            pady=2,
+        )
+        self.quality_label.grid(
+            row=len(self.players), column=0, sticky="w", padx=20
+        )
+        self.quality_label.set_text(
+            f"Quality: {self.governor.tier['name']}"
         )
-        self.lives_label.grid(row=0, column=2, sticky="e", padx=20, pady=15)
+
+    def update_player_labels(self, player):
+        """Refreshes a player's score and lives labels"""
+        score_text, lives_text = player_label_texts(player, self.players)
+        player.score_label.set_text(score_text)
+        player.lives_label.set_text(lives_text)
 
     def enhance_visuals(self, effect_type, x, y):
         """Add visual effects for different game events"""
@@ -556,191 +3404,275 @@ class Game(tk.Frame):
             text = "+1"  # Display +1 for normal apple catch
         elif effect_type == "rotten_catch":
             text = "-1"  # Display -1 for rotten apple catch
+        # Lower quality tiers show fewer popups at once
+        limit = self.governor.tier["popups"]
+        if len(self.canvas.find_withtag("popup")) >= limit:
+            return
         # Create text at specific coordinates
-        txt_id = self.canvas.create_text(
+        txt_id = self.create_text(
             x,
             y,
+            20,
+            bold=False,
             text=text,
-            font=("Arial", 20),
             fill="yellow",
             anchor="center",
+            tags="popup",
         )
+        self.fade_out_text(txt_id)
 
-        # Animate the text and fade out
-        def animate_text(i=0):
-            # Sets number of animation frames
-            if i < 10:
-                opacity = int(255 * (1 - i / 10))  # Fade out based on i
-                hex_opacity = format(opacity, '02x')
-                self.canvas.itemconfig(
-                    txt_id, fill=f"#{hex_opacity}{hex_opacity}{hex_opacity}"
-                )
-                self.master.after(
-                    50, lambda: animate_text(i + 1)
-                )  # Call next frame after 50ms
-            else:
-                self.canvas.delete(txt_id)
+    def fade_out_text(self, item, duration=500):
+        """Fades a text item from white to black, then deletes it"""
+        if not self.governor.tier["fades"]:
+            # Shown for as long, without the per-frame colour changes
+            self.schedule(duration, lambda: self.canvas.delete(item))
+            return
+        self.tweens.add(
+            lambda level: self.canvas.itemconfig(item, fill=gray(level)),
+            255,
+            0,
+            duration,
+            on_done=lambda: self.canvas.delete(item),
+        )
 
-        animate_text()
+    def show_screen(self, name):
+        """Raises one of the screens kept in the main window"""
+        if name not in self.screens:
+            # Menu and game over screens are built the first time only
+            builders = {
+                "menu": self.build_menu_screen,
+                "game_over": self.build_game_over_screen,
+            }
+            self.screens[name] = builders[name]()
+        self.screens[name].tkraise()
+        self.master.title(SCREEN_TITLES[name])
 
     def start_game(self):
-        """Starts the game window main menu"""
-        self.master.withdraw()
-        # Close any existing game over window if it exists
-        if hasattr(self, "game_over_window"):
-            self.game_over_window.destroy()
+        """Shows the main menu"""
+        self.show_screen("menu")
 
-        # Ensure main window is withdrawn
-        self.master.withdraw()
+    def build_menu_screen(self):
+        """Creates the main menu screen"""
+        menu_frame = tk.Frame(self.master, width=1000, height=600)
+        menu_frame.grid(row=0, column=0)  # Centred in larger windows
 
-        # Create start game window
-        start_game_window = tk.Toplevel(self.master)
-        start_game_window.title("Apple Catcher")
-        start_game_window.geometry("1000x600")
+        self.start_bg = load_sprite("start_background")
 
-        self.start_bg = Image.open("start_background.png").resize(
-            (1000, 600), Image.LANCZOS
+        # Title text is rendered once by the shared text renderer
+        self.text_renderer.draw_text(
+            self.start_bg, "Welcome to the\nApple Catcher!", (330, 50),
+            30, "black",
         )
         self.start_bg_tk = ImageTk.PhotoImage(self.start_bg)
 
-        draw = ImageDraw.Draw(self.start_bg)
-        font_path = "./PressStart2P-Regular.ttf"
-        font_size = 30
-        font = ImageFont.truetype(font_path, font_size)
-
-        text = "Welcome to the\nApple Catcher!"
-        text_position = (330, 50)
-        draw.text(text_position, text, font=font, fill="black")
-        self.start_bg_tk = ImageTk.PhotoImage(self.start_bg)
-
-        canvas = tk.Canvas(start_game_window, width=1000, height=600)
-        canvas.pack(fill="both", expand=True)
-        canvas.create_image(0, 0, anchor="nw", image=self.start_bg_tk)
-
         # Create canvas for the start screen
-        canvas = tk.Canvas(start_game_window, width=1000, height=600)
+        canvas = tk.Canvas(menu_frame, width=1000, height=600)
         canvas.pack(fill="both", expand=True)
         canvas.create_image(0, 0, anchor="nw", image=self.start_bg_tk)
 
-        # Add text entry for player's name and movement keys
+        # Add text entries for each player's name and movement keys
         tk.Label(
-            start_game_window,
-            text="Enter Your Name:",
-            font=(
-                "Arial",
-                14)).place(
-            x=350,
-            y=250)
-        self.name_entry = tk.Entry(start_game_window, font=("Arial", 14))
-        self.name_entry.place(x=500, y=250, width=200, height=30)
-
+            menu_frame, text="Name", font=("Arial", 14)
+        ).place(x=400, y=215)
         tk.Label(
-            start_game_window,
-            text="Movement key for Left Arrow:",
-            font=("Arial", 14),
-        ).place(x=350, y=300)
-        self.left_arrow_entry = tk.Entry(start_game_window, font=("Arial", 14))
-        self.left_arrow_entry.place(x=600, y=300, width=100, height=30)
+            menu_frame, text="Left key", font=("Arial", 14)
+        ).place(x=610, y=215)
+        tk.Label(
+            menu_frame, text="Right key", font=("Arial", 14)
+        ).place(x=720, y=215)
+
+        self.player_entries = []
+        for index in range(MAX_PLAYERS):
+            row_y = 245 + index * 40
+            tk.Label(
+                menu_frame,
+                text=f"Player {index + 1}:",
+                font=("Arial", 14),
+            ).place(x=280, y=row_y)
+            name_entry = tk.Entry(menu_frame, font=("Arial", 14))
+            name_entry.place(x=400, y=row_y, width=200, height=30)
+            left_entry = tk.Entry(menu_frame, font=("Arial", 14))
+            left_entry.place(x=610, y=row_y, width=100, height=30)
+            right_entry = tk.Entry(menu_frame, font=("Arial", 14))
+            right_entry.place(x=720, y=row_y, width=100, height=30)
+            self.player_entries.append((name_entry, left_entry, right_entry))
 
         tk.Label(
-            start_game_window,
-            text="Movement key for Right Arrow:",
-            font=("Arial", 14),
-        ).place(x=350, y=350)
-        self.right_arrow_entry = tk.Entry(
-            start_game_window, font=("Arial", 14))
-        self.right_arrow_entry.place(x=600, y=350, width=100, height=30)
+            menu_frame,
+            text=(
+                "Blank keys use the defaults: P1 arrows, P2 a/d, "
+                "P3 j/l, P4 keypad 4/6"
+            ),
+            font=("Arial", 10),
+        ).place(x=280, y=455)
 
         # Button to start game
         tk.Button(
-            start_game_window,
+            menu_frame,
             text="Start Game",
             font=("Arial", 14),
-            command=lambda: self.initialize_main_game(start_game_window),
-        ).place(x=350, y=400)
+            command=self.initialize_main_game,
+        ).place(x=350, y=410)
 
         # Button to view leaderboard
         tk.Button(
-            start_game_window,
+            menu_frame,
             text="Leaderboard",
             font=("Arial", 14),
             command=lambda: self.show_leaderboard(),
-        ).place(x=470, y=400)
+        ).place(x=470, y=410)
 
         # Button to exit game
         tk.Button(
-            start_game_window,
+            menu_frame,
             text="Exit Game",
             font=("Arial", 14),
             command=self.master.quit,
-        ).place(x=600, y=400)
+        ).place(x=600, y=410)
 
         # Button to view game instructions
-        self.help_button = tk.Button(
-            start_game_window,
+        tk.Button(
+            menu_frame,
             image=self.help_icon_tk,
             compound=tk.CENTER,
             command=self.show_game_help,
             borderwidth=0,
             highlightthickness=0,
-        )
-
-        self.show_help_button()
-
-    def initialize_main_game(self, start_game_window):
-        """Initializes main game screen"""
-        # Check if player name is empty or contains only whitespace
-        player_name = self.name_entry.get().strip()
+        ).place(x=900, y=10)
+        return menu_frame
+
+    def read_player_entries(self):
+        """Builds players from the start menu, or returns None if invalid"""
+        import tkinter.messagebox as messagebox
+
+        players = []
+        for index, entries in enumerate(self.player_entries):
+            name_entry, left_entry, right_entry = entries
+            # Skip rows without a name, only one player is required
+            name = name_entry.get().strip()
+            if not name:
+                continue
+            default_left, default_right = DEFAULT_PLAYER_KEYS[index]
+            players.append(
+                Player(
+                    name,
+                    left_entry.get().strip() or default_left,
+                    right_entry.get().strip() or default_right,
+                    index=len(players),
+                )
+            )
 
-        if not player_name:
+        if not players:
             # Show an error message if name is not entered
             messagebox.showerror("Invalid Name", "Please enter a player name.")
-            return  # Prevent proceeding to the game
+            return None
 
-        # Set player name
-        self.player_name = player_name
+        names = [player.name for player in players]
+        if len(set(names)) != len(names):
+            messagebox.showerror(
+                "Invalid Name", "Each player needs a different name."
+            )
+            return None
 
-        self.left_key = (
-            self.left_arrow_entry.get().strip() or "Left"
-        )  # Default is left arrow key
-        self.right_key = (
-            self.right_arrow_entry.get().strip() or "Right"
-        )  # Default is right arrow key
+        keys = [k for p in players for k in (p.left_key, p.right_key)]
+        if len(set(keys)) != len(keys):
+            messagebox.showerror(
+                "Invalid Keys", "Each player needs their own movement keys."
+            )
+            return None
+        return players
 
-        # Create basket and bind keys when game starts
-        self.create_basket()
+    def initialize_main_game(self):
+        """Initializes main game screen"""
+        # Check every player has a name and their own keys
+        players = self.read_player_entries()
+        if players is None:
+            return  # Prevent proceeding to the game
+        self.ensure_playfield()  # Waits if the sprites are still loading
+
+        # One shared simulation for every player's basket
+        for player in players:
+            player.policy = self.autopilot
+        self.begin_game(World(players))
+        self.periodic_falls()
+        self.start_autosave()
+
+    def begin_game(self, world):
+        """Shows the playfield for a world and starts ticking it"""
+        self.players = world.players
+        self.world = world
+        self.subscribe_to_world()
+        if self.broadcaster is not None:
+            self.broadcaster.publish_names([p.name for p in self.players])
+        self.session_stats = SessionStats(self.world)
+        self.create_player_labels()
+
+        # Create baskets and bind keys when game starts
+        self.create_baskets()
         self.master.bind("<KeyPress>", self.key_pressed)
 
-        self.help_button = tk.Button(
-            self.master,
-            image=self.help_icon_tk,
-            command=self.show_game_help,
-            borderwidth=0,
-            highlightthickness=0,
-        )
         self.show_help_button()
-
-        self.exit_button = tk.Button(
-            self.master, text="Exit Game", command=self.master.quit
-        )
-        self.exit_button.place(x=750, y=20)
-
         self.show_exit_button()
 
         # Start the game loop
         self.game_started = True
-        self.periodic_falls()
+        self.game_tick()
 
-        start_game_window.destroy()
-        self.master.deiconify()
+        self.show_screen("game")
 
-    def start_leaderboard(self, score_value):
+    def wait_for_opponent(self, session):
+        """Polls the network until the other versus machine answers"""
+        if session.connect():
+            self.start_versus(session)
+        else:
+            self.master.after(TICK_MS, self.wait_for_opponent, session)
+
+    def start_versus(self, session):
+        """Starts a game against another machine"""
+        self.ensure_playfield()
+        self.versus = session
+        session.local.policy = self.autopilot
+        # The session spawns the waves, so both machines agree on them
+        self.begin_game(session.world)
+
+    def step_versus(self):
+        """Advances a versus game and redraws what a rollback changed"""
+        session = self.versus
+        local = session.local
+        if local.policy is not None and not local.eliminated:
+            session.press(local.policy(self.world, local))
+        session.advance()
+        # The opponent's basket only moves inside the simulation
+        if self.frame_renderer is None:
+            for player in self.players:
+                if not player.eliminated:
+                    self.draw_basket(player)
+        if session.rolled_back:
+            for player in self.players:
+                self.update_player_labels(player)
+        if session.finished:
+            self.game_over()
+
+    def linger_versus(self, ticks):
+        """Keeps answering the opponent so their game can finish too"""
+        if self.versus is None:
+            return
+        if ticks <= 0:
+            self.versus.close()
+            self.versus = None
+            return
+        self.versus.advance()
+        self.schedule(TICK_MS, lambda: self.linger_versus(ticks - 1))
+
+    def start_leaderboard(self, score_value, player_name=None):
         """Reads leaderboard data and checks if player already exists"""
-        leaderboard = self.read_leaderboard()
+        leaderboard = self.read_local_leaderboard()
+        player_name = player_name or self.players[0].name
+        self.submit_score(player_name, score_value)
 
         # Check if player name exists
         existing_entry = next(
-            (e for e in leaderboard if e["Name"] == self.player_name),
+            (e for e in leaderboard if e["Name"] == player_name),
             None,
         )
 
@@ -752,7 +3684,7 @@ class Game(tk.Frame):
             # If player doesn't exist, add new entry
             new_entry = {
                 "Rank": len(leaderboard) + 1,
-                "Name": self.player_name,
+                "Name": player_name,
                 "Score": score_value,
             }
             leaderboard.append(new_entry)
@@ -766,26 +3698,28 @@ class Game(tk.Frame):
 
     def update_leaderboard(self, save_leaderboard):
         """Updates leaderboard and called during game_over"""
-        leaderboard = self.read_leaderboard()
-
-        # Check if the player already exists in the leaderboard
-        player_found = False
-        for entry_data in leaderboard:
-            if entry_data["Name"] == self.player_name:
-                # If the player's score is higher, update the score
-                if self.score_value > entry_data["Score"]:
-                    entry_data["Score"] = self.score_value
-                player_found = True
-                break
-
-        # If the player is not found, add them as a new entry
-        if not player_found:
-            new_data = {
-                "Rank": len(leaderboard) + 1,
-                "Name": self.player_name,
-                "Score": self.score_value,
-            }
-            leaderboard.append(new_data)
+        leaderboard = self.read_local_leaderboard()
+
+        for player in self.players:
+            self.submit_score(player.name, player.score)
+            # Check if the player already exists in the leaderboard
+            player_found = False
+            for entry_data in leaderboard:
+                if entry_data["Name"] == player.name:
+                    # If the player's score is higher, update the score
+                    if player.score > entry_data["Score"]:
+                        entry_data["Score"] = player.score
+                    player_found = True
+                    break
+
+            # If the player is not found, add them as a new entry
+            if not player_found:
+                new_data = {
+                    "Rank": len(leaderboard) + 1,
+                    "Name": player.name,
+                    "Score": player.score,
+                }
+                leaderboard.append(new_data)
 
         # Sort the leaderboard by score in descending order and update ranks
         leaderboard.sort(key=lambda x: x["Score"], reverse=True)
@@ -800,8 +3734,30 @@ class Game(tk.Frame):
         with open("leaderboard.json", "w") as file:
             json.dump(leaderboard, file)
 
+    def submit_score(self, name, score):
+        """Queues a score for the shared leaderboard, never waiting"""
+        if self.leaderboard_client is not None:
+            self.leaderboard_client.submit(name, score)
+
+    def report_rejected_scores(self, scores):
+        """Tells the players that the leaderboard refused some scores"""
+        if self.canvas is None:
+            # Sprites are still loading, so try again shortly
+            self.schedule(500, lambda: self.report_rejected_scores(scores))
+            return
+        names = ", ".join(score["Name"] for score in scores)
+        self.show_message(f"Leaderboard refused scores for {names}")
+
     def read_leaderboard(self):
-        """Read leaderboard data"""
+        """Read leaderboard data, shared when a server has been reached"""
+        if self.leaderboard_client is not None:
+            ranking = self.leaderboard_client.ranking()
+            if ranking is not None:
+                return ranking
+        return self.read_local_leaderboard()
+
+    def read_local_leaderboard(self):
+        """Read this machine's leaderboard data"""
         try:
             with open("leaderboard.json", "r") as file:
                 return json.load(file)
@@ -810,8 +3766,14 @@ class Game(tk.Frame):
 
     def show_leaderboard(self):
         """Sets up leaderboard design"""
+        from tkinter import ttk
+
         leaderboard_window = tk.Toplevel()
-        leaderboard_window.title("Leaderboard")
+        client = self.leaderboard_client
+        if client is not None and not client.online:
+            leaderboard_window.title("Leaderboard (offline)")
+        else:
+            leaderboard_window.title("Leaderboard")
         leaderboard_window.geometry("600x400")
 
         # Style for the table
@@ -859,486 +3821,246 @@ class Game(tk.Frame):
                     entry["Name"],
                     entry["Score"]))
 
-    def start_main_game(self, start_game_window):
-        """Loads game screen"""
-        # Retrieves the player's name and key bindings for control
-        self.player_name = self.name_entry.get()
-        self.left_key = (
-            self.left_arrow_entry.get().strip() or "Left"
-        )  # Default to Left arrow key
-        self.right_key = (
-            self.right_arrow_entry.get().strip() or "Right"
-        )  # Default to Right arrow key
-
-        start_game_window.destroy()
-        self.master.deiconify()
-
-    def create_f1(self):
-        """Creates a regular apple that falls from the top of the screen"""
-        if self.is_paused or self.game_over_flag:
-            return
-
-        f1_range = random.randint(0, 970)
-        f1_image = self.canvas.create_image(
-            f1_range, 0, anchor="nw", image=self.apple_image_tk
-        )
-
-        # Add tag to track this apple's after IDs
-        self.canvas.addtag_withtag(f"apple_{f1_image}", f1_image)
-
-        def move_f1():  # Handles movement and collision detection
-            try:
-                # Check if canvas and image still exist
-                if (
-                    not self.canvas.winfo_exists() or
-                    not self.canvas.type(f1_image)
-                ):
-                    return
-
-                # Handle paused or game over state
-                if self.is_paused or self.game_over_flag:
-                    move_id = self.master.after(50, move_f1)
-                    self.canvas.addtag_withtag(f"move_id_{move_id}", f1_image)
-                    return
-
-                # Calculate movement speed
-                base_speed = 3 + (self.level * 0.5)
-                speed_variation = random.uniform(0.8, 1.2)
-                move_speed = base_speed * speed_variation
-
-                # Move the apple
-                self.canvas.move(f1_image, 0, move_speed)
-                coords = self.canvas.coords(f1_image)
-
-                if not coords:
-                    self.cleanup_apple(f1_image)
-                    return
-
-                # Check if apple is still on screen
-                if coords[1] < 600:
-                    move_id = self.master.after(50, move_f1)
-                    self.canvas.addtag_withtag(f"move_id_{move_id}", f1_image)
-                else:
-                    # Handle apple reaching bottom
-                    if not self.check_collision(
-                            f1_image, self.basket_image_id):
-                        self.update_lives()
-                    self.cleanup_apple(f1_image)
-                    return
-
-                # Check for collision with basket
-                if coords[1] >= 525 and coords[1] <= 570:
-                    if self.check_collision(f1_image, self.basket_image_id):
-                        self.update_score()
-                        self.cleanup_apple(f1_image)
-                        return
-
-            except tk.TclError:
-                self.cleanup_apple(f1_image)
-                return
-
-        move_f1()
-
-    def cleanup_apple(self, apple_image):
-        """Removes an apple and its associated after calls"""
-        try:
-            tags = self.canvas.gettags(
-                apple_image
-            )  # Get the tags associated with this apple
-
-            # Cancel any pending after calls
-            for tag in tags:
-                if tag.startswith("move_id_"):
-                    try:
-                        move_id = int(tag.split("_")[-1])
-                        self.master.after_cancel(move_id)
-                    except (ValueError, tk.TclError):
-                        pass
-
-            # Delete the apple image
-            if self.canvas.type(apple_image):
-                self.canvas.delete(apple_image)
-        except tk.TclError:
-            pass
-
-    def create_g_f1(self):
-        """Creates a golden apple that falls from the top of the screen"""
-        # Check if the game is paused, exit if true
-        if self.is_paused:
-            return
-
-        # Create the golden apple
-        if self.g_apple_counter % 4 != 0:
-            return
-
-        # Random horizontal position
-        g_f1_range = random.randint(0, 970)
-        # Create golden apple on canvas
-        g_f1_image = self.canvas.create_image(
-            g_f1_range, 0, anchor="nw", image=self.g_apple_image_tk
-        )
-        move_id = None
-
-        def move_g_f1():
-            nonlocal move_id
-
-            try:
-                # Checks if the canvas or image exits
-                if (
-                    not self.canvas.winfo_exists() or not
-                    self.canvas.type(g_f1_image)
-                ):
-                    return
-
-                # Pause handling
-                if self.is_paused:
-                    move_id = self.master.after(100, move_g_f1)
-                    return
-
-                # Set the speed and movement variation for the golden apple
-                base_horizontal = 1.5
-                base_vertical = 7
-                horizontal_variation = random.uniform(0.8, 1.2)
-                vertical_variation = random.uniform(0.8, 1.2)
-                horizontal_speed = base_horizontal * horizontal_variation
-                vertical_speed = base_vertical * vertical_variation
-
-                # Move the apple on the canvas
-                self.canvas.move(g_f1_image, horizontal_speed, vertical_speed)
-                coords = self.canvas.coords(g_f1_image)
-
-                # If the apple's coords are invalid, exit
-                if not coords:
-                    return
-
-                if coords[1] < 600:
-                    move_id = self.master.after(100, move_g_f1)
-                else:
-                    # Delete the apple if it falls below the screen
-                    if self.canvas.type(g_f1_image):
-                        self.canvas.delete(g_f1_image)
-                    return
-
-                # Check if the apple is within the basket area for collection
-                if coords[1] >= 525 and coords[1] <= 570:
-                    if self.check_collision(g_f1_image, self.basket_image_id):
-                        # Update score when golden apple is caught
-                        self.update_score(golden_apple=True)
-                        if move_id:
-                            self.master.after_cancel(move_id)
-                        if self.canvas.type(g_f1_image):
-                            self.canvas.delete(g_f1_image)
-                        return
-
-            except tk.TclError:
-                return
-
-        move_g_f1()
-
-    def create_r_f1(self):
-        """Creates a rotten apple that falls from the top of the screen"""
-        # Check if the game is paused, exit if true
-        if self.is_paused:
+    def game_tick(self):
+        """Advances the shared simulation and redraws the falling objects"""
+        # Paused or hidden games schedule nothing until resumed
+        if (self.game_over_flag or self.world is None or
+                self.is_paused or self.boss_key_active):
+            self.tick_after_id = None
             return
+        self.tick_after_id = self.master.after(TICK_MS, self.game_tick)
+        started = time.perf_counter()
 
-        # Random horizontal position for the rotten apple
-        r_f1_range = random.randint(0, 970)
-        # Create the rotten apple image on the canvas
-        r_f1_image = self.canvas.create_image(
-            r_f1_range, 0, anchor="nw", image=self.r_apple_image_tk
-        )
-        move_id = None
-
-        def move_r_f1():
-            nonlocal move_id
-
-            try:
-                # Check if the canvas doesn't exist
-                if (
-                    not self.canvas.winfo_exists() or not
-                    self.canvas.type(r_f1_image)
-                ):
-                    return
-
-                # Pause handling
-                if self.is_paused:
-                    move_id = self.master.after(50, move_r_f1)
-                    return
-
-                # Set the speed and movement variation for the rotten apple
-                base_speed = 8
-                score_penalty = min(2, self.score_value // 20)
-                speed_variation = random.uniform(0.7, 1.3)
-                move_speed = (base_speed + score_penalty) * speed_variation
-                wobble = (
-                    random.uniform(-0.5, 0.5) if random.random() < 0.3 else 0
-                )  # Wobble effect for randomness
-
-                # Move rotten apple on the canvas
-                self.canvas.move(r_f1_image, wobble, move_speed)
-                coords = self.canvas.coords(r_f1_image)
-
-                # If apple's coordinates are invalid, exit
-                if not coords:
-                    return
-
-                # Continue moving rotten apple if it's within the screen
-                if coords[1] < 600:
-                    move_id = self.master.after(50, move_r_f1)
-                else:
-                    # Delete the rotten apple if it falls below the screen
-                    if self.canvas.type(r_f1_image):
-                        self.canvas.delete(r_f1_image)
-                    return
-
-                # Check if rotten apple is within basket area for collision
-                if coords[1] >= 525 and coords[1] <= 570:
-                    if self.check_collision(r_f1_image, self.basket_image_id):
-                        # Update score and lives when rotten apple is caught
-                        if not self.invincibility:
-                            self.update_score(rotten_apple=True)
-                            self.update_lives(rotten_apple=True)
-                        if move_id:
-                            self.master.after_cancel(move_id)
-                        if self.canvas.type(r_f1_image):
-                            self.canvas.delete(r_f1_image)
-                        return
-
-            except tk.TclError:
-                return
-
-        move_r_f1()
-
-    def create_power_up(self):
-        """Creates a power up that falls from the top of the screen"""
-        # Check if the game is paused, exit if true
-        if self.is_paused:
-            return
-
-        # Random horizontal position for the power-up
-        power_up_range = random.randint(20, 950)
-        size = 10
-        # Define the shape of the power-up as a triangle
-        points = [
-            power_up_range,
-            0,
-            power_up_range + size,
-            size * 2,
-            power_up_range - size,
-            size * 2,
-        ]
-
-        # Create the power-up shape on the canvas
-        power_up_shape = self.canvas.create_polygon(
-            points, outline="gold", fill="yellow", width=2
+        try:
+            if self.versus is not None:
+                self.step_versus()
+            else:
+                self.drive_autopilots()
+                self.world.step()
+            # The simulation always ticks, drawing can skip some
+            self.frame_count += 1
+            if self.frame_count % self.governor.tier["render_every"] == 0:
+                self.sync_canvas()
+            if self.broadcaster is not None:
+                self.broadcaster.publish_world(self.world)
+            self.handle_world_events()
+            self.update_effect_indicators()
+            self.tweens.update(TICK_MS)
+            # Tk redraws from an idle handler once the tick returns, so
+            # the redraw runs now to count in the frame time
+            self.master.update_idletasks()
+        except tk.TclError:
+            self.cancel_all_after_calls()
+            return
+        self.measure_frame(started)
+
+    def measure_frame(self, started):
+        """Feeds the tick's cost to the governor and applies its tier"""
+        # Late starts are counted separately, the governor only judges
+        # the time this tick spent simulating, drawing and redrawing
+        if self.last_tick_at is not None:
+            late_ms = (started - self.last_tick_at) * 1000 - TICK_MS
+            if late_ms > LATE_TICK_MS:
+                self.world.bus.publish("late_tick", None, round(late_ms))
+        self.last_tick_at = started
+        frame_ms = (time.perf_counter() - started) * 1000
+        was_simple = self.governor.tier["simple_sprites"]
+        if not self.governor.record(frame_ms):
+            return
+        tier = self.governor.tier
+        self.world.bus.publish("quality", None, tier["name"])
+        self.handle_world_events()
+        if tier["simple_sprites"] != was_simple:
+            self.refresh_sprites()
+        if not tier["fades"]:
+            self.tweens.finish_all()
+
+    def drive_autopilots(self):
+        """Lets bot policies move their baskets in place of key presses"""
+        for player in self.world.active_players():
+            if player.policy is None:
+                continue
+            direction = player.policy(self.world, player)
+            if direction < 0:
+                self.move_left(player)
+            elif direction > 0:
+                self.move_right(player)
+
+    def object_coords(self, falling_object):
+        """Returns canvas coords for a falling object"""
+        x, y = falling_object.x, falling_object.y
+        if falling_object.kind == "power_up":
+            # Triangle pointing up, as wide and tall as the object
+            width, height = falling_object.width, falling_object.height
+            return [x + width / 2, y, x + width, y + height, x, y + height]
+        return [x, y]
+
+    def create_object_item(self, falling_object):
+        """Creates the canvas item for a newly spawned object"""
+        coords = self.viewport.coords(self.object_coords(falling_object))
+        if falling_object.kind == "power_up":
+            return self.canvas.create_polygon(
+                coords, outline="gold", fill="yellow", width=2
+            )
+        # Tagged with the sprite name so resizing can swap the image
+        return self.canvas.create_image(
+            *coords, anchor="nw",
+            image=self.sprite_photo(falling_object.kind),
+            tags=falling_object.kind,
         )
-        move_id = None
 
-        def move_power_up():
-            nonlocal move_id
-
-            try:
-                # Check if the canvas doesn't exist
-                if not self.canvas.winfo_exists() or not self.canvas.type(
-                    power_up_shape
-                ):
-                    return
-
-                # Pause handling
-                if self.is_paused:
-                    move_id = self.master.after(50, move_power_up)
-                    return
-
-                # Set the speed and movement variation for the power-up
-                base_speed = 8
-                score_boost = min(4, self.score_value // 15)
-                speed_variation = random.uniform(0.9, 1.1)
-                move_speed = (base_speed + score_boost) * speed_variation
-
-                # Move the power-up on the canvas
-                self.canvas.move(power_up_shape, 0, move_speed)
-                coords = self.canvas.coords(power_up_shape)
-
-                if not coords:
-                    return
-
-                # Continue moving the power-up if it's within the screen
-                center_y = (
-                    coords[1] + coords[3]
-                ) / 2  # Get center y-coordinate of the power-up
-                if center_y < 600:
-                    move_id = self.master.after(50, move_power_up)
-                else:
-                    # Delete the power-up if it falls below the screen
-                    if self.canvas.type(power_up_shape):
-                        self.canvas.delete(power_up_shape)
-                    return
-
-                # Check if power-up is within basket area for collection
-                if coords[1] >= 525 and coords[1] <= 570:
-                    basket_coords = self.canvas.coords(self.basket_image_id)
-                    power_up_center_x = (
-                        coords[0] + coords[2]
-                    ) / 2  # Get center x-coordinate of the power-up
-
-                    # Activate the power-up if it's within the basket area
-                    if (
-                        basket_coords and
-                        power_up_center_x >= basket_coords[0] and
-                        power_up_center_x <= basket_coords[0] + 100
-                    ):
-                        self.activate_invincibility()
-                        if move_id:
-                            self.master.after_cancel(move_id)
-                        if self.canvas.type(power_up_shape):
-                            self.canvas.delete(power_up_shape)
-                        return
-            except tk.TclError:
-                return
+    def sync_canvas(self):
+        """Moves canvas items to match the simulated objects"""
+        if self.frame_renderer is not None:
+            self.frame_renderer.draw(self.world)
+            return
+        for object_id, falling_object in self.world.objects.items():
+            item = self.object_items.get(object_id)
+            if item is None:
+                self.object_items[object_id] = self.create_object_item(
+                    falling_object
+                )
+            else:
+                self.canvas.coords(item, *self.viewport.coords(
+                    self.object_coords(falling_object)
+                ))
+
+        # Delete items for objects that were caught or fell off screen
+        removed = [i for i in self.object_items if i not in self.world.objects]
+        for object_id in removed:
+            self.canvas.delete(self.object_items.pop(object_id))
+
+    def subscribe_to_world(self):
+        """Connects the HUD, effects and screens to the world's events"""
+        for name, callback in (
+            # HUD
+            ("score", self.on_player_changed),
+            ("lives", self.on_player_changed),
+            # Effects
+            ("score", self.on_score),
+            ("level", self.on_level),
+            ("effect", self.on_effect),
+            ("effect_ended", self.on_effect_ended),
+            ("eliminated", self.on_eliminated),
+            ("quality", self.on_quality),
+            # Screens
+            ("game_over", self.on_game_over),
+        ):
+            self.world.bus.subscribe(name, callback)
+
+    def handle_world_events(self):
+        """Dispatches the events raised by the world since the last call"""
+        self.world.bus.dispatch()
+
+    def on_player_changed(self, name, player, detail):
+        """Refreshes the HUD after a score or lives change"""
+        self.update_player_labels(player)
+
+    def on_quality(self, name, player, detail):
+        """Shows the quality tier the governor switched to"""
+        self.quality_label.set_text(f"Quality: {detail}")
+
+    def on_score(self, name, player, detail):
+        """Shows the points scored above the player's basket"""
+        self.enhance_visuals(detail, player.x + 75, 500)
+
+    def on_level(self, name, player, detail):
+        """Announces a new level"""
+        self.show_level_transition()
+
+    def on_effect(self, name, player, detail):
+        """Shows the indicator of an effect that started"""
+        self.show_effect(detail, player)
+
+    def on_effect_ended(self, name, player, detail):
+        """Hides the indicator of an effect that ended"""
+        self.hide_effect(detail, player)
+
+    def on_eliminated(self, name, player, detail):
+        """Removes the basket of a player who ran out of lives"""
+        if self.frame_renderer is None:
+            self.canvas.delete(player.basket_item)
+
+    def on_game_over(self, name, player, detail):
+        """Shows the game over screen once every player is out"""
+        # A versus game may only be over in a guess at the opponent's
+        # moves, so step_versus waits for the moves that confirm it
+        if self.versus is None:
+            self.game_over()
 
-        move_power_up()
+    def show_effect(self, name, player):
+        """Adds the indicator for an effect that started"""
+        if name == "invincible":
+            self.activate_invincibility(player)
+        elif name == "god_mode":
+            self.show_god_mode()
+        elif name == "large_basket":
+            self.update_basket_images()
+
+    def hide_effect(self, name, player):
+        """Removes the indicator for an effect that ended"""
+        if name == "invincible":
+            self.end_invincibility(player)
+        elif name == "god_mode":
+            self.end_cheat_invincibility()
+        elif name == "large_basket":
+            self.update_basket_images()
+
+    def update_effect_indicators(self):
+        """Updates countdowns and flashing of effect indicators"""
+        world = self.world
+        if world.has_effect("god_mode"):
+            seconds = math.ceil(world.effect_remaining("god_mode") / 1000)
+            self.god_mode_countdown.set_text(f"Time Remaining: {seconds} s")
+
+        # Power-up indicators flash together, every 500 ms of game time
+        visible = (
+            world.clock // 500 % 2 == 0 or
+            not self.governor.tier["flashing"]
+        )
+        if visible != self.flash_visible:
+            self.flash_visible = visible
+            self.canvas.itemconfig(
+                "power_up", state="normal" if visible else "hidden"
+            )
 
-    def activate_invincibility(self):
-        """Activates invincibility power-up"""
-        self.invincibility = True
+    def activate_invincibility(self, player):
+        """Shows the invincibility power-up indicator"""
+        if player.power_up_indicator is not None:
+            return  # Picking up another power-up only restarts the timer
+        text = "⭐ INVINCIBLE! ⭐"
+        if len(self.players) > 1:
+            text = f"⭐ {player.name} INVINCIBLE! ⭐"
         # Making the invincibility indicator noticeable
-        self.power_up_indicator = self.canvas.create_text(
-            500,
-            50,
-            text="⭐ INVINCIBLE! ⭐",
-            font=("Arial", 24, "bold"),
+        player.power_up_indicator = self.create_text(
+            CANVAS_WIDTH / 2,
+            50 + player.index * 40,
+            24,
+            text=text,
             fill="gold",
+            state="normal" if self.flash_visible else "hidden",
             tags="power_up",
         )
-        # Flash the indicator
-        self.flash_indicator()
-        # Duration set to 5 seconds
-        self.master.after(5000, self.end_invincibility)
-
-    def flash_indicator(self):
-        """Makes the invincibility indicator flash"""
-        if self.invincibility:
-            current = self.canvas.itemcget(self.power_up_indicator, "state")
-            new_state = "hidden" if current == "normal" else "normal"
-            self.canvas.itemconfig(self.power_up_indicator, state=new_state)
-            # Continue flashing if still invincible
-            self.master.after(500, self.flash_indicator)
-
-    def end_invincibility(self):
-        """End invincibility power-up"""
-        self.invincibility = False
-        if hasattr(self, "power_up_indicator"):
-            self.canvas.delete(self.power_up_indicator)
-
-    def implement_levels(self):
-        """Handle level progression and difficulty adjustments"""
-        old_level = self.level
-
-        # More flexible level progression
-        self.level = 1 + self.score_value // 15  # Level up slightly faster
 
-        # When level increases:
-        if self.level != old_level:
-            self.show_level_transition()
-            self.update_difficulty()
+    def end_invincibility(self, player):
+        """Removes the invincibility power-up indicator"""
+        if player.power_up_indicator is not None:
+            self.canvas.delete(player.power_up_indicator)
+            player.power_up_indicator = None
 
     def show_level_transition(self):
         """Used to show level transition animation"""
         # Create level up text
-        txt_id = self.canvas.create_text(
-            500,
-            300,
-            text=f"Level {self.level}!",
-            font=("Arial", 36, "bold"),
+        txt_id = self.create_text(
+            CANVAS_WIDTH / 2,
+            CANVAS_HEIGHT / 2,
+            36,
+            text=f"Level {self.world.level}!",
             fill="white",
         )
 
         # Adds fade out animation
-        def fade_out(alpha=1.0):  # Alpha determines the transparency
-            if alpha > 0:
-                # Fading effect by changing text color
-                opacity = int(255 * alpha)
-                hex_opacity = format(opacity, '02x')
-                rgb = f"{hex_opacity}"
-                color = f"#{rgb * 3}"
-                self.canvas.itemconfig(txt_id, fill=color)
-                self.master.after(50, lambda: fade_out(alpha - 0.1))
-            else:
-                self.canvas.delete(txt_id)
-
-        fade_out()
-
-    def update_difficulty(self):
-        """Update game parameters based on current level"""
-        # Slower speed reduction as level increases
-        self.base_speed = max(7 - (self.level * 0.3), 3)
-
-        # Apple spawn rate becomes more dynamic
-        self.spawn_rate = max(10 - (self.level // 2), 4)
-
-        # Add more difficulty modifiers
-        # Decreases allowed misses
-        self.max_missed_apples = max(5 - (self.level // 3), 2)
-
-    def update_score(
-            self,
-            golden_apple=False,
-            rotten_apple=False,
-            power_up=False):
-        """Updates the score based on apple type and power-ups"""
-
-        if golden_apple:
-            self.score_value += 10
-            self.enhance_visuals(
-                "golden_catch",
-                self.canvas.coords(self.basket_image_id)[0] + 75,
-                500,
-            )
-            self.update_lives(golden_apple=True)
-        elif rotten_apple and not self.invincibility:
-            self.score_value -= 1
-            self.enhance_visuals(
-                "rotten_catch",
-                self.canvas.coords(self.basket_image_id)[0] + 75,
-                500,
-            )
-        else:
-            self.score_value += 1
-            self.enhance_visuals(
-                "apple_catch",
-                self.canvas.coords(self.basket_image_id)[0] + 75,
-                500,
-            )
-
-        self.score_label.config(text=f"Score: {self.score_value}")
-
-        # Check for level progression
-        self.implement_levels()
-
-    def update_lives(self, golden_apple=False, rotten_apple=False):
-        """Updates the lives based on apple type"""
-
-        if self.invincibility:  # Don't update lives
-            return
-
-        # Adjust lives based on apple type
-        if rotten_apple:
-            self.lives_value -= 1  # -1 life for rotten apple
-        elif golden_apple:
-            self.lives_value += 1  # +1 life for golden apple
-        else:
-            if self.lives_value > 0:  # -1 life for missing regular apple
-                self.lives_value -= 1
-
-        # Ensures lives don't become negative (below 0)
-        self.lives_value = max(0, self.lives_value)
-
-        # Update the lives label display
-        self.lives_label.config(text=f"Lives: {self.lives_value}")
-
-        # If lives reach 0, trigger the game over process
-        if self.lives_value <= 0 and not self.game_over_flag:
-            self.game_over()
+        self.fade_out_text(txt_id)
 
     def periodic_falls(self):
         """Handle periodic falling of objects"""
@@ -1348,96 +4070,77 @@ class Game(tk.Frame):
             return
 
         try:
-            # Calculate base delay depending on the level
-            delay = max(2000 - (self.level * 200), 500)
-
-            # Schedules the next call
+            # Spawn objects and schedule the next wave for the level
+            delay = self.world.spawn_wave()
             self.periodic_after_id = self.master.after(
                 delay, self.periodic_falls)
 
-            # Updating counters
-            self.g_apple_counter += 1
-            self.r_apple_counter += 1
-            self.power_up_counter += 1
-
-            normal_apple_prob = min(0.7 + (self.level * 0.05), 0.95)
-
-            # Spawn objects
-            if random.random() < normal_apple_prob:
-                self.create_f1()
-
-            # Spawn golden apples
-            if self.g_apple_counter % max(8 - (self.level // 2), 3) == 0:
-                self.create_g_f1()
+        except tk.TclError:
+            self.cancel_periodic_falls()
 
-            # Spawn rotten apples
-            if self.r_apple_counter % max(12 - (self.level // 2), 4) == 0:
-                if random.random() < 0.3 + (self.level * 0.05):
-                    self.create_r_f1()
+    def schedule(self, delay, callback):
+        """Runs a callback after a delay, tracked so restarts cancel it"""
+        def run():
+            self.pending_after_ids.discard(after_id)
+            callback()
 
-            # Spawn power-ups
-            if self.power_up_counter % max(15 - (self.level // 2), 6) == 0:
-                if random.random() < 0.2 + (self.level * 0.03):
-                    self.create_power_up()
+        after_id = self.master.after(delay, run)
+        self.pending_after_ids.add(after_id)
+        return after_id
 
-        except tk.TclError:
-            if hasattr(self, 'periodic_after_id'):
-                self.master.after_cancel(self.periodic_after_id)
-                self.periodic_after_id = None
+    def cancel_periodic_falls(self):
+        """Cancels the next scheduled wave of falling objects"""
+        if self.periodic_after_id:
+            self.master.after_cancel(self.periodic_after_id)
+            self.pending_after_ids.discard(self.periodic_after_id)
+            self.periodic_after_id = None
 
     def cancel_all_after_calls(self):
         """Cancel all scheduled after calls"""
-        if hasattr(self, 'periodic_after_id'):
-            try:
-                self.master.after_cancel(self.periodic_after_id)
-            except tk.TclError:
-                pass
-            self.periodic_after_id = None
+        after_ids = self.pending_after_ids | {
+            self.periodic_after_id, self.tick_after_id
+        }
+        for after_id in after_ids:
+            if after_id:
+                try:
+                    self.master.after_cancel(after_id)
+                except tk.TclError:
+                    pass
+        self.pending_after_ids.clear()
+        self.periodic_after_id = None
+        self.tick_after_id = None
+
+    def create_baskets(self):
+        """Create a basket image for each player"""
+        if self.frame_renderer is not None:
+            self.frame_renderer.draw(self.world)
+            return
+        for player in self.players:
+            player.basket_item = self.canvas.create_image(
+                *self.viewport.point(player.x, player.y), anchor="nw",
+                image=self.sprite_photo("basket"),
+            )
 
-    def create_basket(self):
-        """Create the basket image at the specified coordinates"""
-        self.basket_image_id = self.canvas.create_image(
-            450, 500, anchor="nw", image=self.basket_image_tk
-        )
+    def draw_basket(self, player):
+        """Shows a player's basket at its position in the world"""
+        if self.frame_renderer is not None:
+            self.frame_renderer.draw(self.world)
+        else:
+            self.canvas.coords(
+                player.basket_item, *self.viewport.point(player.x, player.y)
+            )
 
-    def move_left(self):
+    def move_left(self, player=None):
         """Binds keys to move the basket to the left"""
-        # Get the current coords of the basket
-        coords = self.canvas.coords(self.basket_image_id)
-        # Ensure the basket doesn't move beyond the left edge of the canvas
-        if coords[0] > 0:
-            self.canvas.move(self.basket_image_id, -40, 0)
+        player = player or self.players[0]
+        self.world.move_player(player, -1)
+        self.draw_basket(player)
 
-    def move_right(self):
+    def move_right(self, player=None):
         """Binds keys to move the basket to the right"""
-        # Get the current position of the basket
-        coords = self.canvas.coords(self.basket_image_id)
-        # Get the canvas width and basket width
-        canvas_width = self.canvas.winfo_width()
-        basket_width = self.basket_image_tk.width()
-
-        # Ensures the basket doesn't move beyond the right edge of the canvas
-        if coords[0] < canvas_width - basket_width:
-            self.canvas.move(self.basket_image_id, 40, 0)
-
-    def check_collision(self, falling_object, basket):
-        """Checks collision of apples and power ups with basket"""
-        # Get the bounding box coords of the falling object and the basket
-        object_coords = self.canvas.bbox(falling_object)
-        basket_coords = self.canvas.bbox(basket)
-
-        # Check if the object and basket overlap
-        if object_coords and basket_coords:
-            if (
-                object_coords[2] >= basket_coords[0] and
-                object_coords[0] <= basket_coords[2]
-            ):
-                if (
-                    object_coords[3] >= basket_coords[1] and
-                    object_coords[1] <= basket_coords[3]
-                ):
-                    return True
-        return False
+        player = player or self.players[0]
+        self.world.move_player(player, 1)
+        self.draw_basket(player)
 
     def game_over(self):
         """Handles game over state and display the game over screen"""
@@ -1446,115 +4149,148 @@ class Game(tk.Frame):
         self.game_over_flag = True
 
         # Cancel any ongoing periodic actions
-        if hasattr(self, "periodic_falls"):
-            self.master.after_cancel(self.periodic_falls)
+        self.cancel_all_after_calls()
+        self.tweens.cancel_all()
+        self.stop_autosave()
+
+        # Session statistics are saved in the background
+        self.telemetry.write(self.session_stats.finish())
+        self.schedule(100, self.report_telemetry_error)
 
         self.update_leaderboard(
             self.write_leaderboard
         )  # Update and saves the leaderboard
 
-        self.master.withdraw()  # Hides the main window
+        if self.versus is not None:
+            self.linger_versus(2000 // TICK_MS)
+
+        self.show_screen("game_over")
+        self.game_over_notice_label.config(text="")
+
+        # Display name and score
+        if len(self.players) == 1:
+            self.game_over_name_label.config(
+                text=f"Player: {self.players[0].name}"
+            )
+            self.game_over_score_label.config(
+                text=f"Your Score: {self.players[0].score}"
+            )
+        else:
+            # List every player, best score first
+            ranked = sorted(self.players, key=lambda p: p.score, reverse=True)
+            self.game_over_name_label.config(
+                text="\n".join(
+                    f"{position + 1}. {player.name}: {player.score}"
+                    for position, player in enumerate(ranked)
+                )
+            )
+            self.game_over_score_label.config(text="")
+
+    def report_telemetry_error(self):
+        """Tells the players once if statistics could not be saved"""
+        if self.telemetry.busy():
+            self.schedule(100, self.report_telemetry_error)
+            return
+        if self.telemetry.error is None or self.telemetry_error_shown:
+            return
+        self.telemetry_error_shown = True
+        self.show_message("Game statistics could not be saved")
 
-        # Create a new game over window
-        self.game_over_window = tk.Toplevel(self.master)
-        self.game_over_window.title("Game Over")
-        self.game_over_window.geometry("1000x600")
+    def build_game_over_screen(self):
+        """Creates the game over screen"""
+        game_over_frame = tk.Frame(self.master, width=1000, height=600)
+        game_over_frame.grid(row=0, column=0)
 
         # Set up background image and display "GAME OVER" text
-        self.start_bg = Image.open("game_over_background.png").resize(
-            (1000, 600), Image.LANCZOS
+        self.game_over_bg = self.sprites["game_over_background"].copy()
+        self.text_renderer.draw_text(
+            self.game_over_bg, "GAME OVER", (350, 250), 40, "red"
         )
-        self.start_bg_tk = ImageTk.PhotoImage(self.start_bg)
-        draw = ImageDraw.Draw(self.start_bg)
-        font_path = "./PressStart2P-Regular.ttf"
-        font_size = 40
-        font = ImageFont.truetype(font_path, font_size)
-        text = "GAME OVER"
-        text_position = (350, 250)
-        draw.text(text_position, text, font=font, fill="red")
-        self.start_bg_tk = ImageTk.PhotoImage(self.start_bg)
+        self.game_over_bg_tk = ImageTk.PhotoImage(self.game_over_bg)
 
-        # Create canvas for the game over window
-        canvas = tk.Canvas(self.game_over_window, width=1000, height=600)
+        # Create canvas for the game over screen
+        canvas = tk.Canvas(game_over_frame, width=1000, height=600)
         canvas.pack(fill="both", expand=True)
-        canvas.create_image(0, 0, anchor="nw", image=self.start_bg_tk)
+        canvas.create_image(0, 0, anchor="nw", image=self.game_over_bg_tk)
 
-        # Display name and score
-        tk.Label(
-            self.game_over_window,
-            text=f"Player: {self.player_name}",
-            font=("Arial", 16),
-        ).place(x=350, y=300)
-        tk.Label(
-            self.game_over_window,
-            text=f"Your Score: {self.score_value}",
-            font=("Arial", 16),
-        ).place(x=350, y=350)
+        # Labels for names and scores, filled in by game_over
+        self.game_over_name_label = tk.Label(
+            game_over_frame, font=("Arial", 16), justify=tk.LEFT
+        )
+        self.game_over_name_label.place(x=350, y=300)
+        self.game_over_score_label = tk.Label(
+            game_over_frame, font=("Arial", 16)
+        )
+        self.game_over_score_label.place(x=350, y=350)
+        # Messages while the screen is up, see show_message
+        self.game_over_notice_label = tk.Label(
+            game_over_frame, font=("Arial", 14)
+        )
+        self.game_over_notice_label.place(x=350, y=450)
 
         # Buttons for leaderboard, restart, and exit
         tk.Button(
-            self.game_over_window,
+            game_over_frame,
             text="Leaderboard",
             font=("Arial", 14),
             command=lambda: self.show_leaderboard(),
         ).place(x=350, y=400)
 
         tk.Button(
-            self.game_over_window,
+            game_over_frame,
             text="Restart",
             font=("Arial", 14),
             command=self.restart_game,
         ).place(x=480, y=400)
 
         tk.Button(
-            self.game_over_window,
+            game_over_frame,
             text="Exit Game",
             font=("Arial", 14),
             command=self.master.quit,
         ).place(x=610, y=400)
 
         # Help button for game instructions
-        self.help_button = tk.Button(
-            self.game_over_window,
+        tk.Button(
+            game_over_frame,
             image=self.help_icon_tk,
             compound=tk.CENTER,
             command=self.show_game_help,
             borderwidth=0,
             highlightthickness=0,
-        )
-        self.help_button.place(x=900, y=10)
+        ).place(x=900, y=10)
+        return game_over_frame
 
     def restart_game(self):
-        """Reset game state and return to the start game window"""
-        self.score_value = 0
-        self.lives_value = 5
-        self.g_apple_counter = 0
-        self.r_apple_counter = 0
-        self.power_up_counter = 0
+        """Reset game state and return to the main menu"""
         self.game_over_flag = False
-        self.invincibility = False
         self.is_paused = False
         self.game_started = False
-        self.level = 1
-        self.large_basket = False
-        self.cheat_invincibility = False
         self.cheat_code_buffer = ""
 
         # Cancel any periodic actions
-        if hasattr(self, "periodic_after_id"):
-            self.master.after_cancel(self.periodic_after_id)
-            self.periodic_after_id = None
-
-        # Update score and lives labels
-        self.score_label.config(text=f"Score: {self.score_value}")
-        self.lives_label.config(text=f"Lives: {self.lives_value}")
-
-        # Close the game over window
-        self.game_over_window.destroy()
+        self.cancel_all_after_calls()
+        self.tweens.cancel_all()
+        self.stop_autosave()
+        if self.versus is not None:
+            self.versus.close()
+            self.versus = None
+
+        # Players are chosen again on the start screen
+        for label in self.status_frame.winfo_children():
+            label.destroy()
+        self.players = []
+        self.world = None
+        self.object_items = {}
+        self.hide_help_button()
+        self.hide_exit_button()
 
         # Clear the canvas and reset background
         self.canvas.delete("all")
-        self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image_tk)
+        self.create_background()
+        self.create_boss_layer()
+        if self.frame_renderer is not None:
+            self.frame_renderer.reset()
 
         # Unbind previous key events
         self.master.unbind("<KeyPress>")
@@ -1563,11 +4299,2216 @@ class Game(tk.Frame):
         self.start_game()
 
 
-if __name__ == "__main__":
+def idle_policy(world, player):
+    """Never moves the basket"""
+    return 0
+
+
+def greedy_policy(world, player):
+    """Moves towards the lowest apple that isn't rotten"""
+    targets = [
+        o for o in world.objects.values()
+        if o.kind != "rotten" and o.y <= CATCH_BOTTOM
+    ]
+    if not targets:
+        return 0
+    target = max(targets, key=lambda o: o.y)
+    target_x = target.x + target.width / 2
+    basket_x = player.x + player.basket_size()[0] / 2
+    # Stay put once the target is within one step of the basket centre
+    if target_x < basket_x - 20:
+        return -1
+    if target_x > basket_x + 20:
+        return 1
+    return 0
+
+
+def expected_fall_speed(world, falling_object):
+    """Returns the average distance an object falls in one tick"""
+    return falling_object.vy
+
+
+def ticks_to_catch(world, falling_object):
+    """Returns roughly how many ticks until the object reaches the baskets"""
+    distance = max(0, CATCH_TOP - falling_object.y)
+    return distance / expected_fall_speed(world, falling_object)
+
+
+def planner_policy(world, player):
+    """Heads for the best reachable apple while dodging rotten apples"""
+    width = player.basket_size()[0]
+    # Basket positions after each possible move, with their danger
+    options = []
+    for direction in (0, -1, 1):
+        x = player.x + direction * 40
+        if direction < 0 and player.x <= 0:
+            continue
+        if direction > 0 and player.x >= CANVAS_WIDTH - width:
+            continue
+        danger = any(
+            o.kind == "rotten" and
+            o.y <= CATCH_BOTTOM and
+            ticks_to_catch(world, o) <= 3 and
+            o.x + o.width >= x and o.x <= x + width
+            for o in world.objects.values()
+        )
+        options.append((direction, x, danger))
+    safe_options = [o for o in options if not o[2]] or options
+
+    # Next object to land that the basket can still reach, moving 40px
+    # per tick. Missed apples cost a life, so arrival order beats value.
+    target = None
+    best_ticks = None
+    basket_center = player.x + width / 2
+    for o in world.objects.values():
+        if o.kind == "rotten" or o.y > CATCH_BOTTOM:
+            continue
+        ticks = ticks_to_catch(world, o)
+        distance = abs(o.x + o.width / 2 - basket_center)
+        if distance - width / 2 > (ticks + 1) * 40:
+            continue  # Too far away to reach in time
+        if best_ticks is None or ticks < best_ticks:
+            target, best_ticks = o, ticks
+
+    if target is None:
+        return safe_options[0][0]
+    target_x = target.x + target.width / 2
+    return min(
+        safe_options, key=lambda o: abs(target_x - (o[1] + width / 2))
+    )[0]
+
+
+# Policies selectable from the command line. A policy is any callable
+# taking (world, player) and returning -1 (left), 0 (stay) or 1 (right).
+POLICIES = {
+    "idle": idle_policy,
+    "greedy": greedy_policy,
+    "planner": planner_policy,
+}
+
+
+def run_headless_game(seed, policy_name="greedy", max_seconds=600,
+                      on_tick=None, collect_stats=False):
+    """Plays one game without Tk and returns its final statistics"""
+    player = Player("Bot")
+    player.policy = POLICIES[policy_name]
+    world = World([player], seed=seed)
+    stats = SessionStats(world) if collect_stats else None
+    elapsed = 0
+    next_wave = 0
+    while not world.game_over_flag and elapsed < max_seconds * 1000:
+        if elapsed >= next_wave:
+            next_wave += world.spawn_wave()
+
+        # One basket move per tick stands in for held-down keys
+        direction = player.policy(world, player)
+        if direction:
+            world.move_player(player, direction)
+        world.step()
+        world.bus.dispatch()
+        elapsed += TICK_MS
+        if on_tick is not None:
+            on_tick(world, elapsed)
+
+    result = {
+        "score": player.score,
+        "level": world.level,
+        "survival": elapsed / 1000,
+    }
+    if stats is not None:
+        result["session"] = stats.finish()
+    return result
+
+
+def run_benchmark(policy_name="planner", level=10, seconds=120, seed=0):
+    """Times each simulation tick of a bot playing at a fixed level"""
+    player = Player("Bot")
+    player.policy = POLICIES[policy_name]
+    # Start with the score for the level so the difficulty matches it
+    player.score = (level - 1) * 15
+    world = World([player], seed=seed)
+    # Keeps the bot alive for the whole run
+    world.apply_effect("invincible", player, seconds * 1000 + TICK_MS)
+    world.level = level
+    world.update_difficulty()
+
+    tick_times = []
+    peak_objects = 0
+    elapsed = 0
+    next_wave = 0
+    while elapsed < seconds * 1000:
+        started = time.perf_counter()
+        if elapsed >= next_wave:
+            next_wave += world.spawn_wave()
+        direction = player.policy(world, player)
+        if direction:
+            world.move_player(player, direction)
+        world.step()
+        world.bus.dispatch()
+        tick_times.append((time.perf_counter() - started) * 1000)
+        peak_objects = max(peak_objects, len(world.objects))
+        elapsed += TICK_MS
+
+    return {
+        "tick_ms": tick_times,
+        "peak_objects": peak_objects,
+        "final_level": world.level,
+        "score": player.score,
+        "event_counts": world.bus.counts,
+        "largest_batch": world.bus.largest_batch,
+    }
+
+
+def record_game(path, seed=0, policy_name="planner", seconds=15, every=1,
+                queue_size=32):
+    """Plays a bot game without a display and saves its frames"""
+    renderer = OffscreenRenderer(load_sprites())
+    writer = FrameWriter(
+        path, fps=1000 // (TICK_MS * every), queue_size=queue_size
+    )
+    ticks = 0
+
+    def on_tick(world, elapsed):
+        nonlocal ticks
+        if ticks % every == 0:
+            writer.put(renderer.render(world))
+        ticks += 1
+
+    try:
+        result = run_headless_game(seed, policy_name, seconds, on_tick)
+    finally:
+        writer.close()
+    result["frames"] = writer.frames_written
+    result["stalls"] = writer.stalls
+    return result
+
+
+class VectorEnv:
+    """Steps many one-player games at once with NumPy, Gym style"""
+
+    KINDS = ("apple", "golden", "rotten", "power_up")
+    ACTIONS = (0, -1, 1)  # Action index -> basket direction
+    PLAYER_FEATURES = 4  # Basket x, lives, level, invincibility left
+    OBJECT_FEATURES = 6  # Alive, kind, x, y, x speed, fall speed
+
+    def __init__(self, count, seed=None, max_objects=32, max_seconds=600):
+        import numpy as np
+
+        self.count = count  # Number of games stepped together
+        self.max_objects = max_objects  # Later spawns wait for a slot
+        self.max_steps = max_seconds * 1000 // TICK_MS
+        self.observation_shape = (
+            self.PLAYER_FEATURES + max_objects * self.OBJECT_FEATURES,
+        )
+        self.action_count = len(self.ACTIONS)
+        self.random = np.random.default_rng(seed)
+
+        # Per-kind tables, indexed by the kind column of each object
+        motions = [OBJECT_MOTION[kind] for kind in self.KINDS]
+        self.kind_size = np.array(
+            [OBJECT_SIZES[kind] for kind in self.KINDS], dtype=float
+        )
+        self.kind_drift = np.array([m["drift"] for m in motions], float)
+        self.kind_jitter = np.array([m["jitter"] for m in motions], float)
+        self.kind_wobble = np.array([m["wobble"] for m in motions], float)
+        self.kind_bounce = np.array([m["bounce"] for m in motions], float)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Starts every game afresh, returning observations and info"""
+        import numpy as np
+
+        if seed is not None:
+            self.random = np.random.default_rng(seed)
+        shape = (self.count, self.max_objects)
+        self.alive = np.zeros(shape, dtype=bool)
+        self.kind = np.zeros(shape, dtype=np.int8)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.vx = np.zeros(shape)
+        self.basket_x = np.zeros(self.count)
+        self.score = np.zeros(self.count, dtype=np.int64)
+        self.lives = np.zeros(self.count, dtype=np.int64)
+        self.level = np.zeros(self.count, dtype=np.int64)
+        self.clock = np.zeros(self.count, dtype=np.int64)
+        self.next_wave = np.zeros(self.count, dtype=np.int64)
+        self.wave = np.zeros(self.count, dtype=np.int64)
+        self.invincible_until = np.zeros(self.count, dtype=np.int64)
+        self.steps = np.zeros(self.count, dtype=np.int64)
+        self.reset_games(np.ones(self.count, dtype=bool))
+        return self.observe(), {}
+
+    def reset_games(self, games):
+        """Starts the selected games afresh"""
+        self.alive[games] = False
+        self.basket_x[games] = (CANVAS_WIDTH - 100) // 2
+        self.score[games] = 0
+        self.lives[games] = 5
+        self.level[games] = 1
+        self.clock[games] = 0
+        self.next_wave[games] = 0
+        self.wave[games] = 0
+        self.invincible_until[games] = 0
+        self.steps[games] = 0
+
+    def fall_speeds(self):
+        """Returns each game's fall speed for each kind, as World does"""
+        import numpy as np
+
+        score = self.score
+        return np.stack([
+            3 + self.level * 0.5,
+            np.full(self.count, 7 / 2),
+            8 + np.minimum(2, score // 20),
+            8 + np.minimum(4, score // 15),
+        ], axis=1)
+
+    def spawn(self, games, kind):
+        """Adds an object of one kind to the selected games"""
+        import numpy as np
+
+        # First free slot of each game, skipping games that are full
+        free = ~self.alive
+        games = games & free.any(axis=1)
+        rows = np.flatnonzero(games)
+        if not len(rows):
+            return
+        slots = free[rows].argmax(axis=1)
+        if self.KINDS[kind] == "power_up":
+            x = self.random.integers(20, CANVAS_WIDTH - 50 + 1, len(rows))
+            x = x - 10  # Centre of the triangle
+        else:
+            x = self.random.integers(0, CANVAS_WIDTH - 30 + 1, len(rows))
+        self.alive[rows, slots] = True
+        self.kind[rows, slots] = kind
+        self.x[rows, slots] = x
+        self.y[rows, slots] = 0
+        self.vx[rows, slots] = self.kind_drift[kind]
+
+    def spawn_waves(self):
+        """Spawns a wave in every game whose next wave is due"""
+        import numpy as np
+
+        due = self.clock >= self.next_wave
+        if not due.any():
+            return
+        level = self.level
+        self.next_wave += np.where(
+            due, np.maximum(2000 - level * 200, 500), 0
+        )
+        self.wave += due
+        wave = self.wave
+        draws = self.random.random((3, self.count))
+
+        # Same odds and wave counters as World.spawn_wave
+        self.spawn(due & (draws[0] < np.minimum(0.7 + level * 0.05, 0.95)),
+                   0)
+        self.spawn(
+            due & (wave % np.maximum(8 - level // 2, 3) == 0) &
+            (wave % 4 == 0),
+            1,
+        )
+        self.spawn(
+            due & (wave % np.maximum(12 - level // 2, 4) == 0) &
+            (draws[1] < 0.3 + level * 0.05),
+            2,
+        )
+        self.spawn(
+            due & (wave % np.maximum(15 - level // 2, 6) == 0) &
+            (draws[2] < 0.2 + level * 0.03),
+            3,
+        )
+
+    def move_objects(self):
+        """Moves every object one tick, like Kinematics.step"""
+        import numpy as np
+
+        kind = self.kind
+        alive = self.alive
+        shape = kind.shape
+        jitter = self.kind_jitter[kind]
+        factor = self.random.uniform(jitter[..., 0], jitter[..., 1])
+        vy = np.take_along_axis(self.fall_speeds(), kind.astype(int), 1)
+        moved_x = self.vx * factor
+        wobble = self.kind_wobble[kind]
+        wobbling = self.random.random(shape) < wobble[..., 0]
+        moved_x += np.where(
+            wobbling, self.random.uniform(-1, 1, shape) * wobble[..., 1], 0
+        )
+        self.x += np.where(alive, moved_x, 0)
+        self.y += np.where(alive, vy * factor, 0)
+
+        # Reflect bouncing objects back inside the side walls
+        right = CANVAS_WIDTH - self.kind_size[kind, 0]
+        bounce = self.kind_bounce[kind]
+        bouncing = alive & (bounce > 0)
+        hit_left = bouncing & (self.x < 0)
+        hit_right = bouncing & (self.x > right)
+        self.x = np.where(hit_left, -self.x, self.x)
+        self.x = np.where(hit_right, 2 * right - self.x, self.x)
+        self.vx = np.where(hit_left | hit_right, -self.vx * bounce, self.vx)
+
+    def resolve(self):
+        """Applies catches and misses, returning each game's score change"""
+        import numpy as np
+
+        kind = self.kind
+        size = self.kind_size[kind]
+        is_power_up = kind == 3
+        basket_left = self.basket_x[:, None]
+        basket_top = CANVAS_HEIGHT - 100
+        overlaps = (
+            (self.x + size[..., 0] >= basket_left) &
+            (self.x <= basket_left + 150) &
+            (self.y + size[..., 1] >= basket_top) &
+            (self.y <= basket_top + 100)
+        )
+        # Power-ups only count when their centre is over the basket
+        center_x = self.x + size[..., 0] / 2
+        over_centre = (center_x >= basket_left) & (
+            center_x <= basket_left + 100
+        )
+        bottom = self.y + np.where(is_power_up, size[..., 1] / 2, 0)
+        reached = self.alive & (self.y >= CATCH_TOP)
+        gone = reached & (bottom >= CANVAS_HEIGHT)
+        caught = (
+            reached & ~gone & (self.y <= CATCH_BOTTOM) & overlaps &
+            (~is_power_up | over_centre)
+        )
+        missed = gone & ~overlaps & (kind == 0)
+        self.alive &= ~(gone | caught)
+
+        def count(mask, kind_index):
+            return (mask & (kind == kind_index)).sum(axis=1)
+
+        invincible = self.invincible_until > self.clock
+        apples, golden, rotten = (count(caught, k) for k in range(3))
+        vulnerable = ~invincible
+        score_change = apples + golden * 10 - rotten * vulnerable
+        self.score += score_change
+        self.lives += (golden - rotten - missed.sum(axis=1)) * vulnerable
+        self.lives = np.maximum(self.lives, 0)
+        # Power-ups restart invincibility unless more time is left
+        self.invincible_until = np.where(
+            count(caught, 3) > 0,
+            np.maximum(
+                self.invincible_until,
+                self.clock + EFFECTS["invincible"]["duration"],
+            ),
+            self.invincible_until,
+        )
+        self.level = 1 + self.score // 15
+        return score_change
+
+    def step(self, actions):
+        """Advances every game one tick, returning Gym's five values"""
+        import numpy as np
+
+        self.spawn_waves()
+        direction = np.asarray(self.ACTIONS)[np.asarray(actions)]
+        # Same 40px steps and edge checks as World.move_player
+        can_left = (direction < 0) & (self.basket_x > 0)
+        can_right = (direction > 0) & (self.basket_x < CANVAS_WIDTH - 150)
+        self.basket_x += 40 * can_right - 40 * can_left
+
+        self.clock += TICK_MS
+        self.steps += 1
+        self.move_objects()
+        rewards = self.resolve().astype(np.float32)
+        terminated = self.lives <= 0
+        truncated = ~terminated & (self.steps >= self.max_steps)
+        # Finished games start again at once, reporting how they ended
+        info = {}
+        finished = terminated | truncated
+        if finished.any():
+            info["final_score"] = np.where(finished, self.score, 0)
+            info["final_level"] = np.where(finished, self.level, 0)
+            self.reset_games(finished)
+        return self.observe(), rewards, terminated, truncated, info
+
+    def observe(self):
+        """Returns one flat float32 observation row per game"""
+        import numpy as np
+
+        # Lowest objects first, as they need catching soonest
+        order = np.argsort(
+            np.where(self.alive, -self.y, np.inf), axis=1, kind="stable"
+        )
+
+        def sort(array):
+            return np.take_along_axis(array, order, 1)
+
+        alive = sort(self.alive)
+        kind = sort(self.kind)
+        vy = np.take_along_axis(self.fall_speeds(), kind.astype(int), 1)
+        objects = np.stack([
+            alive,
+            kind / (len(self.KINDS) - 1),
+            sort(self.x) / CANVAS_WIDTH,
+            sort(self.y) / CANVAS_HEIGHT,
+            sort(self.vx) / 10,
+            vy / 10,
+        ], axis=2) * alive[..., None]
+        player = np.stack([
+            self.basket_x / CANVAS_WIDTH,
+            self.lives / 10,
+            self.level / 10,
+            np.maximum(self.invincible_until - self.clock, 0) /
+            EFFECTS["invincible"]["duration"],
+        ], axis=1)
+        return np.concatenate(
+            [player, objects.reshape(self.count, -1)], axis=1
+        ).astype(np.float32)
+
+    def greedy_actions(self):
+        """Returns greedy_policy's choice for every game, as actions"""
+        import numpy as np
+
+        # Lowest object still catchable that isn't rotten
+        targets = self.alive & (self.kind != 2) & (self.y <= CATCH_BOTTOM)
+        lowest = np.where(targets, self.y, -np.inf).argmax(axis=1)
+        rows = np.arange(self.count)
+        kind = self.kind[rows, lowest]
+        target_x = self.x[rows, lowest] + self.kind_size[kind, 0] / 2
+        basket_x = self.basket_x + 150 / 2
+        direction = np.where(
+            target_x < basket_x - 20, -1,
+            np.where(target_x > basket_x + 20, 1, 0),
+        )
+        direction[~targets.any(axis=1)] = 0
+        # Directions -1, 0 and 1 are actions 1, 0 and 2
+        return np.array([1, 0, 2])[direction + 1]
+
+
+def write_varint(out, value):
+    """Appends a non-negative integer to a bytearray, 7 bits per byte"""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """Reads an integer written by write_varint and the offset after it"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value):
+    """Maps signed integers to unsigned ones, keeping small ones small"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    """Reverses zigzag()"""
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def pack_inputs(moves):
+    """Packs basket moves of -1, 0 or 1 four to a byte"""
+    packed = bytearray((len(moves) + 3) // 4)
+    for index, move in enumerate(moves):
+        packed[index // 4] |= (move + 1) << (index % 4 * 2)
+    return bytes(packed)
+
+
+def unpack_inputs(data, count):
+    """Reverses pack_inputs()"""
+    return [(data[index // 4] >> (index % 4 * 2) & 3) - 1
+            for index in range(count)]
+
+
+def quantize_object(kind, x, y):
+    """Returns an object's kind code and position in position steps"""
+    # Same kind codes as the vectorized environment
+    return (
+        VectorEnv.KINDS.index(kind),
+        int(round(float(x) * POSITION_SCALE)),
+        int(round(float(y) * POSITION_SCALE)),
+    )
+
+
+def net_state(snapshot):
+    """Quantizes a world snapshot to the state versus machines compare"""
+    position = snapshot["kinematics"]["arrays"]["position"]
+    return {
+        "level": snapshot["level"],
+        "next_object_id": snapshot["counters"][0],
+        "players": [
+            # Baskets are sent in whole pixels, however they were loaded
+            (score, lives, int(round(x)), eliminated)
+            for score, lives, x, _, _, _, eliminated in snapshot["players"]
+        ],
+        "objects": {
+            object_id: quantize_object(kind, *position[row])
+            for object_id, kind, row in snapshot["objects"]
+        },
+    }
+
+
+def net_states_match(first, second):
+    """Returns whether two net states agree, to within one position step"""
+    if (first["level"] != second["level"] or
+            first["next_object_id"] != second["next_object_id"] or
+            first["players"] != second["players"] or
+            first["objects"].keys() != second["objects"].keys()):
+        return False
+    for object_id, (kind, x, y) in first["objects"].items():
+        other_kind, other_x, other_y = second["objects"][object_id]
+        if kind != other_kind or abs(x - other_x) > 1 or abs(y - other_y) > 1:
+            return False
+    return True
+
+
+def encode_net_state(frame, state, baseline_frame=None, baseline=None):
+    """Encodes a net state as changes from an earlier one the peer has"""
+    out = bytearray()
+    write_varint(out, frame)
+    # How many frames back the baseline is, 0 for a full state
+    write_varint(out, 0 if baseline is None else frame - baseline_frame)
+    write_varint(out, state["level"])
+    write_varint(out, state["next_object_id"])
+    write_varint(out, len(state["players"]))
+    for score, lives, x, eliminated in state["players"]:
+        write_varint(out, zigzag(score))
+        write_varint(out, lives)
+        write_varint(out, zigzag(x))
+        out.append(int(eliminated))
+
+    old = {} if baseline is None else baseline["objects"]
+    new = state["objects"]
+    removed = sorted(i for i in old if i not in new)
+    added = sorted(i for i in new if i not in old)
+    moved = sorted(i for i in new if i in old and new[i] != old[i])
+    # Ids are sent as gaps from the previous id in the same list
+    for ids, fields in [
+        (removed, lambda i: ()),
+        (added, lambda i: (new[i][0], zigzag(new[i][1]), zigzag(new[i][2]))),
+        (moved, lambda i: (
+            zigzag(new[i][1] - old[i][1]), zigzag(new[i][2] - old[i][2])
+        )),
+    ]:
+        write_varint(out, len(ids))
+        previous = 0
+        for object_id in ids:
+            write_varint(out, object_id - previous)
+            previous = object_id
+            for value in fields(object_id):
+                write_varint(out, value)
+    return bytes(out)
+
+
+def decode_net_state(data, baselines):
+    """Decodes encode_net_state() output, given the states it may use"""
+    frame, offset = read_varint(data, 0)
+    distance, offset = read_varint(data, offset)
+    if distance:
+        if frame - distance not in baselines:
+            raise ValueError(f"Unknown baseline {frame - distance}")
+        objects = dict(baselines[frame - distance]["objects"])
+    else:
+        objects = {}
+    state = {"objects": objects, "players": []}
+    state["level"], offset = read_varint(data, offset)
+    state["next_object_id"], offset = read_varint(data, offset)
+    count, offset = read_varint(data, offset)
+    for _ in range(count):
+        score, offset = read_varint(data, offset)
+        lives, offset = read_varint(data, offset)
+        x, offset = read_varint(data, offset)
+        state["players"].append(
+            (unzigzag(score), lives, unzigzag(x), bool(data[offset]))
+        )
+        offset += 1
+
+    for group in ("removed", "added", "moved"):
+        count, offset = read_varint(data, offset)
+        object_id = 0
+        for _ in range(count):
+            gap, offset = read_varint(data, offset)
+            object_id += gap
+            if group == "removed":
+                del objects[object_id]
+            elif group == "added":
+                kind, offset = read_varint(data, offset)
+                x, offset = read_varint(data, offset)
+                y, offset = read_varint(data, offset)
+                objects[object_id] = (kind, unzigzag(x), unzigzag(y))
+            else:
+                dx, offset = read_varint(data, offset)
+                dy, offset = read_varint(data, offset)
+                kind, x, y = objects[object_id]
+                objects[object_id] = (
+                    kind, x + unzigzag(dx), y + unzigzag(dy)
+                )
+    return frame, state
+
+
+class VersusLink:
+    """Non-blocking UDP socket to the other machine in a versus game"""
+
+    def __init__(self, port=0, peer=None, loss=0.0, lag=0):
+        import socket
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("", port))
+        self.socket.setblocking(False)
+        if peer is not None:
+            # Replies come from the address, not the host name
+            peer = (socket.gethostbyname(peer[0]), peer[1])
+        self.peer = peer  # Learned from the first packet when hosting
+        # Bad network for testing: share of packets dropped on purpose
+        # and ticks each packet is held back
+        self.loss = loss
+        self.lag = lag
+        self.random = random.Random()
+        self.delayed = []  # [ticks left, packet] waiting to be sent
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.largest_packet = 0
+
+    @property
+    def port(self):
+        """Returns the local port, which is chosen by the OS if 0 was given"""
+        return self.socket.getsockname()[1]
+
+    def send(self, packet):
+        """Sends a packet to the peer, after any simulated lag"""
+        self.bytes_sent += len(packet)
+        self.packets_sent += 1
+        self.largest_packet = max(self.largest_packet, len(packet))
+        if self.random.random() < self.loss:
+            return
+        if self.lag:
+            self.delayed.append([self.lag, packet])
+        else:
+            self.transmit(packet)
+
+    def tick(self):
+        """Sends held back packets whose simulated lag is over"""
+        for entry in self.delayed:
+            entry[0] -= 1
+        while self.delayed and self.delayed[0][0] <= 0:
+            self.transmit(self.delayed.pop(0)[1])
+
+    def transmit(self, packet):
+        """Puts a packet on the network"""
+        if self.peer is None:
+            return
+        try:
+            self.socket.sendto(packet, self.peer)
+        except OSError:
+            pass  # Lost, like any other UDP packet
+
+    def receive(self):
+        """Returns the packets that arrived from the peer since last time"""
+        packets = []
+        while True:
+            try:
+                packet, address = self.socket.recvfrom(2048)
+            except BlockingIOError:
+                return packets
+            except ConnectionError:
+                continue  # The peer was not listening for an earlier send
+            if self.peer is None:
+                self.peer = address
+            if address == self.peer:
+                packets.append(packet)
+
+    def close(self):
+        """Closes the socket"""
+        self.socket.close()
+
+
+class VersusSession:
+    """Two-player game between machines, predicting and rolling back"""
+
+    HELLO, WELCOME, FRAME = 1, 2, 3  # First byte of every packet
+    # Type, first move in the packet, moves received, newest state check
+    # received plus one (0 for none) and the number of moves
+    HEADER = struct.Struct("!BIIIB")
+
+    def __init__(self, link, name, hosting, seed=None):
+        self.link = link
+        self.name = name
+        self.hosting = hosting  # The host's state checks correct the guest
+        if hosting and seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed  # The guest is told the host's seed
+        self.world = None  # Created once both machines have said hello
+        self.local = None
+        self.remote = None
+        self.frame = 0  # Ticks simulated so far
+        self.next_wave = 0  # Game time of the next wave of objects
+        self.presses = []  # Moves pressed since the last tick
+        self.local_moves = []  # Our move on every frame
+        self.remote_moves = []  # Opponent's moves received so far
+        self.predicted = {}  # Frame -> opponent move guessed for it
+        self.peer_ack = 0  # The opponent has our moves before this frame
+        self.saved = {}  # Frame -> (world snapshot, next wave) before it
+        self.rolled_back = False  # Whether the last tick rewrote history
+        # State checks, sent by the host and compared by the guest
+        self.last_check = 0
+        self.sent_checks = {}  # Frame -> state the guest may diff against
+        self.check_ack = None  # Newest check the guest has
+        self.received_checks = {}
+        self.check = None  # (frame, state) of a check not compared yet
+        # Counters for the HUD and versus-test
+        self.rollbacks = 0
+        self.deepest_rollback = 0
+        self.stalls = 0
+        self.corrections = 0
+        self.checks_deferred = 0
+
+    def start(self, remote_name):
+        """Creates the shared world, the host's player first"""
+        names = [self.name, remote_name]
+        if not self.hosting:
+            names.reverse()
+        if names[0] == names[1]:
+            names[1] += " 2"  # Leaderboards need different names
+        players = [Player(name, index=i) for i, name in enumerate(names)]
+        self.world = World(players, seed=self.seed)
+        self.local, self.remote = players if self.hosting else players[::-1]
+
+    def connect(self):
+        """Says hello until both machines know each other"""
+        self.link.tick()
+        self.receive()
+        if self.world is None and not self.hosting:
+            self.link.send(bytes([self.HELLO]) + self.name.encode("utf-8"))
+        return self.world is not None
+
+    def press(self, move):
+        """Queues a basket move of -1 or 1, one is used per tick"""
+        if move and len(self.presses) < 2:
+            self.presses.append(move)
+
+    def confirmed_frame(self):
+        """Returns the frame before which both players' moves are known"""
+        return min(self.frame, len(self.remote_moves))
+
+    @property
+    def finished(self):
+        """Whether the game is over with every move known"""
+        confirmed = self.confirmed_frame()
+        if confirmed == self.frame:
+            return self.world.game_over_flag
+        return self.saved[confirmed][0]["game_over"]
+
+    def advance(self):
+        """Reads packets, rolls back if needed, steps one tick and sends"""
+        self.link.tick()
+        self.rolled_back = False
+        mispredicted = self.receive()
+        if mispredicted is not None:
+            self.rewind(mispredicted)
+        if not self.hosting:
+            self.compare_check()
+
+        if self.world.game_over_flag:
+            pass  # Waiting for the moves that confirm it
+        elif self.frame - len(self.remote_moves) >= MAX_ROLLBACK_FRAMES:
+            self.stalls += 1  # Too far ahead of the opponent to guess
+        else:
+            self.local_moves.append(self.presses.pop(0) if self.presses else 0)
+            self.simulate(self.frame)
+            self.frame += 1
+
+        # Older states are kept for the host's checks, which lag behind
+        oldest = self.confirmed_frame() - MAX_ROLLBACK_FRAMES * 2
+        for frame in [f for f in self.saved if f < oldest]:
+            del self.saved[frame]
+        self.send_update()
+
+    def simulate(self, frame):
+        """Steps the world through a frame, guessing unknown moves"""
+        self.saved[frame] = (self.world.snapshot(), self.next_wave)
+        if frame < len(self.remote_moves):
+            remote_move = self.remote_moves[frame]
+            self.predicted.pop(frame, None)
+        else:
+            # Held keys repeat, so the last move is the best guess
+            remote_move = self.remote_moves[-1] if self.remote_moves else 0
+            self.predicted[frame] = remote_move
+        world = self.world
+        if world.game_over_flag:
+            return
+        if world.clock >= self.next_wave:
+            self.next_wave += world.spawn_wave()
+        for player in world.players:
+            if player is self.local:
+                move = self.local_moves[frame]
+            else:
+                move = remote_move
+            if move:
+                world.move_player(player, move)
+        world.step()
+
+    def rewind(self, frame):
+        """Restores the state before a frame and replays to the present"""
+        snapshot, self.next_wave = self.saved[frame]
+        self.world.restore(snapshot)
+        # Events of the replayed frames were shown when first predicted
+        bus = self.world.bus
+        self.world.bus = EventBus()
+        for replayed in range(frame, self.frame):
+            self.simulate(replayed)
+        self.world.bus = bus
+        self.rolled_back = True
+        self.rollbacks += 1
+        self.deepest_rollback = max(
+            self.deepest_rollback, self.frame - frame
+        )
+
+    def receive(self):
+        """Handles arrived packets, returning the first mispredicted frame"""
+        mispredicted = None
+        for packet in self.link.receive():
+            kind = packet[0] if packet else None
+            if kind == self.HELLO and self.hosting:
+                if self.world is None:
+                    self.start(packet[1:].decode("utf-8", "replace"))
+                # Sent for every hello in case an earlier welcome was lost
+                self.link.send(
+                    bytes([self.WELCOME]) + struct.pack("!I", self.seed) +
+                    self.name.encode("utf-8")
+                )
+            elif kind == self.WELCOME and not self.hosting:
+                if self.world is None:
+                    (self.seed,) = struct.unpack_from("!I", packet, 1)
+                    self.start(packet[5:].decode("utf-8", "replace"))
+            elif kind == self.FRAME and self.world is not None:
+                try:
+                    frame = self.read_frame(packet)
+                except (struct.error, ValueError, IndexError, KeyError):
+                    continue  # Damaged packet
+                if frame is not None and (
+                    mispredicted is None or frame < mispredicted
+                ):
+                    mispredicted = frame
+        return mispredicted
+
+    def read_frame(self, packet):
+        """Takes the opponent's moves and any state check from a packet"""
+        _, first, moves_received, check_ack, count = (
+            self.HEADER.unpack_from(packet)
+        )
+        self.peer_ack = max(self.peer_ack, moves_received)
+        if self.hosting and check_ack:
+            self.check_ack = max(self.check_ack or 0, check_ack - 1)
+        offset = self.HEADER.size + (count + 3) // 4
+        moves = unpack_inputs(packet[self.HEADER.size:offset], count)
+        mispredicted = None
+        for frame, move in enumerate(moves, first):
+            if frame != len(self.remote_moves):
+                continue  # Already known, or after a lost packet
+            self.remote_moves.append(move)
+            predicted = self.predicted.pop(frame, None)
+            if predicted is not None and predicted != move:
+                if mispredicted is None:
+                    mispredicted = frame
+        if offset < len(packet) and not self.hosting:
+            frame, state = decode_net_state(
+                packet[offset:], self.received_checks
+            )
+            self.received_checks[frame] = state
+            # The host diffs against the newest check acknowledged
+            for old in sorted(self.received_checks)[:-8]:
+                del self.received_checks[old]
+            if self.check is None or frame > self.check[0]:
+                self.check = (frame, state)
+        return mispredicted
+
+    def compare_check(self):
+        """Corrects the world from the host's state check if they differ"""
+        if self.check is None or self.check[0] > self.confirmed_frame():
+            return  # Nothing new, or not yet simulated with real moves
+        frame, state = self.check
+        self.check = None
+        if frame == self.frame:
+            if not net_states_match(self.world.net_state(), state):
+                self.corrections += 1
+                self.world.apply_net_state(state)
+                self.rolled_back = True
+            return
+        if frame not in self.saved:
+            return  # Too old to rewind to
+        snapshot = self.saved[frame][0]
+        if net_states_match(net_state(snapshot), state):
+            return
+        self.corrections += 1
+        self.world.restore(snapshot)
+        self.world.apply_net_state(state)
+        self.saved[frame] = (self.world.snapshot(), self.saved[frame][1])
+        self.rewind(frame)
+
+    def send_update(self):
+        """Sends our unacknowledged moves, plus a state check if due"""
+        moves = self.local_moves[self.peer_ack:self.frame][:64]
+        check_ack = 0
+        if self.received_checks:
+            check_ack = max(self.received_checks) + 1
+        packet = self.HEADER.pack(
+            self.FRAME, self.peer_ack, len(self.remote_moves), check_ack,
+            len(moves),
+        ) + pack_inputs(moves)
+        confirmed = self.confirmed_frame()
+        if self.hosting and confirmed - self.last_check >= SNAPSHOT_EVERY:
+            if confirmed == self.frame:
+                state = self.world.net_state()
+            else:
+                state = net_state(self.saved[confirmed][0])
+            baseline = self.sent_checks.get(self.check_ack)
+            check = encode_net_state(
+                confirmed, state, self.check_ack, baseline
+            )
+            if len(packet) + len(check) <= NET_PACKET_BUDGET:
+                packet += check
+                self.sent_checks[confirmed] = state
+                self.last_check = confirmed
+                for old in [f for f in self.sent_checks
+                            if f < (self.check_ack or 0)]:
+                    del self.sent_checks[old]
+            else:
+                self.checks_deferred += 1  # Tried again next tick
+        self.link.send(packet)
+
+    def close(self):
+        """Closes the network link"""
+        self.link.close()
+
+
+class BroadcastServer:
+    """Streams world frames to spectators, encoding each frame once"""
+
+    def __init__(self, pump, host="", port=BROADCAST_PORT,
+                 max_buffer=BROADCAST_BUFFER):
+        self.pump = pump
+        self.host = host
+        self.port = port  # Replaced by the real port once listening
+        self.max_buffer = max_buffer
+        self.server = None
+        self.clients = set()  # StreamWriter of every spectator
+        self.names_message = None  # Sent first to spectators who join
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        """Starts accepting spectators on the pumped asyncio loop"""
+        self.pump.spawn(self.listen())
+
+    async def listen(self):
+        """Accepts spectators until the pump is closed"""
+        import asyncio
+
+        self.server = await asyncio.start_server(
+            self.on_connect, self.host or None, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def on_connect(self, reader, writer):
+        """Adds a spectator until they disconnect"""
+        import socket
+
+        # A small kernel buffer too, so slow spectators see recent frames
+        writer.get_extra_info("socket").setsockopt(
+            socket.SOL_SOCKET, socket.SO_SNDBUF, self.max_buffer
+        )
+        self.clients.add(writer)
+        if self.names_message is not None:
+            writer.write(self.names_message)
+        try:
+            await reader.read()  # Spectators send nothing, so this is EOF
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    def publish(self, message):
+        """Sends one encoded message to every spectator keeping up"""
+        frame = struct.pack("!I", len(message)) + message
+        for writer in list(self.clients):
+            if writer.is_closing():
+                continue
+            # A slow spectator skips frames, their buffer never grows
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.frames_dropped += 1
+                continue
+            writer.write(frame)
+            self.frames_sent += 1
+
+    def publish_names(self, names):
+        """Tells spectators whose game they are watching"""
+        self.names_message = b"N" + json.dumps(names).encode("utf-8")
+        self.names_message = (
+            struct.pack("!I", len(self.names_message)) + self.names_message
+        )
+        for writer in list(self.clients):
+            if not writer.is_closing():
+                writer.write(self.names_message)
+
+    def publish_world(self, world):
+        """Sends the world's state, unless nobody is watching"""
+        if self.clients:
+            self.publish(b"S" + encode_net_state(
+                world.clock // TICK_MS, world.net_state()
+            ))
+
+    def close(self):
+        """Stops accepting spectators and disconnects the current ones"""
+        if self.server is not None:
+            self.server.close()
+        for writer in list(self.clients):
+            writer.close()
+
+
+class SpectatorViewer:
+    """Tk window showing a game streamed by a BroadcastServer"""
+
+    def __init__(self, master, pump, host, port=BROADCAST_PORT):
+        self.master = master
+        self.canvas = tk.Canvas(
+            master, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="black",
+            highlightthickness=0,
+        )
+        self.canvas.grid(row=0, column=0)
+        # The game's own sprites, at their normal size
+        self.photos = {
+            name: ImageTk.PhotoImage(load_sprite(name))
+            for name in ("background", "apple", "golden", "rotten", "basket")
+        }
+        self.canvas.create_image(
+            0, 0, anchor="nw", image=self.photos["background"]
+        )
+        self.hud = self.canvas.create_text(
+            20, 20, anchor="nw", fill="white", font=("Arial", 14, "bold"),
+            text="Connecting to the game...",
+        )
+        self.names = []
+        self.object_items = {}  # Object id -> canvas item
+        self.basket_items = []
+        pump.spawn(self.watch(host, port))
+
+    async def watch(self, host, port):
+        """Reads frames from the game, reconnecting whenever it is lost"""
+        import asyncio
+
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                self.canvas.itemconfig(
+                    self.hud, text="Waiting for the game to start..."
+                )
+                await asyncio.sleep(1)
+                continue
+            try:
+                while True:
+                    header = await reader.readexactly(4)
+                    (length,) = struct.unpack("!I", header)
+                    self.show(await reader.readexactly(length))
+            except (asyncio.IncompleteReadError, OSError):
+                self.canvas.itemconfig(self.hud, text="Game stream ended")
+            finally:
+                writer.close()
+            await asyncio.sleep(1)
+
+    def show(self, message):
+        """Draws a names or state message"""
+        if message[:1] == b"N":
+            self.names = json.loads(message[1:])
+            for item in [*self.object_items.values(), *self.basket_items]:
+                self.canvas.delete(item)
+            self.object_items = {}
+            self.basket_items = [
+                self.canvas.create_image(
+                    0, 0, anchor="nw", image=self.photos["basket"]
+                )
+                for _ in self.names
+            ]
+        elif message[:1] == b"S":
+            _, state = decode_net_state(message[1:], {})
+            self.draw(state)
+
+    def draw(self, state):
+        """Moves the canvas items to match a streamed state"""
+        objects = state["objects"]
+        for object_id, (kind, x, y) in objects.items():
+            kind = VectorEnv.KINDS[kind]
+            x, y = x / POSITION_SCALE, y / POSITION_SCALE
+            if kind == "power_up":
+                width, height = OBJECT_SIZES[kind]
+                coords = [x + width / 2, y, x + width, y + height,
+                          x, y + height]
+            else:
+                coords = [x, y]
+            item = self.object_items.get(object_id)
+            if item is not None:
+                self.canvas.coords(item, *coords)
+            elif kind == "power_up":
+                self.object_items[object_id] = self.canvas.create_polygon(
+                    coords, outline="gold", fill="yellow", width=2
+                )
+            else:
+                self.object_items[object_id] = self.canvas.create_image(
+                    *coords, anchor="nw", image=self.photos[kind]
+                )
+        for object_id in [i for i in self.object_items if i not in objects]:
+            self.canvas.delete(self.object_items.pop(object_id))
+
+        lines = []
+        for index, (score, lives, x, eliminated) in enumerate(
+            state["players"]
+        ):
+            if index < len(self.basket_items):
+                item = self.basket_items[index]
+                self.canvas.coords(item, x, CANVAS_HEIGHT - 100)
+                self.canvas.itemconfig(
+                    item, state="hidden" if eliminated else "normal"
+                )
+            name = self.names[index] if index < len(self.names) else "?"
+            lines.append(f"{name}: {score} points, {lives} lives")
+        lines.append(f"Level {state['level']}")
+        self.canvas.itemconfig(self.hud, text="\n".join(lines))
+        self.canvas.tag_raise(self.hud)
+
+
+def run_spectator(address):
+    """Opens a window showing the game broadcast at host[:port]"""
+    host, _, port = address.partition(":")
+    window = create_window()
+    window.title("Apple Catcher - Spectator")
+    pump = AsyncioPump(window)
+    pump.start()
+    SpectatorViewer(window, pump, host, int(port or BROADCAST_PORT))
+    window.mainloop()
+    pump.close()
+
+
+def run_versus_test(seconds=60, loss=0.0, lag=0, seed=0,
+                    policy_name="planner"):
+    """Plays two bots against each other over localhost UDP, without Tk"""
+    host = VersusSession(
+        VersusLink(0, loss=loss, lag=lag), "Host", True, seed
+    )
+    guest = VersusSession(
+        VersusLink(0, ("127.0.0.1", host.link.port), loss=loss, lag=lag),
+        "Guest", False,
+    )
+    sessions = [host, guest]
+    policy = POLICIES[policy_name]
+    for _ in range(1000):
+        if all([session.connect() for session in sessions]):
+            break
+    else:
+        raise RuntimeError("The versus machines never connected")
+
+    tick_ms = []
+    ticks = 0
+    while ticks < seconds * 1000 // TICK_MS:
+        if all(session.finished for session in sessions):
+            break
+        for session in sessions:
+            started = time.perf_counter()
+            local = session.local
+            if not local.eliminated:
+                session.press(policy(session.world, local))
+            session.advance()
+            session.world.bus.dispatch()
+            tick_ms.append((time.perf_counter() - started) * 1000)
+        ticks += 1
+
+    # Both machines must agree on everything both of them have confirmed
+    frame = min(session.confirmed_frame() for session in sessions)
+    states = []
+    for session in sessions:
+        if frame == session.frame:
+            states.append(session.world.net_state())
+        else:
+            states.append(net_state(session.saved[frame][0]))
+    for session in sessions:
+        session.close()
+    return {
+        "ticks": ticks,
+        "frame": frame,
+        "in_sync": net_states_match(*states),
+        "scores": [p.score for p in host.world.players],
+        "sessions": sessions,
+        "tick_ms": tick_ms,
+    }
+
+
+def run_headless_batch(seeds, policy_name, max_seconds, collect_stats=False):
+    """Plays a batch of games in one worker process"""
+    return [
+        run_headless_game(
+            seed, policy_name, max_seconds, collect_stats=collect_stats
+        )
+        for seed in seeds
+    ]
+
+
+def run_simulations(games, policy_name="greedy", workers=None, seed=0,
+                    max_seconds=600, collect_stats=False):
+    """Spreads headless games across processes and returns their results"""
+    seeds = list(range(seed, seed + games))
+    # Send games in batches so each task outweighs its pickling cost
+    batch_size = max(1, min(500, games // ((workers or os.cpu_count()) * 4)))
+    batches = [
+        seeds[i:i + batch_size] for i in range(0, games, batch_size)
+    ]
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(
+            run_headless_batch,
+            batches,
+            [policy_name] * len(batches),
+            [max_seconds] * len(batches),
+            [collect_stats] * len(batches),
+        ):
+            results.extend(batch)
+    return results
+
+
+def summarize(values):
+    """Returns mean, p10, median, p90 and max of a list of numbers"""
+    import statistics
+
+    if len(values) > 1:
+        deciles = statistics.quantiles(values, n=10)
+        p10, p90 = deciles[0], deciles[-1]
+    else:
+        p10 = p90 = values[0]
+    return (
+        statistics.fmean(values),
+        p10,
+        statistics.median(values),
+        p90,
+        max(values),
+    )
+
+
+def print_simulation_report(results, policy_name, workers, duration):
+    """Prints score, level and survival time distributions"""
+    print(
+        f"Simulated {len(results)} games with the {policy_name} policy "
+        f"in {duration:.1f}s ({workers or os.cpu_count()} workers)"
+    )
+    print(f"{'':<14}{'mean':>10}{'p10':>10}{'median':>10}"
+          f"{'p90':>10}{'max':>10}")
+    for metric, label in (
+        ("score", "Score"),
+        ("level", "Level"),
+        ("survival", "Survival (s)"),
+    ):
+        row = summarize([r[metric] for r in results])
+        print(f"{label:<14}" + "".join(f"{v:>10.1f}" for v in row))
+
+    # How many games ended on each level
+    print("Level reached:")
+    level_counts = {}
+    for result in results:
+        level_counts[result["level"]] = level_counts.get(
+            result["level"], 0) + 1
+    for level in sorted(level_counts):
+        share = level_counts[level] / len(results) * 100
+        print(f"  {level:>3}: {level_counts[level]:>8} ({share:5.1f}%)")
+
+
+def add_session(totals, record):
+    """Adds one session record to the totals, unchanged if it is bad"""
+    # Everything is read and summed first, so a record of the wrong
+    # shape raises before anything is added
+    reactions = record["reactions"]
+    reaction_count = reactions["count"] + 0
+    reaction_ms = reactions["total_ms"] + 0
+    reaction_max_ms = max(totals["reaction_max_ms"], reactions["max_ms"])
+    levels = {level: reached_ms + 0 for level, reached_ms in record["levels"]}
+    players = record["players"]
+    score = sum(player["score"] for player in players)
+    power_up_ms = sum(player["power_up_ms"] for player in players)
+    kinds = {"catches": {}, "misses": {}}
+    for player in players:
+        for key, counts in kinds.items():
+            for kind, count in player[key].items():
+                counts[kind] = counts.get(kind, 0) + count
+    duration_ms = record["duration_ms"] + 0
+    pauses = record["pauses"] + 0
+    boss_keys = record["boss_keys"] + 0
+
+    totals["sessions"] += 1
+    totals["duration_ms"] += duration_ms
+    totals["pauses"] += pauses
+    totals["boss_keys"] += boss_keys
+    totals["reactions"] += reaction_count
+    totals["reaction_ms"] += reaction_ms
+    totals["reaction_max_ms"] = reaction_max_ms
+    for level, reached_ms in levels.items():
+        level_total = totals["level_ms"].setdefault(level, [0, 0])
+        level_total[0] += 1
+        level_total[1] += reached_ms
+    totals["players"] += len(players)
+    totals["score"] += score
+    totals["power_up_ms"] += power_up_ms
+    for key, counts in kinds.items():
+        for kind, count in counts.items():
+            totals[key][kind] = totals[key].get(kind, 0) + count
+
+
+def aggregate_sessions(paths):
+    """Streams session logs line by line and returns combined totals"""
+    totals = {
+        "sessions": 0,
+        "players": 0,
+        "bad_lines": 0,
+        "score": 0,
+        "duration_ms": 0,
+        "catches": {},
+        "misses": {},
+        "reactions": 0,
+        "reaction_ms": 0,
+        "reaction_max_ms": 0,
+        "power_up_ms": 0,
+        "pauses": 0,
+        "boss_keys": 0,
+        "level_ms": {},  # Level -> [sessions reaching it, total time]
+    }
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                # Truncated lines and records of the wrong shape, such as
+                # ones from older versions, are counted and skipped
+                try:
+                    add_session(totals, json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    totals["bad_lines"] += line.strip() != ""
+    return totals
+
+
+def print_session_report(totals):
+    """Prints averages over every logged session"""
+    sessions, players = totals["sessions"], totals["players"]
+    if not sessions:
+        print("No sessions found")
+        return
+    print(
+        f"{sessions} sessions, {players} players"
+        + (f", {totals['bad_lines']} unreadable lines"
+           if totals["bad_lines"] else "")
+    )
+    print(f"Mean score per player: {totals['score'] / players:.1f}")
+    print(
+        f"Mean game length: {totals['duration_ms'] / sessions / 1000:.1f}s"
+    )
+    print(f"{'Object':<10}{'caught':>10}{'missed':>10}{'caught %':>10}")
+    for kind in OBJECT_SIZES:
+        caught = totals["catches"].get(kind, 0)
+        missed = totals["misses"].get(kind, 0)
+        share = caught / (caught + missed) * 100 if caught + missed else 0
+        print(f"{kind:<10}{caught:>10}{missed:>10}{share:>10.1f}")
+    if totals["reactions"]:
+        print(
+            f"Reaction time: mean "
+            f"{totals['reaction_ms'] / totals['reactions']:.0f} ms, "
+            f"max {totals['reaction_max_ms']} ms"
+        )
+    print(
+        f"Power-up time per player: "
+        f"{totals['power_up_ms'] / players / 1000:.1f}s"
+    )
+    print(
+        f"Pauses per session: {totals['pauses'] / sessions:.2f}, "
+        f"boss key uses: {totals['boss_keys'] / sessions:.2f}"
+    )
+    print("Mean time to reach each level:")
+    for level in sorted(totals["level_ms"]):
+        reached, total_ms = totals["level_ms"][level]
+        print(
+            f"  {level:>3}: {total_ms / reached / 1000:8.1f}s "
+            f"({reached / sessions * 100:5.1f}% of sessions)"
+        )
+
+
+# Growth between the first and last third of soak samples that counts
+# as a leak, once the trend is also upward
+SOAK_TOLERANCES = {
+    "rss_kb": 20 * 1024,
+    "traced_kb": 4 * 1024,
+    "canvas_items": 10,
+    "pending_afters": 10,
+    "widgets": 10,
+}
+
+
+def read_rss_kb():
+    """Returns the resident memory of this process in KiB"""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current memory, but still shows steady growth
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def count_widgets(widget):
+    """Counts a widget and all of its descendants"""
+    return 1 + sum(count_widgets(w) for w in widget.winfo_children())
+
+
+class SoakMonitor:
+    """Auto-plays and restarts the game for hours, watching for leaks"""
+
+    def __init__(self, game, hours, game_seconds=60, warmup=3):
+        import tracemalloc
+
+        self.game = game
+        self.deadline = time.monotonic() + hours * 3600
+        self.game_seconds = game_seconds
+        self.warmup = warmup  # Early samples ignored while caches fill
+        self.samples = []
+        self.games_played = 0
+        self.game_started_at = None
+        self.leaks = []
+        tracemalloc.start()
+        self.first_snapshot = None
+
+    def start(self):
+        """Begins polling the game once a second"""
+        self.game.master.after(1000, self.poll)
+
+    def poll(self):
+        """Restarts finished games and starts new ones automatically"""
+        game = self.game
+        try:
+            if time.monotonic() >= self.deadline:
+                self.finish()
+                return
+            if game.game_over_flag:
+                game.restart_game()
+            elif not game.game_started:
+                self.begin_game()
+            elif time.monotonic() - self.game_started_at > self.game_seconds:
+                game.game_over()
+        except Exception as error:
+            self.leaks.append(("error", repr(error)))
+            self.finish()
+            raise
+        if self.leaks:
+            self.finish()
+            return
+        game.master.after(1000, self.poll)
+
+    def begin_game(self):
+        """Samples resources at the menu, then starts a bot game"""
+        self.game.ensure_playfield()
+        self.take_sample()
+        self.leaks = self.find_leaks()
+        if self.leaks:
+            return
+        name_entry = self.game.player_entries[0][0]
+        name_entry.delete(0, tk.END)
+        name_entry.insert(0, "Soak")
+        self.game.initialize_main_game()
+        self.games_played += 1
+        self.game_started_at = time.monotonic()
+
+    def take_sample(self):
+        """Records memory, canvas items, pending callbacks and widgets"""
+        import tracemalloc
+
+        master = self.game.master
+        sample = {
+            "rss_kb": read_rss_kb(),
+            "traced_kb": tracemalloc.get_traced_memory()[0] // 1024,
+            "canvas_items": len(self.game.canvas.find_all()),
+            "pending_afters": len(master.tk.splitlist(
+                master.tk.call("after", "info")
+            )),
+            "widgets": count_widgets(master),
+        }
+        self.samples.append(sample)
+        if len(self.samples) == self.warmup + 1:
+            self.first_snapshot = tracemalloc.take_snapshot()
+        print(
+            f"[soak] game {self.games_played}: " +
+            ", ".join(f"{k}={v}" for k, v in sample.items()),
+            flush=True,
+        )
+
+    def find_leaks(self):
+        """Returns metrics that keep growing after the warm-up samples"""
+        import statistics
+
+        samples = self.samples[self.warmup:]
+        if len(samples) < 6:
+            return []
+        leaks = []
+        third = len(samples) // 3
+        for metric, tolerance in SOAK_TOLERANCES.items():
+            values = [sample[metric] for sample in samples]
+            slope = statistics.linear_regression(
+                range(len(values)), values
+            ).slope
+            growth = (
+                statistics.median(values[-third:]) -
+                statistics.median(values[:third])
+            )
+            if slope > 0 and growth > tolerance:
+                leaks.append((metric, f"{values[0]} -> {values[-1]}"))
+        return leaks
+
+    def finish(self):
+        """Prints the soak result and closes the game"""
+        import tracemalloc
+
+        print(
+            f"[soak] {self.games_played} games, "
+            f"{len(self.samples)} samples", flush=True
+        )
+        if self.leaks:
+            print("[soak] FAILED, resources keep growing:", file=sys.stderr)
+            for metric, detail in self.leaks:
+                print(f"[soak]   {metric}: {detail}", file=sys.stderr)
+            if self.first_snapshot is not None:
+                # Show where traced allocations grew the most
+                growth = tracemalloc.take_snapshot().compare_to(
+                    self.first_snapshot, "lineno"
+                )
+                for stat in growth[:10]:
+                    print(f"[soak]   {stat}", file=sys.stderr)
+        else:
+            print("[soak] OK, no resource growth detected", flush=True)
+        tracemalloc.stop()
+        self.game.master.destroy()
+
+
+def create_window(fullscreen=False):
+    """Creates the main window, which the playfield scales to fit"""
     window = tk.Tk()
     window.title("Apple Catcher")
-    window.geometry("1000x600")
-    window.resizable(False, False)
+    window.geometry(f"{CANVAS_WIDTH}x{CANVAS_HEIGHT}")
+    window.minsize(CANVAS_WIDTH // 2, CANVAS_HEIGHT // 2)
+    window.configure(bg="black")
+    # Screens share one cell that grows with the window
+    window.grid_rowconfigure(0, weight=1)
+    window.grid_columnconfigure(0, weight=1)
+    if fullscreen:
+        window.attributes("-fullscreen", True)
+    return window
+
+
+def profile_imports(limit=8):
+    """Imports this module in a fresh interpreter, timing its imports"""
+    import subprocess
+
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    total = 0
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and name.strip() == module:
+            total = int(cumulative) / 1000
+        elif depth == 1:
+            # Imported directly by this module
+            imports.append((int(cumulative) / 1000, name.strip()))
+    return total, sorted(imports, reverse=True)[:limit]
+
+
+def profile_startup(renderer="canvas"):
+    """Prints how long imports, the menu and deferred loading take"""
+    started = time.perf_counter()
+    window = create_window()
+    window_ready = time.perf_counter()
+    game = Game(window, renderer=renderer)
+    window.update()  # Draws the menu
+    menu_ready = time.perf_counter()
+    game.assets.wait()
+    game.ensure_playfield()
+    window.update_idletasks()
+    playfield_ready = time.perf_counter()
+    window.destroy()
+    game.telemetry.close()
+
+    total, imports = profile_imports()
+    print(f"Imports: {total:.1f} ms")
+    for milliseconds, name in imports:
+        print(f"  {name:<24}{milliseconds:8.1f}")
+    print("Startup (ms after imports):")
+    for label, moment in [
+        ("window", window_ready),
+        ("menu shown", menu_ready),
+        ("playfield ready", playfield_ready),
+    ]:
+        print(f"  {label:<24}{(moment - started) * 1000:8.1f}")
+    print("Loaded while the menu was shown (ms):")
+    for name, seconds in game.assets.timings.items():
+        print(f"  {name:<24}{seconds * 1000:8.1f}")
+
+
+class InputLatencyProbe:
+    """Presses basket keys on a timer and times each until it is drawn"""
+
+    def __init__(self, game, presses, interval_ms=97):
+        self.game = game
+        self.presses = presses
+        # Off the tick period so presses land at every point in a tick
+        self.interval_ms = interval_ms
+        self.pressed_at = None
+        self.latencies = []  # ms from each key press to the next redraw
+
+    def start(self):
+        """Begins pressing keys once the game is running"""
+        self.game.master.bind("<KeyPress>", self.on_key, add="+")
+        self.game.master.after(self.interval_ms, self.press)
+
+    def press(self):
+        """Queues a key press behind whatever Tk is already doing"""
+        if len(self.latencies) >= self.presses:
+            self.game.master.quit()
+            return
+        player = self.game.players[0]
+        # Alternate directions so the basket stays on screen
+        if len(self.latencies) % 2:
+            key = player.left_key
+        else:
+            key = player.right_key
+        self.pressed_at = time.perf_counter()
+        self.game.master.event_generate(
+            "<KeyPress>", keysym=key, when="tail"
+        )
+        self.game.master.after(self.interval_ms, self.press)
+
+    def on_key(self, event):
+        """Waits for the redraw queued by the game's key handler"""
+        if self.pressed_at is not None:
+            self.game.master.after_idle(self.on_drawn, self.pressed_at)
+            self.pressed_at = None
+
+    def on_drawn(self, pressed_at):
+        """Records one press, run after the canvas has redrawn"""
+        self.latencies.append((time.perf_counter() - pressed_at) * 1000)
+
+
+async def latency_load(tickers=200):
+    """Keeps the asyncio loop busy with timers and socket round trips"""
+    import asyncio
+
+    async def tick():
+        while True:
+            await asyncio.sleep(0.001)
+
+    async def echo(reader, writer):
+        while data := await reader.read(4096):
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(echo, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    timers = [asyncio.ensure_future(tick()) for _ in range(tickers)]
+    try:
+        while True:
+            writer.write(b"x" * 1024)
+            await writer.drain()
+            await reader.readexactly(1024)
+    finally:
+        for timer in timers:
+            timer.cancel()
+        writer.close()
+        server.close()
+
+
+def run_latency_test(presses=200, use_asyncio=False, renderer="canvas"):
+    """Times key presses to redrawn frames, with asyncio busy or idle"""
+    window = create_window()
+    pump = None
+    if use_asyncio:
+        pump = AsyncioPump(window)
+        pump.start()
+        pump.spawn(latency_load())
+    game = Game(
+        window, renderer=renderer, async_pump=pump,
+        autosave_seconds=1 if use_asyncio else 0,
+    )
+    game.assets.wait()
+    game.ensure_playfield()
+    name_entry = game.player_entries[0][0]
+    name_entry.delete(0, tk.END)
+    name_entry.insert(0, "Latency")
+    game.initialize_main_game()
+    # Nothing the probe does should end the game early
+    game.world.apply_effect("invincible", game.players[0], duration=10**9)
+    probe = InputLatencyProbe(game, presses)
+    probe.start()
+    window.mainloop()
+    game.stop_autosave()
+    if pump is not None:
+        pump.close()
+    window.destroy()
+    game.telemetry.close()
+    return probe.latencies
+
+
+def main(argv=None):
+    """Starts the game, or runs a command-line tool"""
+    parser = argparse.ArgumentParser(description="Apple Catcher")
+    subparsers = parser.add_subparsers(dest="command")
+
+    simulate_parser = subparsers.add_parser(
+        "simulate", help="play games without a window to tune difficulty"
+    )
+    simulate_parser.add_argument("--games", type=int, default=1000)
+    simulate_parser.add_argument(
+        "--policy", choices=sorted(POLICIES), default="greedy"
+    )
+    simulate_parser.add_argument(
+        "--workers", type=int, default=None,
+        help="worker processes (default: one per core)",
+    )
+    simulate_parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the first game"
+    )
+    simulate_parser.add_argument(
+        "--max-seconds", type=int, default=600,
+        help="stop games that last longer than this much game time",
+    )
+    simulate_parser.add_argument(
+        "--telemetry", metavar="PATH", default=None,
+        help="also append each game's session statistics to this file",
+    )
+
+    env_parser = subparsers.add_parser(
+        "env-benchmark",
+        help="time the vectorized environment with greedy baskets",
+    )
+    env_parser.add_argument("--envs", type=int, default=1024)
+    env_parser.add_argument(
+        "--steps", type=int, default=2000, help="ticks per game"
+    )
+    env_parser.add_argument("--seed", type=int, default=0)
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="summarize session statistics logs"
+    )
+    stats_parser.add_argument(
+        "paths", nargs="*", default=[TELEMETRY_PATH],
+        help=f"JSON Lines session logs (default: {TELEMETRY_PATH})",
+    )
+
+    bundle_parser = subparsers.add_parser(
+        "bundle", help="pack the images and font into one asset file"
+    )
+    bundle_parser.add_argument(
+        "--output", default=BUNDLE_PATH,
+        help=f"bundle to write, beside the game (default: {BUNDLE_PATH})",
+    )
+
+    benchmark_parser = subparsers.add_parser(
+        "benchmark", help="time simulation ticks with a bot at a high level"
+    )
+    benchmark_parser.add_argument(
+        "--policy", choices=sorted(POLICIES), default="planner"
+    )
+    benchmark_parser.add_argument("--level", type=int, default=10)
+    benchmark_parser.add_argument(
+        "--seconds", type=int, default=120, help="game time to simulate"
+    )
+    benchmark_parser.add_argument("--seed", type=int, default=0)
+
+    soak_parser = subparsers.add_parser(
+        "soak", help="auto-play and restart for hours, failing on leaks"
+    )
+    soak_parser.add_argument("--hours", type=float, default=1.0)
+    soak_parser.add_argument(
+        "--policy", choices=sorted(POLICIES), default="planner"
+    )
+    soak_parser.add_argument(
+        "--game-seconds", type=int, default=60,
+        help="end each game after this long to exercise restarts",
+    )
+
+    versus_parser = subparsers.add_parser(
+        "versus", help="play another machine on the network, head to head"
+    )
+    versus_parser.add_argument("name", help="your player name")
+    versus_parser.add_argument(
+        "--join", metavar="HOST[:PORT]", default=None,
+        help="join a hosted game (default: host one and wait)",
+    )
+    versus_parser.add_argument(
+        "--port", type=int, default=VERSUS_PORT,
+        help=f"UDP port to host on (default: {VERSUS_PORT})",
+    )
+
+    versus_test_parser = subparsers.add_parser(
+        "versus-test",
+        help="play two bots against each other over localhost UDP",
+    )
+    versus_test_parser.add_argument("--seconds", type=int, default=60)
+    versus_test_parser.add_argument(
+        "--loss", type=float, default=0.0,
+        help="share of packets dropped on purpose",
+    )
+    versus_test_parser.add_argument(
+        "--lag", type=int, default=0, help="ticks each packet is held back"
+    )
+    versus_test_parser.add_argument("--seed", type=int, default=0)
+    versus_test_parser.add_argument(
+        "--policy", choices=sorted(POLICIES), default="planner"
+    )
+
+    spectate_parser = subparsers.add_parser(
+        "spectate", help="watch a game that is being broadcast"
+    )
+    spectate_parser.add_argument(
+        "address", nargs="?", default="127.0.0.1",
+        help=f"HOST[:PORT] of the game (default port: {BROADCAST_PORT})",
+    )
+
+    server_parser = subparsers.add_parser(
+        "leaderboard-server",
+        help="run the shared leaderboard that games submit scores to",
+    )
+    server_parser.add_argument("--host", default="127.0.0.1")
+    server_parser.add_argument("--port", type=int, default=LEADERBOARD_PORT)
+    server_parser.add_argument(
+        "--path", default=SERVER_LEADERBOARD_PATH,
+        help=f"file the scores are kept in (default: "
+        f"{SERVER_LEADERBOARD_PATH})",
+    )
+
+    latency_parser = subparsers.add_parser(
+        "latency",
+        help="time key presses to redraws, with and without asyncio load",
+    )
+    latency_parser.add_argument("--presses", type=int, default=200)
+
+    record_parser = subparsers.add_parser(
+        "record", help="save frames of a bot game as PNGs, a GIF or WebP"
+    )
+    record_parser.add_argument(
+        "output", help="folder for PNG frames, or a .gif or .webp file"
+    )
+    record_parser.add_argument(
+        "--policy", choices=sorted(POLICIES), default="planner"
+    )
+    record_parser.add_argument("--seed", type=int, default=0)
+    record_parser.add_argument(
+        "--seconds", type=int, default=15,
+        help="game time to record, a GIF or WebP holds at most "
+        f"{FrameWriter.MAX_ANIMATION_FRAMES} frames",
+    )
+    record_parser.add_argument(
+        "--every", type=int, default=1, help="save one frame per N ticks"
+    )
+    record_parser.add_argument(
+        "--queue-size", type=int, default=32,
+        help="frames waiting to be encoded before the game waits",
+    )
+
+    parser.add_argument(
+        "--autopilot", choices=sorted(POLICIES), default=None,
+        help="let a bot policy play for every player",
+    )
+    parser.add_argument(
+        "--renderer", choices=RENDERERS, default="canvas",
+        help="draw with canvas items, or composite frames in software",
+    )
+    parser.add_argument(
+        "--frame-budget", type=float, default=FRAME_BUDGET_MS,
+        metavar="MS",
+        help="tick time above which optional effects are dropped",
+    )
+    parser.add_argument(
+        "--autosave", type=float, default=0, metavar="SECONDS",
+        help="save the game in the background this often (0: never)",
+    )
+    parser.add_argument(
+        "--leaderboard-url", metavar="URL", default=None,
+        help="also share scores with a leaderboard server, e.g. "
+        f"http://127.0.0.1:{LEADERBOARD_PORT}",
+    )
+    parser.add_argument(
+        "--broadcast", type=int, nargs="?", const=BROADCAST_PORT,
+        default=None, metavar="PORT",
+        help=f"stream games to spectators (default port: {BROADCAST_PORT})",
+    )
+    parser.add_argument(
+        "--fullscreen", action="store_true",
+        help="fill the screen, scaling the playfield to fit",
+    )
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="time imports, the menu and asset loading, then exit",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "simulate":
+        started = time.perf_counter()
+        results = run_simulations(
+            args.games, args.policy, args.workers, args.seed,
+            args.max_seconds, collect_stats=args.telemetry is not None,
+        )
+        print_simulation_report(
+            results, args.policy, args.workers,
+            time.perf_counter() - started,
+        )
+        if args.telemetry is not None:
+            telemetry = TelemetryLog(args.telemetry)
+            for result in results:
+                telemetry.write(result["session"])
+            telemetry.close()
+        return
+
+    if args.command == "bundle":
+        started = time.perf_counter()
+        index = build_asset_bundle(args.output)
+        size = os.path.getsize(asset_path(args.output))
+        print(
+            f"Packed {len(index['images'])} images and "
+            f"{len(index['files'])} files into {asset_path(args.output)} "
+            f"({size / 1e6:.1f} MB) in {time.perf_counter() - started:.2f}s"
+        )
+        return
+
+    if args.command == "env-benchmark":
+        env = VectorEnv(args.envs, seed=args.seed)
+        scores = []
+        started = time.perf_counter()
+        for _ in range(args.steps):
+            _, _, terminated, truncated, info = env.step(
+                env.greedy_actions()
+            )
+            finished = terminated | truncated
+            if finished.any():
+                scores.extend(info["final_score"][finished].tolist())
+        duration = time.perf_counter() - started
+        print(
+            f"{args.envs * args.steps} game ticks in {duration:.2f}s "
+            f"({args.envs * args.steps / duration:,.0f} per second), "
+            f"{len(scores)} games finished"
+        )
+        if scores:
+            print(f"Greedy mean final score: {sum(scores) / len(scores):.1f}")
+        return
+
+    if args.command == "stats":
+        started = time.perf_counter()
+        try:
+            totals = aggregate_sessions(args.paths)
+        except OSError as error:
+            sys.exit(f"Cannot read session log: {error}")
+        print_session_report(totals)
+        print(f"Read in {time.perf_counter() - started:.2f}s")
+        return
+
+    if args.command == "benchmark":
+        result = run_benchmark(
+            args.policy, args.level, args.seconds, args.seed
+        )
+        import statistics
+
+        tick_ms = sorted(result["tick_ms"])
+        percentiles = statistics.quantiles(tick_ms, n=100)
+        print(
+            f"{len(tick_ms)} ticks at level {args.level} with the "
+            f"{args.policy} policy, peak {result['peak_objects']} objects, "
+            f"finished on level {result['final_level']}"
+        )
+        print(
+            f"Tick time (ms): p50 {percentiles[49]:.3f}  "
+            f"p95 {percentiles[94]:.3f}  p99 {percentiles[98]:.3f}  "
+            f"max {tick_ms[-1]:.3f}"
+        )
+        counts = result["event_counts"]
+        print(
+            f"Events per tick: {sum(counts.values()) / len(tick_ms):.2f} "
+            f"(largest batch {result['largest_batch']}): " +
+            ", ".join(f"{name} {counts[name]}" for name in sorted(counts))
+        )
+        return
+
+    if args.command == "record":
+        started = time.perf_counter()
+        result = record_game(
+            args.output, args.seed, args.policy, args.seconds, args.every,
+            args.queue_size,
+        )
+        print(
+            f"Saved {result['frames']} frames to {args.output} in "
+            f"{time.perf_counter() - started:.1f}s (score {result['score']}, "
+            f"level {result['level']}, {result['stalls']} queue waits)"
+        )
+        return
+
+    if args.command == "versus-test":
+        import statistics
+
+        result = run_versus_test(
+            args.seconds, args.loss, args.lag, args.seed, args.policy
+        )
+        print(
+            f"{result['ticks']} ticks, confirmed to frame {result['frame']}, "
+            f"scores {result['scores'][0]} to {result['scores'][1]}, "
+            "machines " + ("agree" if result["in_sync"] else "DISAGREE")
+        )
+        for session in result["sessions"]:
+            link = session.link
+            print(
+                f"{session.name:<6} rollbacks {session.rollbacks} "
+                f"(deepest {session.deepest_rollback} ticks), "
+                f"stalls {session.stalls}, "
+                f"corrections {session.corrections}, "
+                f"{link.bytes_sent / max(1, link.packets_sent):.1f} bytes "
+                f"per tick, largest {link.largest_packet} "
+                f"(budget {NET_PACKET_BUDGET})"
+            )
+        tick_ms = sorted(result["tick_ms"])
+        percentiles = statistics.quantiles(tick_ms, n=100)
+        print(
+            f"Tick time with rollbacks (ms): p50 {percentiles[49]:.3f}  "
+            f"p99 {percentiles[98]:.3f}  max {tick_ms[-1]:.3f}"
+        )
+        if not result["in_sync"]:
+            sys.exit(1)
+        return
+
+    if args.command == "leaderboard-server":
+        server = LeaderboardServer(args.path, args.host, args.port)
+        host, port = server.address
+        print(f"Serving the leaderboard on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.shutdown()
+        return
+
+    if args.command == "latency":
+        import statistics
+
+        for label, use_asyncio in [("Tk only", False), ("Tk + asyncio", True)]:
+            latencies = sorted(
+                run_latency_test(args.presses, use_asyncio, args.renderer)
+            )
+            percentiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{label:<14} key to frame (ms): p50 {percentiles[49]:.2f}  "
+                f"p95 {percentiles[94]:.2f}  p99 {percentiles[98]:.2f}  "
+                f"max {latencies[-1]:.2f}"
+            )
+        return
+
+    if args.command == "spectate":
+        run_spectator(args.address)
+        return
 
-    game = Game(window)
+    if args.startup_profile:
+        profile_startup(args.renderer)
+        return
+
+    window = create_window(args.fullscreen)
+
+    if args.command == "versus":
+        if args.join is None:
+            session = VersusSession(VersusLink(args.port), args.name, True)
+            print(f"Waiting for an opponent on UDP port {args.port}")
+        else:
+            host, _, port = args.join.partition(":")
+            link = VersusLink(peer=(host, int(port or VERSUS_PORT)))
+            session = VersusSession(link, args.name, False)
+        game = Game(
+            window,
+            autopilot=POLICIES.get(args.autopilot),
+            renderer=args.renderer,
+            frame_budget_ms=args.frame_budget,
+        )
+        game.wait_for_opponent(session)
+        window.mainloop()
+        session.close()
+        game.telemetry.close()
+        return
+
+    if args.command == "soak":
+        game = Game(
+            window,
+            autopilot=POLICIES[args.policy],
+            renderer=args.renderer,
+            frame_budget_ms=args.frame_budget,
+        )
+        monitor = SoakMonitor(game, args.hours, args.game_seconds)
+        monitor.start()
+        window.mainloop()
+        game.telemetry.close()
+        if monitor.leaks:
+            sys.exit(1)
+        return
+
+    # Only started when something runs on asyncio, as it wakes Tk often
+    pump = None
+    if (args.leaderboard_url is not None or args.broadcast is not None or
+            args.autosave > 0):
+        pump = AsyncioPump(window)
+        pump.start()
+    client = None
+    if args.leaderboard_url is not None:
+        client = LeaderboardClient(pump, args.leaderboard_url)
+        client.start()
+    broadcaster = None
+    if args.broadcast is not None:
+        broadcaster = BroadcastServer(pump, port=args.broadcast)
+        broadcaster.start()
+    game = Game(
+        window,
+        autopilot=POLICIES.get(args.autopilot),
+        renderer=args.renderer,
+        frame_budget_ms=args.frame_budget,
+        async_pump=pump,
+        autosave_seconds=args.autosave,
+        leaderboard_client=client,
+        broadcaster=broadcaster,
+    )
     window.mainloop()
+    game.stop_autosave()
+    if broadcaster is not None:
+        broadcaster.close()
+    if pump is not None:
+        pump.close()
+    if client is not None:
+        client.close()  # Unsent scores are retried next time
+    game.telemetry.close()  # Finish writing the last session
+
+
+if __name__ == "__main__":
+    main()